@@ -4,6 +4,7 @@ export MEDIA_ROOT="${MEDIA_ROOT:-/var/run/app/media}"
 export STATIC_ROOT="${STATIC_ROOT:-/var/run/app/static}"
 export UWSGI_PROCESSES="${UWSGI_PROCESSES:-"4"}"
 export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:-"bitcaster.config.settings"}"
+export CELERY_QUEUES="${CELERY_QUEUES:-"queue_hcr_high,queue_hcr,queue_hcr_low"}"
 mkdir -p "${MEDIA_ROOT}" "${STATIC_ROOT}" || echo "Cannot create dirs ${MEDIA_ROOT} ${STATIC_ROOT}"
 
 echo $STATIC_ROOT
@@ -33,7 +34,7 @@ case "$1" in
       ;;
     worker)
 	    set -- tini -- "$@"
-      set -- gosu user:app celery -A bitcaster.config.celery worker -E --loglevel=ERROR --concurrency=4
+      set -- gosu user:app celery -A bitcaster.config.celery worker -E --loglevel=ERROR --concurrency=4 -Q ${CELERY_QUEUES}
       ;;
     beat)
 	    set -- tini -- "$@"
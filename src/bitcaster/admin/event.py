@@ -43,7 +43,7 @@ class EventTestForm(forms.Form):
 
 class EventAdmin(BaseAdmin, TwoStepCreateMixin[Event], LockMixinAdmin[Event], admin.ModelAdmin[Event]):
     search_fields = ("name",)
-    list_display = ("name", "application", "active", "locked")
+    list_display = ("name", "application", "active", "locked", "priority")
     list_filter = (
         # ("application__project__organization", LinkedAutoCompleteFilter.factory(parent=None)),
         ("application__project", LinkedAutoCompleteFilter.factory(parent=None)),
@@ -53,6 +53,7 @@ class EventAdmin(BaseAdmin, TwoStepCreateMixin[Event], LockMixinAdmin[Event], ad
         ("notifications__distribution__recipients__address__user", LinkedAutoCompleteFilter.factory(parent=None)),
         "active",
         "locked",
+        "priority",
     )
     autocomplete_fields = ("application",)
     filter_horizontal = ("channels",)
@@ -67,6 +68,7 @@ class EventAdmin(BaseAdmin, TwoStepCreateMixin[Event], LockMixinAdmin[Event], ad
                     ("name", "slug"),
                     ("description",),
                     ("active", "newsletter", "occurrence_retention"),
+                    ("priority",),
                     # ("channels",)
                 )
             },
@@ -1,4 +1,5 @@
 import logging
+from functools import partial
 from typing import TYPE_CHECKING
 
 from admin_extra_buttons.buttons import Button
@@ -7,6 +8,7 @@ from adminfilters.autocomplete import LinkedAutoCompleteFilter
 from django import forms
 from django.contrib import messages
 from django.contrib.admin.helpers import AdminForm
+from django.db import transaction
 from django.db.models import QuerySet
 from django.http import HttpRequest, HttpResponse, HttpResponseRedirect
 from django.template.response import TemplateResponse
@@ -16,6 +18,7 @@ from django_celery_beat.models import CrontabSchedule
 from reversion.admin import VersionAdmin
 
 from bitcaster.models import Channel, Monitor
+from bitcaster.tasks import monitor_run
 
 from ..forms.monitor import MonitorForm
 from .base import BaseAdmin, ButtonColor
@@ -86,9 +89,9 @@ class MonitorAdmin(BaseAdmin, TwoStepCreateMixin[Monitor], VersionAdmin[Monitor]
                 monitor.config = config_form.cleaned_data
                 monitor.data = {}
                 monitor.result = {}
-                monitor.schedule.last_run_at = None
                 monitor.save()
-                monitor.schedule.save()
+                # the schedule is shared with other monitors: run only this one to record the initial state
+                transaction.on_commit(partial(monitor_run.delay, monitor.pk))
                 self.message_user(request, "Configured Monitor {}".format(monitor.name))
                 if "next" in request.GET:
                     return HttpResponseRedirect(request.GET["next"])
@@ -108,8 +111,7 @@ class MonitorAdmin(BaseAdmin, TwoStepCreateMixin[Monitor], VersionAdmin[Monitor]
         if request.method == "POST":
             form = MonitorScheduleForm(request.POST, request.FILES)
             if form.is_valid():
-                monitor.schedule.crontab = form.cleaned_data["crontab"]
-                monitor.schedule.save()
+                monitor.set_crontab(form.cleaned_data["crontab"])
                 return HttpResponseRedirect(monitor.get_admin_change())
 
         else:
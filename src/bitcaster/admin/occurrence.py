@@ -6,6 +6,7 @@ from adminfilters.autocomplete import AutoCompleteFilter
 from adminfilters.numbers import NumberFilter
 from django.contrib import admin, messages
 from django.http import HttpRequest, HttpResponse
+from django.template.response import TemplateResponse
 from django.utils.translation import gettext as _
 
 from bitcaster.models import Occurrence
@@ -18,11 +19,12 @@ logger = logging.getLogger(__name__)
 
 class OccurrenceAdmin(BaseAdmin, admin.ModelAdmin[Occurrence]):
     search_fields = ("name",)
-    list_display = ("timestamp", "event", "status", "attempts", "recipients")
+    list_display = ("timestamp", "event", "status", "priority", "attempts", "recipients")
     list_filter = (
         "timestamp",
         ("event", AutoCompleteFilter),
         "status",
+        "priority",
         ("recipients", NumberFilter),
     )
     readonly_fields = ["correlation_id"]
@@ -41,6 +43,28 @@ class OccurrenceAdmin(BaseAdmin, admin.ModelAdmin[Occurrence]):
         obj = self.get_object(request, pk)
         obj.process()
 
+    @button(
+        html_attrs={"class": ButtonColor.LINK.value},
+        visible=lambda btn: bool(btn.original.trace),
+    )
+    def delivery_trace(self, request: HttpRequest, pk: str) -> HttpResponse:
+        context = self.get_common_context(request, pk, title=_("Delivery trace"))
+        obj: Occurrence = context["original"]
+        elapsed = obj.trace.get("elapsed") or 0
+        context["elapsed"] = elapsed
+        context["phases"] = [
+            {
+                "name": name,
+                "calls": calls,
+                "total": total,
+                "avg": round(total / calls, 3) if calls else 0,
+                "max": max_,
+                "percent": round(total * 100 / elapsed, 1) if elapsed else 0,
+            }
+            for name, (calls, total, max_) in obj.trace.get("phases", {}).items()
+        ]
+        return TemplateResponse(request, "admin/bitcaster/occurrence/trace.html", context)
+
     @button(
         html_attrs={"class": ButtonColor.ACTION.value},
         permission="bitcaster.delete_occurrence",
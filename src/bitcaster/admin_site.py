@@ -3,7 +3,7 @@ from typing import Any, Optional
 
 from django.contrib.admin import apps
 from django.contrib.admin.sites import AdminSite
-from django.db.models import F, Model
+from django.db.models import Model
 from django.http import HttpRequest
 from django.template.response import TemplateResponse
 from django.urls import NoReverseMatch, reverse
@@ -12,7 +12,7 @@ from django.utils.text import capfirst
 from django.utils.translation import gettext_lazy
 from flags.state import flag_enabled
 
-from bitcaster.cache.storage import qs_get_or_store
+from bitcaster.cache.storage import INVALIDATION_WINDOW, qs_get_or_store
 from bitcaster.constants import CacheKey
 
 
@@ -131,15 +131,12 @@ class BitcasterAdminSite(AdminSite):
             return list(self._build_sections_dict(request).values())
 
     def get_last_events(self) -> list[dict[str, Any]]:
-        from bitcaster.models import Occurrence
+        from bitcaster.models import OccurrenceRollup
 
         offset = timezone.now() - timedelta(hours=24)
-        qs = (
-            Occurrence.objects.filter(timestamp__gte=offset)
-            .values("timestamp", "id", application=F("event__application__name"), event__name=F("event__name"))
-            .order_by("-timestamp")
+        return qs_get_or_store(
+            OccurrenceRollup.objects.summary(offset), key=CacheKey.DASHBOARDS_EVENTS, timeout=INVALIDATION_WINDOW
         )
-        return qs_get_or_store(qs, key=CacheKey.DASHBOARDS_EVENTS)
 
     def each_context(self, request: HttpRequest) -> dict[str, Any]:
         ret = super().each_context(request)
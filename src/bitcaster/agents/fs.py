@@ -1,6 +1,7 @@
+import os
 from functools import cached_property
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterable, Iterator
 
 from django import forms
 from django.conf import settings
@@ -9,7 +10,13 @@ from django.utils import timezone
 from django.utils.module_loading import import_string
 from django.utils.translation import gettext as _
 
+from . import snapshot
 from .base import Agent, AgentConfig
+from .scan import Progress, TreeScanner
+from .snapshot import Entry
+
+if TYPE_CHECKING:
+    from bitcaster.models import Monitor
 
 
 def _validate_path(path: str) -> None:
@@ -52,65 +59,115 @@ class AgentFileSystemConfig(AgentConfig):
     add = forms.BooleanField(help_text=_("Monitor directory for new files"), required=False)
     change = forms.BooleanField(help_text=_("Monitor directory for changed files"), required=False)
     delete = forms.BooleanField(help_text=_("Monitor directory for deleted files"), required=False)
+    incremental = forms.BooleanField(
+        help_text=_(
+            "Detect changes as they happen (requires the `watch_monitors` process). "
+            "Scheduled checks only reconcile the stored state"
+        ),
+        required=False,
+    )
 
     def clean_path(self) -> str:
         _validate_path(self.cleaned_data["path"])
         return self.cleaned_data["path"]
 
 
+def signature(st: os.stat_result) -> str:
+    """Entry state: unlike `st_atime` it does not change when the file is only read."""
+    return f"{st.st_mtime_ns}:{st.st_size}:{st.st_ino}"
+
+
+def empty_diff() -> dict[str, list[str]]:
+    return {"changed": [], "added": [], "deleted": []}
+
+
 class AgentFiles(Agent):
     config_class: type[AgentConfig] = AgentFileSystemConfig
+    # format of the stored entries. Snapshots with a different version are rebuilt without notifying
+    snapshot_version = 2
+
+    def __init__(self, monitor: "Monitor") -> None:
+        super().__init__(monitor)
+        # (digest, content) of the last snapshot loaded/stored, to not read it back
+        self._snapshot: tuple[str, bytes] = ("", b"")
 
     def initialize(self) -> None:
-        entries = self.scan()
-        self.monitor.data = {
-            "entries": entries,
-            "timestamp": timezone.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "diff": {"changed": [], "added": [], "deleted": []},
-        }
-        self.monitor.save()
+        self.store(snapshot.normalize(self.scan()), empty_diff())
 
     @cached_property
     def path(self) -> Path:
         return Path(self.config["path"])
 
-    def diff(self, stored: dict[str, Any], current: dict[str, Any]) -> dict[str, Any]:
-        ret = {"changed": [], "added": [], "deleted": []}
-        for entry, data in current.items():
-            if entry not in stored.keys():
-                ret["added"].append(entry)
-            elif data != stored[entry]:
-                ret["changed"].append(entry)
-        for key, __ in stored.items():
-            if key not in current.keys():
-                ret["deleted"].append(key)
-        return ret
+    def diff(self, stored: Iterable[Entry], current: Iterable[Entry]) -> dict[str, Any]:
+        """Differences between two snapshots (sorted entries)."""
+        return snapshot.merge(stored, current)
 
     def scan(self) -> dict[str, Any]:
         raise NotImplementedError
 
-    def check(self, notify: bool = True, update: bool = True) -> None:
-        if not self.monitor.data:
-            self.initialize()
-            return
-        status = self.monitor.data.get("entries", [])
-        current = self.scan()
-        diff = self.diff(status, current)
+    def is_initialized(self) -> bool:
+        return bool(self.monitor.data) and self.monitor.data.get("version", 1) == self.snapshot_version
+
+    @property
+    def digest(self) -> str:
+        return self.monitor.data.get("snapshot", {}).get("digest", "")
+
+    def load(self) -> Iterator[Entry]:
+        """Entries of the stored snapshot, sorted by path."""
+        from bitcaster.models import MonitorSnapshot
+
+        if self._snapshot[0] != self.digest:
+            content = (
+                MonitorSnapshot.objects.filter(monitor=self.monitor, digest=self.digest)
+                .values_list("content", flat=True)
+                .first()
+            )
+            self._snapshot = (self.digest, bytes(content or b""))
+        return snapshot.decode(self._snapshot[1])
+
+    def entries(self) -> dict[str, str]:
+        return dict(self.load())
+
+    def store(self, entries: list[Entry], diff: dict[str, Any], update: bool = True) -> None:
+        """Save the new state. Nothing is written if it is the same already stored."""
+        from bitcaster.models import MonitorSnapshot
+
+        content = snapshot.encode(entries)
+        digest = snapshot.digest(content)
+        changed = digest != self.digest
+        # the last diff is kept until the next check that finds no changes
+        dirty = changed or any(self.monitor.data.get("diff", {}).values())
         self.monitor.data = {
-            "entries": current,
+            "snapshot": {"digest": digest, "entries": len(entries), "size": len(content)},
             "timestamp": timezone.now().strftime("%Y-%m-%d %H:%M:%S"),
             "diff": diff,
+            "version": self.snapshot_version,
         }
-        if update:
+        self._snapshot = (digest, content)
+        if update and changed:
+            MonitorSnapshot.objects.update_or_create(
+                monitor=self.monitor, defaults={"digest": digest, "entries": len(entries), "content": content}
+            )
+        if update and dirty:
             self.monitor.save()
-        if (
-            notify
-            and (self.config["change"] and self.monitor.data["diff"]["changed"])
-            or (self.config["delete"] and self.monitor.data["diff"]["deleted"])
-            or (self.config["add"] and self.monitor.data["diff"]["added"])
-        ):
+
+    def check(self, notify: bool = True, update: bool = True) -> None:
+        if not self.is_initialized():
+            self.initialize()
+            return
+        current = snapshot.normalize(self.scan())
+        self.store(current, self.diff(self.load(), current), update)
+        if notify and self.must_notify():
             self.notify()
 
+    def must_notify(self) -> bool:
+        diff = self.monitor.data["diff"]
+        return bool(
+            (self.config["change"] and diff["changed"])
+            or (self.config["delete"] and diff["deleted"])
+            or (self.config["add"] and diff["added"])
+        )
+
     def changes_detected(self) -> bool:
         for k in ["changed", "added", "deleted"]:
             if self.monitor.data["diff"][k]:
@@ -123,21 +180,85 @@ class AgentFiles(Agent):
 
 class AgentFileSystem(AgentFiles):
     config_class: type[AgentFileSystemConfig] = AgentFileSystemConfig
+    snapshot_version = 3
 
-    def scan(self) -> dict[str, Any]:
-        entries = {}
-        if self.path.is_dir():
-            if self.config["recursive"]:
-                for root, dirs, files in self.path.walk():
-                    for f in files:
-                        entries[str(Path(root / f).absolute())] = str(Path(root / f).stat().st_atime)
+    def scanner(self) -> TreeScanner:
+        return TreeScanner(settings.AGENT_FILESYSTEM_SCAN_WORKERS, signature, on_progress=self.report_progress)
+
+    def report_progress(self, progress: Progress) -> None:
+        """Show the progress of long scans in the Monitor status."""
+        from bitcaster.models import Monitor
+
+        self.monitor.result = {"message": "Scanning", "progress": progress._asdict()}
+        Monitor.objects.filter(pk=self.monitor.pk).update(result=self.monitor.result)
+
+    def scan_path(self, path: Path) -> dict[str, str]:
+        """Entries of `path`: the files of its subtree if it is a directory of a recursive monitor.
+
+        Files and directories that cannot be read keep their stored entries.
+        """
+        entries: dict[str, str] = {}
+        unreadable: list[str] = []
+        try:
+            if self.config["recursive"] and path.is_dir():
+                scanner = self.scanner()
+                entries = scanner.scan(str(path.absolute()))
+                unreadable = scanner.unreadable
             else:
-                for f in self.path.iterdir():  # type: ignore[assignment]
-                    entries[str(f.absolute())] = str(f.stat().st_atime)
-        elif self.path.is_file():
-            entries[str(self.path.absolute())] = str(self.path.stat().st_atime)
+                entries[str(path.absolute())] = signature(path.stat())
+        except FileNotFoundError:
+            pass
+        except OSError:
+            unreadable = [str(path.absolute())]
+        if unreadable:
+            entries = {**self.stored(unreadable), **entries}
         return entries
 
+    def stored(self, paths: list[str]) -> dict[str, str]:
+        """Stored entries of `paths` and of their subtrees."""
+        prefixes = tuple(f"{p}{os.sep}" for p in paths)
+        return {k: v for k, v in self.load() if k in paths or k.startswith(prefixes)}
+
+    def scan(self) -> dict[str, Any]:
+        if self.path.is_dir() and not self.config["recursive"]:
+            entries = {}
+            for f in self.path.iterdir():
+                entries.update(self.scan_path(f))
+            return entries
+        return self.scan_path(self.path)
+
+    def in_scope(self, path: Path) -> bool:
+        root = self.path.absolute()
+        if path == root:
+            return True
+        return root in path.parents if self.config["recursive"] else path.parent == root
+
+    def check_paths(self, paths: Iterable[str], notify: bool = True, update: bool = True) -> None:
+        """Incremental check: only `paths` (files or directories, even removed) are compared.
+
+        Used with the changes reported by inotify, that make the full scan unnecessary.
+        """
+        if not self.is_initialized():
+            self.initialize()
+            return
+        entries = self.entries()
+        diff = empty_diff()
+        for path in sorted({Path(p).absolute() for p in paths}):
+            if not self.in_scope(path):
+                continue
+            prefix = f"{path}{os.sep}"
+            stored = {k: v for k, v in entries.items() if k == str(path) or k.startswith(prefix)}
+            current = self.scan() if path == self.path.absolute() else self.scan_path(path)
+            changes = self.diff(sorted(stored.items()), sorted(current.items()))
+            for k, values in changes.items():
+                diff[k].extend(v for v in values if v not in diff[k])
+            for key in changes["deleted"]:
+                entries.pop(key, None)
+            entries.update(current)
+        self.store(sorted(entries.items()), diff, update)
+        if notify and self.must_notify():
+            self.notify()
+
     #
     # def initialize(self) -> None:
     #     entries = self.scan()
@@ -1,12 +1,21 @@
 import ftplib  # nosec
-from functools import cached_property
-from typing import Any
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
 
 from django import forms
 from django.utils.translation import gettext as _
 
 from .base import AgentConfig
 from .fs import AgentFiles
+from .snapshot import Entry
+
+FTP_TIMEOUT = 30
+# servers usually drop idle sessions after a few minutes
+SESSION_IDLE_TIMEOUT = 240
+MLSD_FACTS = ["type", "size", "modify"]
 
 
 class AgentFTPConfig(AgentConfig):
@@ -17,22 +26,125 @@ class AgentFTPConfig(AgentConfig):
     add = forms.BooleanField(help_text=_("Monitor directory for new files"), required=False)
     change = forms.BooleanField(help_text=_("Monitor directory for changed files"), required=False)
     delete = forms.BooleanField(help_text=_("Monitor directory for deleted files"), required=False)
+    recursive = forms.BooleanField(help_text=_("Check also subdirectories"), required=False)
+    max_depth = forms.IntegerField(
+        min_value=1, required=False, help_text=_("Max number of subdirectory levels to check. Empty for no limit")
+    )
+
+
+def state(facts: dict[str, str]) -> str:
+    """Entry state: only the facts that change with the content, not permissions or owner."""
+    return f"{facts.get('modify', '')}:{facts.get('size', '')}"
+
+
+class Session:
+    def __init__(self, key: tuple[str, ...], ftp: ftplib.FTP) -> None:
+        self.key = key
+        self.ftp = ftp
+        self.last_used = time.monotonic()
+
+    def is_expired(self, idle_timeout: float) -> bool:
+        return time.monotonic() - self.last_used > idle_timeout
+
+    def is_alive(self) -> bool:
+        try:
+            self.ftp.voidcmd("NOOP")
+        except ftplib.all_errors:
+            return False
+        return True
+
+    def close(self) -> None:
+        try:
+            self.ftp.quit()
+        except ftplib.all_errors:
+            self.ftp.close()
+
+
+class SessionPool:
+    """Logged in FTP sessions of this process, one per Monitor.
+
+    A session is checked out while in use, so concurrent checks of the same monitor open their own.
+    """
+
+    def __init__(self, idle_timeout: float = SESSION_IDLE_TIMEOUT) -> None:
+        self.idle_timeout = idle_timeout
+        self.sessions: dict[Any, Session] = {}
+        self.lock = threading.Lock()
+        self.pid = os.getpid()
+
+    def connect(self, config: dict[str, Any]) -> ftplib.FTP:
+        host, __, port = config["server"].partition(":")
+        ftp = ftplib.FTP(timeout=FTP_TIMEOUT)  # nosec
+        ftp.connect(host, int(port or ftplib.FTP_PORT))
+        ftp.login(config["username"], config["password"])
+        return ftp
+
+    def checkout(self, pk: Any, key: tuple[str, ...]) -> Optional[Session]:
+        with self.lock:
+            if self.pid != os.getpid():  # forked: the sockets belong to the parent
+                self.sessions, self.pid = {}, os.getpid()
+            expired = [s for k, s in self.sessions.items() if k != pk and s.is_expired(self.idle_timeout)]
+            self.sessions = {k: s for k, s in self.sessions.items() if s not in expired}
+            session = self.sessions.pop(pk, None)
+        for s in expired:
+            s.close()
+        if session and (session.key != key or session.is_expired(self.idle_timeout) or not session.is_alive()):
+            session.close()
+            session = None
+        return session
+
+    def checkin(self, pk: Any, session: Session) -> None:
+        session.last_used = time.monotonic()
+        with self.lock:
+            previous = self.sessions.pop(pk, None)
+            self.sessions[pk] = session
+        if previous:
+            previous.close()
+
+    @contextmanager
+    def get(self, pk: Any, config: dict[str, Any]) -> Iterator[ftplib.FTP]:
+        key = (config["server"], config["username"], config["password"])
+        session = self.checkout(pk, key) or Session(key, self.connect(config))
+        try:
+            yield session.ftp
+        except BaseException:  # the session can be left in the middle of a command
+            session.close()
+            raise
+        self.checkin(pk, session)
+
+    def close_all(self) -> None:
+        with self.lock:
+            sessions, self.sessions = self.sessions, {}
+        if self.pid == os.getpid():
+            for session in sessions.values():
+                session.close()
+
+
+sessions = SessionPool()
 
 
 class AgentFTP(AgentFiles):
     config_class: type[AgentFTPConfig] = AgentFTPConfig
+    snapshot_version = 3
 
-    @cached_property
-    def client(self) -> ftplib.FTP:
-        f = ftplib.FTP()  # nosec
-        host, port = self.config["server"].split(":")
-        f.connect(host, int(port))
-        f.login(self.config["username"], self.config["password"])
-        return f
+    def walk(
+        self, ftp: ftplib.FTP, path: str, max_depth: Optional[int], prefix: str = "", depth: int = 0
+    ) -> Iterator[Entry]:
+        """Entries of `path`, descending `max_depth` levels of subdirectories (all if None)."""
+        for name, facts in list(ftp.mlsd(path, facts=MLSD_FACTS)):
+            kind = facts.get("type", "file")
+            if kind in ("cdir", "pdir"):
+                continue
+            if kind == "dir" and (max_depth is None or depth < max_depth):
+                yield from self.walk(ftp, f"{path.rstrip('/')}/{name}", max_depth, f"{prefix}{name}/", depth + 1)
+            else:
+                yield f"{prefix}{name}", state(facts)
 
     def scan(self) -> dict[str, Any]:
-        entries = dict(self.client.mlsd(self.config["path"]))
-        return entries
+        config = self.config
+        max_depth = config["max_depth"] if config["recursive"] else 0
+        with sessions.get(self.monitor.pk, config) as ftp:
+            return dict(self.walk(ftp, config["path"], max_depth))
 
     #
     # def notify(self) -> None:
@@ -0,0 +1,96 @@
+"""Parallel directory tree scanning.
+
+On network filesystems (NFS/SMB mounts) a recursive scan mostly waits for the server to answer
+`stat()` calls. `TreeScanner` reads up to `workers` directories at the same time, and uses
+`os.scandir()` so that the listing and the `DirEntry.stat()` of the entries come from a
+single pass, without resolving each path again.
+"""
+
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, NamedTuple, Optional
+
+PROGRESS_INTERVAL = 5
+
+
+class Progress(NamedTuple):
+    directories: int
+    files: int
+    pending: int
+
+
+StateFunc = Callable[[os.stat_result], str]
+ProgressFunc = Callable[[Progress], None]
+
+
+def list_dir(path: str, state: StateFunc) -> tuple[dict[str, str], list[str], list[str]]:
+    """Files (anything not a directory) of `path` with their state, its subdirectories and the unreadable paths.
+
+    The unreadable paths (`path` itself, or entries that cannot be `stat()`) are not missing: the
+    caller keeps their previous state, so they are not reported as deleted.
+    """
+    entries: dict[str, str] = {}
+    dirs: list[str] = []
+    unreadable: list[str] = []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        dirs.append(entry.path)
+                    else:
+                        entries[entry.path] = state(entry.stat())
+                except FileNotFoundError:  # removed while scanning
+                    pass
+                except OSError:
+                    unreadable.append(entry.path)
+    except FileNotFoundError:
+        pass
+    except OSError:
+        unreadable.append(path)
+    return entries, dirs, unreadable
+
+
+class TreeScanner:
+    def __init__(
+        self,
+        workers: int,
+        state: StateFunc,
+        on_progress: Optional[ProgressFunc] = None,
+        progress_interval: float = PROGRESS_INTERVAL,
+    ) -> None:
+        self.workers = max(1, workers)
+        self.state = state
+        self.on_progress = on_progress
+        self.progress_interval = progress_interval
+        # paths that could not be read by the last `scan()`
+        self.unreadable: list[str] = []
+
+    def scan(self, root: str) -> dict[str, str]:
+        """Files of the `root` tree with their state. `on_progress` is called from the calling thread."""
+        entries: dict[str, str] = {}
+        self.unreadable = []
+        directories = 0
+        last_report = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="tree-scanner") as pool:
+            pending: set[Future[tuple[dict[str, str], list[str], list[str]]]] = {
+                pool.submit(list_dir, root, self.state)
+            }
+            try:
+                while pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        files, dirs, unreadable = future.result()
+                        entries.update(files)
+                        self.unreadable.extend(unreadable)
+                        directories += 1
+                        pending.update(pool.submit(list_dir, d, self.state) for d in dirs)
+                    if self.on_progress and time.monotonic() - last_report >= self.progress_interval:
+                        self.on_progress(Progress(directories, len(entries), len(pending)))
+                        last_report = time.monotonic()
+            except BaseException:
+                for future in pending:
+                    future.cancel()
+                raise
+        return entries
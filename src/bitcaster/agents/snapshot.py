@@ -0,0 +1,108 @@
+"""Compact monitor snapshots.
+
+A snapshot is the list of `(path, state)` entries of a monitored location, sorted by path.
+It is stored front-coded (each path only keeps the suffix that differs from the previous one,
+which for directory trees removes most of the bytes) and zlib compressed::
+
+    varint(shared prefix) varint(len suffix) suffix varint(len state) state ...
+
+Sorted snapshots are compared with a single linear merge, and their sha256 digest tells
+whether anything changed without comparing the entries.
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Iterable, Iterator
+
+Entry = tuple[str, str]
+
+COMPRESSION_LEVEL = 6
+
+
+def _write_varint(buffer: bytearray, value: int) -> None:
+    while value >= 0x80:
+        buffer.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buffer.append(value)
+
+
+def _read_varint(data: bytes, offset: int) -> tuple[int, int]:
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def encode(entries: Iterable[Entry]) -> bytes:
+    """Encode `entries`, that must be sorted by path."""
+    buffer = bytearray()
+    previous = b""
+    for path, state in entries:
+        key = path.encode()
+        shared = 0
+        for a, b in zip(previous, key):
+            if a != b:
+                break
+            shared += 1
+        value = state.encode()
+        _write_varint(buffer, shared)
+        _write_varint(buffer, len(key) - shared)
+        buffer += key[shared:]
+        _write_varint(buffer, len(value))
+        buffer += value
+        previous = key
+    return zlib.compress(bytes(buffer), COMPRESSION_LEVEL)
+
+
+def decode(content: bytes) -> Iterator[Entry]:
+    if not content:
+        return
+    data = zlib.decompress(content)
+    offset = 0
+    previous = b""
+    while offset < len(data):
+        shared, offset = _read_varint(data, offset)
+        length, offset = _read_varint(data, offset)
+        end = offset + length
+        key = previous[:shared] + data[offset:end]
+        length, offset = _read_varint(data, end)
+        end = offset + length
+        yield key.decode(), data[offset:end].decode()
+        offset = end
+        previous = key
+
+
+def digest(content: bytes) -> str:
+    return hashlib.sha256(content).hexdigest()
+
+
+def merge(stored: Iterable[Entry], current: Iterable[Entry]) -> dict[str, list[str]]:
+    """Differences between two sorted snapshots, walking both only once."""
+    ret: dict[str, list[str]] = {"changed": [], "added": [], "deleted": []}
+    old, new = iter(stored), iter(current)
+    a, b = next(old, None), next(new, None)
+    while a is not None or b is not None:
+        if b is None or (a is not None and a[0] < b[0]):
+            ret["deleted"].append(a[0])  # type: ignore[index]
+            a = next(old, None)
+        elif a is None or b[0] < a[0]:
+            ret["added"].append(b[0])
+            b = next(new, None)
+        else:
+            if a[1] != b[1]:
+                ret["changed"].append(b[0])
+            a, b = next(old, None), next(new, None)
+    return ret
+
+
+def normalize(entries: dict[str, Any]) -> list[Entry]:
+    """Sorted entries with the states as strings."""
+    return sorted(
+        (path, state if isinstance(state, str) else json.dumps(state, sort_keys=True))
+        for path, state in entries.items()
+    )
@@ -0,0 +1,162 @@
+"""Incremental filesystem monitoring.
+
+`FileSystemWatcher` receives the changes of the `incremental` filesystem monitors from inotify
+and, after coalescing them for `flush_interval` seconds, checks only the paths involved
+(`AgentFileSystem.check_paths()`). The scheduled runs keep running the full scan,
+which reconciles the stored state with anything inotify could have missed (events queue
+overflow, changes while the watcher was not running, network filesystems).
+
+Run it with the `watch_monitors` management command, on the host where the paths are mounted.
+"""
+
+import logging
+import os
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterable, Optional
+
+from django.db import close_old_connections
+
+from .fs import AgentFileSystem
+from .inotify import (
+    IN_CREATE,
+    IN_IGNORED,
+    IN_ISDIR,
+    IN_MOVED_TO,
+    IN_Q_OVERFLOW,
+    Inotify,
+    InotifyEvent,
+)
+
+if TYPE_CHECKING:
+    from bitcaster.models import Monitor
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 2
+RELOAD_INTERVAL = 60
+
+
+def incremental_monitors() -> list["Monitor"]:
+    from bitcaster.models import Monitor
+
+    return [
+        m
+        for m in Monitor.objects.filter(active=True).select_related("event")
+        if isinstance(m.agent, AgentFileSystem) and m.config.get("incremental")
+    ]
+
+
+class FileSystemWatcher:
+    def __init__(self, inotify: Optional[Inotify] = None, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.inotify = inotify or Inotify()
+        self.flush_interval = flush_interval
+        self.agents: dict[int, AgentFileSystem] = {}
+        self.configs: dict[int, dict[str, object]] = {}
+        # watch descriptor -> (monitor, directory). Watching the same directory returns the same descriptor
+        self.watches: dict[int, set[tuple[int, str]]] = defaultdict(set)
+        self.pending: dict[int, set[str]] = defaultdict(set)
+        self.rescan: set[int] = set()
+
+    def add(self, monitor: "Monitor") -> None:
+        agent: AgentFileSystem = monitor.agent
+        self.agents[monitor.pk] = agent
+        self.configs[monitor.pk] = monitor.config
+        root = agent.path.absolute()
+        if not root.is_dir():
+            self.watch_dir(monitor.pk, root.parent)
+        elif agent.config["recursive"]:
+            self.watch_tree(monitor.pk, root)
+        else:
+            self.watch_dir(monitor.pk, root)
+
+    def remove(self, pk: int) -> None:
+        self.agents.pop(pk, None)
+        self.configs.pop(pk, None)
+        self.pending.pop(pk, None)
+        self.rescan.discard(pk)
+        for wd, targets in list(self.watches.items()):
+            targets.difference_update({t for t in targets if t[0] == pk})
+            if not targets:
+                del self.watches[wd]
+                self.inotify.rm_watch(wd)
+
+    def sync(self, monitors: Iterable["Monitor"]) -> None:
+        """Watch `monitors`, dropping the ones no longer in the list and reloading the changed ones."""
+        current = {m.pk: m for m in monitors}
+        for pk in list(self.agents):
+            if pk not in current or current[pk].config != self.configs[pk]:
+                self.remove(pk)
+        for pk, monitor in current.items():
+            if pk not in self.agents:
+                self.add(monitor)
+            else:  # keep the agent, but use the last stored state
+                self.agents[pk].monitor = monitor
+
+    def watch_dir(self, pk: int, directory: Path) -> None:
+        try:
+            wd = self.inotify.add_watch(str(directory))
+        except OSError as e:
+            logger.warning(f"Unable to watch {directory}: {e}")
+            return
+        self.watches[wd].add((pk, str(directory)))
+
+    def watch_tree(self, pk: int, directory: Path) -> None:
+        for root, __, __ in os.walk(directory):
+            self.watch_dir(pk, Path(root))
+
+    def dispatch(self, events: Iterable[InotifyEvent]) -> None:
+        for event in events:
+            if event.mask & IN_Q_OVERFLOW:
+                logger.warning("inotify queue overflow: all the monitors will be rescanned")
+                self.rescan.update(self.agents)
+                continue
+            if event.mask & IN_IGNORED:  # watched directory removed
+                self.watches.pop(event.wd, None)
+                continue
+            for pk, directory in list(self.watches.get(event.wd, ())):
+                path = os.path.join(directory, event.name) if event.name else directory
+                self.pending[pk].add(path)
+                new_dir = event.mask & IN_ISDIR and event.mask & (IN_CREATE | IN_MOVED_TO)
+                if new_dir and self.agents[pk].config["recursive"]:
+                    self.watch_tree(pk, Path(path))
+
+    def flush(self) -> None:
+        close_old_connections()
+        for pk in self.rescan:
+            self.pending.pop(pk, None)
+            self.run_check(pk, lambda agent: agent.check())
+        for pk, paths in self.pending.items():
+            self.run_check(pk, lambda agent: agent.check_paths(paths))
+        self.rescan.clear()
+        self.pending.clear()
+
+    def run_check(self, pk: int, check: Callable[[AgentFileSystem], None]) -> None:
+        if agent := self.agents.get(pk):
+            try:
+                # the scheduled reconciliation scans can have stored a newer state in the meantime
+                agent.monitor.refresh_from_db(fields=["data"])
+                check(agent)
+            except Exception as e:
+                logger.exception(e)
+
+    def run(
+        self,
+        reload: Callable[[], Iterable["Monitor"]] = incremental_monitors,
+        reload_interval: float = RELOAD_INTERVAL,
+        stop: Callable[[], bool] = lambda: False,
+    ) -> None:
+        self.sync(reload())
+        last_flush = last_reload = time.monotonic()
+        while not stop():
+            self.dispatch(self.inotify.read(timeout=self.flush_interval))
+            now = time.monotonic()
+            if now - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = now
+            if now - last_reload >= reload_interval:
+                close_old_connections()
+                self.sync(reload())
+                last_reload = now
+        self.flush()
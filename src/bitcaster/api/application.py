@@ -26,9 +26,13 @@ class ApplicationView(SecurityMixin, ViewSet, RetrieveAPIView, ListAPIView):
     lookup_field = "slug"
 
     def get_queryset(self) -> QuerySet[Application]:
-        return Application.objects.exclude(project__organization_id=Bitcaster.app.organization.pk).filter(
-            project__organization__slug=self.kwargs["org"],
-            project__slug=self.kwargs["prj"],
+        return (
+            Application.objects.select_related("project__organization")
+            .exclude(project__organization_id=Bitcaster.app.organization.pk)
+            .filter(
+                project__organization__slug=self.kwargs["org"],
+                project__slug=self.kwargs["prj"],
+            )
         )
 
     @extend_schema(description=_("List Project applications"))
@@ -1,21 +1,151 @@
+import csv
 import json
-from typing import Any
+from typing import IO, Any, Generator, Iterable, Iterator, Optional
 
-from django.db.models import QuerySet
-from django.http import HttpRequest
+from django.db import transaction
+from django.db.models import Q, QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
+from django.http.response import HttpResponseBase
 from django.utils.translation import gettext as _
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import OpenApiExample, extend_schema
 from rest_framework import serializers, status
 from rest_framework.decorators import action
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
 from bitcaster.api.base import SecurityMixin
 from bitcaster.auth.constants import Grant
-from bitcaster.models import Assignment, DistributionList, Project
+from bitcaster.models import Assignment, DistributionList, Project, RecipientSnapshot
 from bitcaster.utils.http import absolute_reverse
 
+MEMBERS_CHUNK_SIZE = 1000
+MEMBERS_NDJSON = "application/x-ndjson"
+MEMBERS_CSV = "text/csv"
+
+# input row: (row number, address or None if the row is invalid)
+Row = tuple[int, Optional[str]]
+
+
+def iter_lines(stream: Optional[IO[bytes]]) -> Iterator[str]:
+    if stream is None:
+        return
+    for line in iter(stream.readline, b""):
+        yield line.decode("utf-8-sig")
+
+
+def read_ndjson(lines: Iterable[str]) -> Iterator[Row]:
+    for num, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            value = json.loads(line)
+            if isinstance(value, dict):
+                value = value.get("address")
+        except ValueError:
+            value = None
+        yield num, value if isinstance(value, str) and value else None
+
+
+def read_csv(lines: Iterable[str]) -> Iterator[Row]:
+    for num, record in enumerate(csv.reader(lines), 1):
+        if not record or not record[0].strip():
+            continue
+        if num == 1 and record[0].strip().lower() == "address":
+            continue
+        yield num, record[0].strip()
+
+
+MEMBERS_FORMATS = {
+    MEMBERS_NDJSON: read_ndjson,
+    "application/jsonl": read_ndjson,
+    MEMBERS_CSV: read_csv,
+}
+
+
+def member_assignments(dl: DistributionList, addresses: Iterable[str]) -> dict[str, list[int]]:
+    """Map each of `addresses` to the ids of its Assignments usable by `dl`.
+
+    Only the Assignments to Channels of the organization of `dl` (global or of its project) are
+    considered. Unknown addresses are not returned.
+    """
+    ret: dict[str, list[int]] = {}
+    qs = Assignment.objects.filter(
+        Q(channel__project__isnull=True) | Q(channel__project=dl.project_id),
+        channel__organization=dl.project.organization_id,
+        address__value__in=addresses,
+    )
+    for value, pk in qs.values_list("address__value", "pk"):
+        ret.setdefault(value, []).append(pk)
+    return ret
+
+
+def add_members(dl: DistributionList, pks: Iterable[int]) -> list[int]:
+    """Add the Assignments `pks` to `dl` (using one INSERT) and return the ones not already present.
+
+    The RecipientSnapshots are not updated: callers must `sync()` the returned ids.
+    """
+    Through = DistributionList.recipients.through
+    pks = set(pks)
+    pks.difference_update(
+        Through.objects.filter(distributionlist=dl, assignment_id__in=pks).values_list("assignment_id", flat=True)
+    )
+    Through.objects.bulk_create([Through(distributionlist=dl, assignment_id=pk) for pk in pks], ignore_conflicts=True)
+    return sorted(pks)
+
+
+def remove_members(dl: DistributionList, pks: Iterable[int]) -> list[int]:
+    """Remove the Assignments `pks` from `dl` and return the ones actually removed.
+
+    The RecipientSnapshots are not updated: callers must `sync()` the returned ids.
+    """
+    qs = DistributionList.recipients.through.objects.filter(distributionlist=dl, assignment_id__in=set(pks))
+    removed = sorted(qs.values_list("assignment_id", flat=True))
+    qs.delete()
+    return removed
+
+
+def chunked(rows: Iterable[Row], size: int) -> Iterator[list[Row]]:
+    chunk: list[Row] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def bulk_members(
+    dl: DistributionList, rows: Iterable[Row], add: bool = True, chunk_size: int = MEMBERS_CHUNK_SIZE
+) -> Generator[dict[str, Any], None, None]:
+    """Add/remove the addresses in `rows` to/from `dl`, one chunk (and one transaction) at a time.
+
+    Yields a result for each row, with status:
+    - `added`/`removed`: at least one Assignment of the address has been added/removed
+    - `unchanged`: all the Assignments of the address were already (not) in the list
+    - `not_found`: no Assignment exists for the address
+    - `invalid`: the row cannot be parsed
+    """
+    done = "added" if add else "removed"
+    for chunk in chunked(rows, chunk_size):
+        by_address = member_assignments(dl, {addr for __, addr in chunk if addr})
+        with transaction.atomic():
+            all_pks = [pk for pks in by_address.values() for pk in pks]
+            changed = set(add_members(dl, all_pks) if add else remove_members(dl, all_pks))
+            RecipientSnapshot.objects.sync(changed)
+        for num, addr in chunk:
+            if not addr:
+                yield {"row": num, "address": addr, "status": "invalid"}
+            elif addr not in by_address:
+                yield {"row": num, "address": addr, "status": "not_found"}
+            else:
+                pks = by_address[addr]
+                result = done if changed.intersection(pks) else "unchanged"
+                yield {"row": num, "address": addr, "status": result, "assignments": len(pks)}
+
 
 class DistributionAddSerializer(serializers.Serializer):
     address = serializers.CharField()
@@ -70,7 +200,7 @@ class DistributionView(SecurityMixin, ViewSet, ListAPIView, CreateAPIView, Retri
         return self.project.distributionlist_set.get(pk=self.kwargs["pk"])
 
     def get_queryset(self) -> QuerySet[DistributionList]:
-        return DistributionList.objects.filter(
+        return DistributionList.objects.select_related("project__organization").filter(
             project__organization__slug=self.kwargs["org"], project__slug=self.kwargs["prj"]
         )
 
@@ -89,23 +219,55 @@ class DistributionView(SecurityMixin, ViewSet, ListAPIView, CreateAPIView, Retri
         dl: DistributionList = self.get_object()
         try:
             data = json.loads(request.body)
-            asms = Assignment.objects.filter(address__value__in=data)
-            expected = len(data)
-            found = len(asms)
-            if found != expected:
-                raise serializers.ValidationError("Invalid addresses")
-            dl.recipients.add(*asms)
+            found = member_assignments(dl, data)
+            if missing := set(data).difference(found):
+                raise serializers.ValidationError("Invalid addresses: %s" % ", ".join(sorted(missing)))
+            with transaction.atomic():
+                RecipientSnapshot.objects.sync(add_members(dl, [pk for pks in found.values() for pk in pks]))
             return Response(
                 {
                     "message": data,
-                    "expected": expected,
-                    "found": found,
-                    "added": asms.values_list("address__value", flat=True),
+                    "expected": len(data),
+                    "found": len(found),
+                    "added": list(found),
                 }
             )
         except Exception as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+    @extend_schema(
+        description=_(
+            "Bulk add recipients to a DistributionList. "
+            "Body is NDJSON (one address, or {'address': ...} object, per line) or CSV (address in the first column). "
+            "Returns one NDJSON result per input row."
+        ),
+        request={MEMBERS_NDJSON: OpenApiTypes.BINARY, MEMBERS_CSV: OpenApiTypes.BINARY},
+    )
+    @action(detail=True, methods=["POST"])
+    def import_recipients(self, request: Request, **kwargs: Any) -> HttpResponseBase:
+        return self._bulk(request, add=True)
+
+    @extend_schema(
+        description=_("Bulk remove recipients from a DistributionList. Same formats of the import"),
+        request={MEMBERS_NDJSON: OpenApiTypes.BINARY, MEMBERS_CSV: OpenApiTypes.BINARY},
+    )
+    @action(detail=True, methods=["POST"])
+    def remove_recipients(self, request: Request, **kwargs: Any) -> HttpResponseBase:
+        return self._bulk(request, add=False)
+
+    def _bulk(self, request: Request, add: bool) -> HttpResponseBase:
+        dl: DistributionList = self.get_object()
+        content_type = request.content_type.split(";")[0].strip()
+        if content_type not in MEMBERS_FORMATS:
+            return Response(
+                {"error": "Unsupported content type. Use one of %s" % ", ".join(MEMBERS_FORMATS)},
+                status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        rows = MEMBERS_FORMATS[content_type](iter_lines(request.stream))
+        return StreamingHttpResponse(
+            (json.dumps(r) + "\n" for r in bulk_members(dl, rows, add)), content_type=MEMBERS_NDJSON
+        )
+
 
 class DistributionMembersView(SecurityMixin, ViewSet, ListAPIView):
     """
@@ -116,6 +278,8 @@ class DistributionMembersView(SecurityMixin, ViewSet, ListAPIView):
     required_grants = [Grant.DISTRIBUTION_LIST]
 
     def get_queryset(self) -> QuerySet[Assignment]:
-        return Assignment.objects.filter(
-            distributionlist__id=self.kwargs["pk"], distributionlist__project__slug=self.kwargs["prj"]
+        return (
+            Assignment.objects.select_related("address__user", "channel")
+            .only("id", "active", "address__value", "address__user__username", "channel__name")
+            .filter(distributionlist__id=self.kwargs["pk"], distributionlist__project__slug=self.kwargs["prj"])
         )
@@ -11,6 +11,12 @@ from ..auth.constants import Grant
 from ..exceptions import LockError
 from ..models import Event, Occurrence
 from ..models.occurrence import OccurrenceOptions
+from ..telemetry import (
+    ATTR_CORRELATION_ID,
+    ATTR_EVENT,
+    ATTR_OCCURRENCE,
+    set_attributes,
+)
 from .base import SecurityMixin
 
 app_name = "api"
@@ -20,6 +26,7 @@ class OptionSerializer(serializers.Serializer):
     limit_to = serializers.ListField(child=serializers.CharField(), required=False)
     channels = serializers.ListField(child=serializers.CharField(), required=False)
     environs = serializers.ListField(child=serializers.CharField(), required=False)
+    priority = serializers.ChoiceField(choices=Event.Priority.choices, required=False)
 
     def validate(self, attrs: dict[str, Any]) -> dict[str, Any]:
         unknown = set(self.parent.initial_data["options"]) - set(self.fields)
@@ -48,7 +55,7 @@ class EventList(SecurityMixin, ListAPIView):
     required_grants = [Grant.EVENT_LIST]
 
     def get_queryset(self) -> QuerySet[Event]:
-        return Event.objects.filter(
+        return Event.objects.prefetch_related("channels").filter(
             application__project__organization__slug=self.kwargs["org"],
             application__project__slug=self.kwargs["prj"],
             application__slug=self.kwargs["app"],
@@ -97,6 +104,7 @@ class EventTrigger(SecurityMixin, GenericAPIView):
                     options=opts,
                     cid=correlation_id,
                 )
+                set_attributes({ATTR_EVENT: evt.slug, ATTR_OCCURRENCE: o.pk, ATTR_CORRELATION_ID: o.correlation_id})
                 return Response({"occurrence": o.pk}, status=201)
             except LockError as e:
                 return Response({"error": str(e)}, status=400)
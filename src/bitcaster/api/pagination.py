@@ -0,0 +1,46 @@
+from typing import Any, Optional
+
+from django.db.models import QuerySet
+from rest_framework.pagination import CursorPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+
+class KeysetPagination(CursorPagination):
+    """Cursor (keyset) pagination on the primary key.
+
+    Each page is a `WHERE id > <last seen> ORDER BY id LIMIT <size>` query, so its cost does not
+    depend on the position in the list. The body is still the plain list of records;
+    links to the other pages are returned in the `Link` header (RFC 8288), as `rel="next"`
+    and `rel="prev"`.
+
+    Pagination is opt-in: requests without the `page_size` or the `cursor` query parameter get
+    the whole list, as before pagination was introduced.
+    """
+
+    ordering = "id"
+    page_size_query_param = "page_size"
+    max_page_size = 1000
+
+    def paginate_queryset(
+        self, queryset: QuerySet[Any], request: Request, view: Optional[APIView] = None
+    ) -> Optional[list[Any]]:
+        if (
+            self.page_size_query_param not in request.query_params
+            and self.cursor_query_param not in request.query_params
+        ):
+            return None
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        links = [
+            f'<{url}>; rel="{rel}"'
+            for url, rel in ((self.get_next_link(), "next"), (self.get_previous_link(), "prev"))
+            if url
+        ]
+        headers: Optional[dict[str, str]] = {"Link": ", ".join(links)} if links else None
+        return Response(data, headers=headers)
+
+    def get_paginated_response_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+        return schema
@@ -26,8 +26,12 @@ class ProjectView(SecurityMixin, ViewSet, ListAPIView, RetrieveAPIView):
     lookup_field = "slug"
 
     def get_queryset(self) -> QuerySet[Project]:
-        return Project.objects.exclude(organization_id=Bitcaster.app.organization.pk).filter(
-            organization__slug=self.kwargs["org"],
+        return (
+            Project.objects.select_related("organization")
+            .exclude(organization_id=Bitcaster.app.organization.pk)
+            .filter(
+                organization__slug=self.kwargs["org"],
+            )
         )
 
     @extend_schema(description=_("Retrieve project details"))
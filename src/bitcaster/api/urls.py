@@ -21,6 +21,7 @@ urlpatterns = [
     path("o/<slug:org>/", OrgView.as_view({"get": "retrieve"}), name="org"),
     path("o/<slug:org>/c/", ChannelView.as_view({"get": "list_for_org"}), name="org-channel-list"),
     #
+    path("o/<slug:org>/u/bulk/", UserView.as_view({"post": "bulk"}), name="user-bulk"),
     path("o/<slug:org>/u/<str:username>/address/", UserView.as_view({"get": "list_address", "post": "add_address"})),
     path("o/<slug:org>/u/<str:username>/", UserView.as_view({"put": "update"}), name="user-update"),
     path("o/<slug:org>/u/", UserView.as_view({"get": "get", "post": "post"}), name="user-list"),
@@ -34,6 +35,16 @@ urlpatterns = [
         "o/<slug:org>/p/<slug:prj>/d/<int:pk>/m/", DistributionMembersView.as_view({"get": "list"}), name="members-list"
     ),
     path("o/<slug:org>/p/<slug:prj>/d/<int:pk>/add/", DistributionView.as_view({"post": "add_recipient"})),
+    path(
+        "o/<slug:org>/p/<slug:prj>/d/<int:pk>/import/",
+        DistributionView.as_view({"post": "import_recipients"}),
+        name="distribution-import",
+    ),
+    path(
+        "o/<slug:org>/p/<slug:prj>/d/<int:pk>/remove/",
+        DistributionView.as_view({"post": "remove_recipients"}),
+        name="distribution-remove",
+    ),
     path("o/<slug:org>/p/<slug:prj>/d/<int:pk>/", DistributionView.as_view({"get": "list"}), name="distribution-list"),
     path("o/<slug:org>/p/<slug:prj>/d/", DistributionView.as_view({"get": "list"}), name="distribution-list"),
     #
@@ -7,6 +7,7 @@ from drf_spectacular.utils import extend_schema
 from rest_framework import serializers, status
 from rest_framework.decorators import action
 from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveAPIView
+from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.viewsets import ViewSet
 
@@ -15,6 +16,7 @@ from bitcaster.api.serializers import AddressSerializer
 from bitcaster.auth.constants import Grant
 from bitcaster.constants import Bitcaster
 from bitcaster.models import Organization, User, UserRole
+from bitcaster.provisioning import Provisioner
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -45,6 +47,27 @@ class UserSerializer(serializers.ModelSerializer):
         return user
 
 
+class ProvisioningAddressSerializer(serializers.Serializer):
+    name = serializers.CharField(required=False)
+    value = serializers.CharField()
+    channels = serializers.ListField(child=serializers.CharField(), required=False)
+
+
+class ProvisioningSerializer(serializers.Serializer):
+    email = serializers.EmailField()
+    first_name = serializers.CharField(required=False)
+    last_name = serializers.CharField(required=False)
+    channels = serializers.ListField(child=serializers.CharField(), required=False)
+    addresses = ProvisioningAddressSerializer(many=True, required=False)
+
+
+class ProvisioningResultSerializer(serializers.Serializer):
+    users = serializers.IntegerField()
+    addresses = serializers.IntegerField()
+    assignments = serializers.IntegerField()
+    errors = serializers.ListField(child=serializers.DictField())
+
+
 class UserView(SecurityMixin, ViewSet, ListAPIView, CreateAPIView, RetrieveAPIView):
     serializer_class = UserSerializer
     required_grants = [Grant.USER_READ, Grant.USER_WRITE]
@@ -67,6 +90,21 @@ class UserView(SecurityMixin, ViewSet, ListAPIView, CreateAPIView, RetrieveAPIVi
     def post(self, request: HttpRequest, *args: Any, **kwargs: Any) -> Response:
         return super().post(request, *args, **kwargs)
 
+    @extend_schema(
+        request=ProvisioningSerializer(many=True),
+        responses=ProvisioningResultSerializer,
+        description=_(
+            "Create/update Organization's users, with their addresses and channel assignments. "
+            "Existing users (matched by email) are updated"
+        ),
+    )
+    @action(detail=False, methods=["POST"])
+    def bulk(self, request: Request, **kwargs: Any) -> Response:
+        if not isinstance(request.data, list):
+            return Response({"error": "Expected a list of users"}, status=status.HTTP_400_BAD_REQUEST)
+        result = Provisioner(self.organization).run(request.data)
+        return Response(result.as_dict())
+
     @extend_schema(
         request=UserSerializer,
         description=_("Update an Organization's user"),
@@ -0,0 +1,182 @@
+"""Two-tier cache backend.
+
+A small per-process LRU (`LocMemCache`) sits in front of a shared cache (usually Redis).
+Reads are served from the process memory when possible, then from the shared cache.
+Writes and deletes go to both tiers and are broadcast on a Redis pub/sub channel, so that
+all the other processes drop their local copy. If pub/sub is not available (not a Redis
+backend, connection lost) local entries are never staler than `LOCAL_TIMEOUT` seconds.
+
+Meant for small and rarely changing objects (configuration, system objects), that are read
+on each delivery::
+
+    CACHES = {
+        "config": {
+            "BACKEND": "bitcaster.cache.backends.TwoTierCache",
+            "LOCATION": "default",  # alias of the shared cache
+            "OPTIONS": {"LOCAL_TIMEOUT": 60, "MAX_ENTRIES": 1000},
+        }
+    }
+"""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Optional
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.core.cache.backends.locmem import LocMemCache
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "bitcaster:cache:invalidate"
+CLEAR_ALL = "*"
+RECONNECT_DELAY = 5
+
+_listeners: dict[str, "Listener"] = {}
+_listeners_lock = threading.Lock()
+
+
+def get_redis(alias: str) -> Any:
+    """Return the raw Redis client of the `alias` cache, if it is a django-redis one."""
+    try:
+        from django_redis import get_redis_connection
+        from django_redis.cache import RedisCache
+    except ImportError:  # pragma: no cover
+        return None
+    if not isinstance(caches[alias], RedisCache):
+        return None
+    return get_redis_connection(alias)
+
+
+class Listener(threading.Thread):
+    """Drop the local entries invalidated by other processes."""
+
+    def __init__(self, name: str, local: LocMemCache, redis: Any) -> None:
+        super().__init__(name=f"cache-listener-{name}", daemon=True)
+        self.local = local
+        self.redis = redis
+        self.pid = os.getpid()
+
+    def process(self, data: str) -> None:
+        if data == CLEAR_ALL:
+            self.local.clear()
+        else:
+            version, key = data.split(":", 1)
+            self.local.delete(key, version=int(version))
+
+    def run(self) -> None:
+        while True:
+            try:
+                pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                for message in pubsub.listen():
+                    self.process(message["data"].decode())
+            except Exception as e:  # pragma: no cover
+                logger.warning(f"Cache invalidation listener error: {e}")
+                # messages may have been lost
+                self.local.clear()
+                time.sleep(RECONNECT_DELAY)
+
+
+class TwoTierCache(BaseCache):
+    def __init__(self, location: str, params: dict[str, Any]) -> None:
+        super().__init__(params)
+        # `clear()` only removes the keys with this prefix from the shared cache
+        self.key_prefix = self.key_prefix or "two-tier"
+        options = params.get("OPTIONS", {})
+        self.shared_alias = location or "default"
+        self.local_timeout = options.get("LOCAL_TIMEOUT", 60)
+        self.name = f"two-tier-{self.shared_alias}-{self.key_prefix}"
+        self.local = LocMemCache(
+            self.name,
+            {
+                "TIMEOUT": self.local_timeout,
+                "KEY_PREFIX": self.key_prefix,
+                "VERSION": self.version,
+                "OPTIONS": {"MAX_ENTRIES": options.get("MAX_ENTRIES", 1000)},
+            },
+        )
+
+    @property
+    def shared(self) -> BaseCache:
+        return caches[self.shared_alias]
+
+    def listen(self) -> None:
+        """Start (once per process) the thread that receives the invalidation messages."""
+        listener = _listeners.get(self.name)
+        if listener and listener.pid == os.getpid():
+            return
+        with _listeners_lock:
+            listener = _listeners.get(self.name)
+            if listener and listener.pid == os.getpid():
+                return
+            if redis := get_redis(self.shared_alias):
+                _listeners[self.name] = listener = Listener(self.name, self.local, redis)
+                listener.start()
+
+    def publish(self, data: str) -> None:
+        try:
+            if redis := get_redis(self.shared_alias):
+                redis.publish(CHANNEL, data)
+        except Exception as e:  # pragma: no cover
+            logger.warning(f"Unable to publish cache invalidation: {e}")
+
+    def shared_key(self, key: str, version: Optional[int] = None) -> str:
+        return self.make_and_validate_key(key, version=version)
+
+    def shared_timeout(self, timeout: Any) -> Any:
+        # the shared cache computes the expiration itself
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    def local_set(self, key: str, value: Any, timeout: Any, version: Optional[int]) -> None:
+        if timeout is DEFAULT_TIMEOUT or timeout is None or timeout > self.local_timeout:
+            timeout = self.local_timeout
+        self.listen()
+        self.local.set(key, value, timeout=timeout, version=version)
+
+    def invalidate(self, key: str, version: Optional[int]) -> None:
+        self.local.delete(key, version=version)
+        self.publish(f"{version or self.version}:{key}")
+
+    def get(self, key: str, default: Any = None, version: Optional[int] = None) -> Any:
+        sentinel = object()
+        value = self.local.get(key, sentinel, version=version)
+        if value is not sentinel:
+            return value
+        value = self.shared.get(self.shared_key(key, version), sentinel)
+        if value is sentinel:
+            return default
+        self.local_set(key, value, DEFAULT_TIMEOUT, version)
+        return value
+
+    def set(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> None:
+        self.shared.set(self.shared_key(key, version), value, timeout=self.shared_timeout(timeout))
+        self.invalidate(key, version)
+        self.local_set(key, value, timeout, version)
+
+    def add(self, key: str, value: Any, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        if added := self.shared.add(self.shared_key(key, version), value, timeout=self.shared_timeout(timeout)):
+            self.invalidate(key, version)
+            self.local_set(key, value, timeout, version)
+        return added
+
+    def touch(self, key: str, timeout: Any = DEFAULT_TIMEOUT, version: Optional[int] = None) -> bool:
+        return self.shared.touch(self.shared_key(key, version), timeout=self.shared_timeout(timeout))
+
+    def delete(self, key: str, version: Optional[int] = None) -> bool:
+        deleted = self.shared.delete(self.shared_key(key, version))
+        self.invalidate(key, version)
+        return deleted
+
+    def has_key(self, key: str, version: Optional[int] = None) -> bool:
+        return self.local.has_key(key, version=version) or self.shared.has_key(self.shared_key(key, version))
+
+    def clear(self) -> None:
+        if hasattr(self.shared, "delete_pattern"):
+            self.shared.delete_pattern(f"{self.key_prefix}:*")
+        else:
+            self.shared.clear()
+        self.local.clear()
+        self.publish(CLEAR_ALL)
@@ -0,0 +1,59 @@
+"""Cache of the configuration objects read during delivery.
+
+Values are stored in the "config" two-tier cache (see `bitcaster.cache.backends`): workers
+read them from their own memory, and the handlers in `bitcaster.cache.handlers` drop them
+(in all the processes) when the related objects change.
+"""
+
+import uuid
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, TypeVar
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.db import transaction
+from flags import state
+
+from bitcaster.constants import CacheKey
+
+if TYPE_CHECKING:
+    from django.core.cache.backends.base import BaseCache
+
+T = TypeVar("T")
+
+CONFIG_CACHE = "config"
+# flags conditions can depend on time (ie. `after date`), do not keep them too long
+FLAG_TIMEOUT = 60
+
+
+def config_cache() -> "BaseCache":
+    return caches[CONFIG_CACHE]
+
+
+def get_or_load(key: str, loader: Callable[[], T], timeout: Any = DEFAULT_TIMEOUT) -> T:
+    return config_cache().get_or_set(key, loader, timeout=timeout)
+
+
+def _delete(keys: tuple[str, ...]) -> None:
+    for key in keys:
+        config_cache().delete(key)
+
+
+def forget(*keys: str) -> None:
+    """Drop `keys` now and again when the current transaction commits.
+
+    Until the commit, other processes still read the old rows and can cache them again.
+    """
+    if keys:
+        _delete(keys)
+        transaction.on_commit(partial(_delete, keys))
+
+
+def generation(key: str) -> str:
+    """Token to build keys that can be invalidated together: `forget(key)` makes them all unreachable."""
+    return get_or_load(key, lambda: uuid.uuid4().hex)
+
+
+def flag_enabled(name: str) -> bool:
+    """Cached `flags.state.flag_enabled()`, only for flags whose conditions do not depend on the request."""
+    return get_or_load(CacheKey.FLAG.format(name), lambda: state.flag_enabled(name), timeout=FLAG_TIMEOUT)
@@ -1,16 +1,86 @@
 import logging
 from typing import Any
 
-from django.core.cache import cache
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
 from django.dispatch import receiver
+from django.test.signals import setting_changed
+from flags.models import FlagState
 
-from bitcaster.constants import CacheKey
-from bitcaster.models import Occurrence
+from bitcaster.cache.config import forget
+from bitcaster.cache.storage import invalidate
+from bitcaster.constants import Bitcaster, CacheKey
+from bitcaster.models import Application, Channel, Event, Message, User
 
 logger = logging.getLogger(__name__)
 
 
-@receiver(post_save, sender=Occurrence, dispatch_uid="invalidate_occurrence_cache")
-def invalidate_occurrence_cache(**kwargs: Any) -> None:
-    cache.delete(CacheKey.DASHBOARDS_EVENTS)
+# Occurrences invalidate the dashboard through OccurrenceRollup (debounced), here only
+# the rarely changing objects shown with the counters
+@receiver(post_save, sender=Event, dispatch_uid="invalidate_event_cache")
+@receiver(post_delete, sender=Event, dispatch_uid="invalidate_deleted_event_cache")
+@receiver(post_save, sender=Application, dispatch_uid="invalidate_application_cache")
+@receiver(post_delete, sender=Application, dispatch_uid="invalidate_deleted_application_cache")
+def invalidate_model_cache(sender: Any, **kwargs: Any) -> None:
+    invalidate(sender)
+
+
+# configuration cache
+
+
+@receiver(post_save, sender=Application, dispatch_uid="forget_application_config")
+@receiver(post_delete, sender=Application, dispatch_uid="forget_deleted_application_config")
+def forget_application(sender: Any, instance: Application, **kwargs: Any) -> None:
+    forget(CacheKey.BITCASTER_APP, CacheKey.SYSTEM_EVENTS)
+
+
+@receiver(post_save, sender=Event, dispatch_uid="forget_event_config")
+@receiver(post_delete, sender=Event, dispatch_uid="forget_deleted_event_config")
+def forget_event(sender: Any, instance: Event, **kwargs: Any) -> None:
+    forget(CacheKey.SYSTEM_EVENTS, CacheKey.EVENT_CHANNELS.format(instance.pk))
+
+
+@receiver(post_save, sender=Channel, dispatch_uid="forget_channel_config")
+@receiver(pre_delete, sender=Channel, dispatch_uid="forget_deleted_channel_config")
+def forget_channel(sender: Any, instance: Channel, **kwargs: Any) -> None:
+    # pre_delete: relations are removed before post_delete is sent
+    event_ids = Event.channels.through.objects.filter(channel=instance).values_list("event_id", flat=True)
+    forget(*(CacheKey.EVENT_CHANNELS.format(pk) for pk in event_ids))
+
+
+@receiver(m2m_changed, sender=Event.channels.through, dispatch_uid="forget_event_channels_config")
+def forget_event_channels(sender: Any, instance: Any, action: str, reverse: bool, pk_set: Any, **kwargs: Any) -> None:
+    if action == "pre_clear" and reverse:  # channel.event_set.clear(), pk_set is not available
+        forget_channel(Channel, instance)
+    elif action.startswith("post_"):
+        if not reverse:
+            forget(CacheKey.EVENT_CHANNELS.format(instance.pk))
+        elif pk_set:
+            forget(*(CacheKey.EVENT_CHANNELS.format(pk) for pk in pk_set))
+
+
+@receiver(post_save, sender=Message, dispatch_uid="forget_message_config")
+@receiver(post_delete, sender=Message, dispatch_uid="forget_deleted_message_config")
+def forget_message(sender: Any, instance: Message, **kwargs: Any) -> None:
+    # default templates (without notification) are used by all the event notifications
+    event_ids = {instance.event_id, instance._initial_event_id} - {None}
+    forget(*(CacheKey.EVENT_MESSAGES.format(pk) for pk in event_ids))
+    instance._initial_event_id = instance.event_id
+
+
+@receiver(post_save, sender=FlagState, dispatch_uid="forget_flag_config")
+@receiver(post_delete, sender=FlagState, dispatch_uid="forget_deleted_flag_config")
+def forget_flag(sender: Any, instance: FlagState, **kwargs: Any) -> None:
+    forget(CacheKey.FLAG.format(instance.name))
+
+
+@receiver(setting_changed, dispatch_uid="forget_flags_setting")
+def forget_flags(setting: str, value: Any, **kwargs: Any) -> None:
+    if setting == "FLAGS":
+        forget(*(CacheKey.FLAG.format(name) for name in value or {}))
+
+
+@receiver(post_save, sender=User, dispatch_uid="forget_system_user_config")
+@receiver(post_delete, sender=User, dispatch_uid="forget_deleted_system_user_config")
+def forget_system_user(sender: Any, instance: User, **kwargs: Any) -> None:
+    if instance.username == Bitcaster.SYSTEM_USER:
+        forget(CacheKey.SYSTEM_USER)
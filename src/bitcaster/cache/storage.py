@@ -1,33 +1,118 @@
-from typing import Any, Optional
+"""QuerySet results cache.
 
+Keys are stable across processes: they are built from a digest of the compiled SQL and its
+parameters, plus the current "version" of each model the query reads from.
+`invalidate(Model)` bumps the version of a model, so that all the cached querysets using
+it are not reachable anymore (and expire after their TTL).
+
+`invalidate_debounced(Model)` coalesces the invalidations of frequently changing models:
+the version is bumped at most once per `window`; entries depending on such models should be
+stored with `timeout=window`, so they are never staler than that.
+
+`qs_get_or_store` prevents cache stampedes: when an entry is missing only one process
+runs the query, while the others wait (up to `LOCK_TIMEOUT`) for the value to be stored.
+"""
+
+import hashlib
+import time
+from typing import Any, Iterable, Optional
+
+from django.apps import apps
 from django.core.cache import cache
 from django.db.models import Model, QuerySet
-from flags.state import flag_enabled
+from django.db.models.query import ValuesIterable
+
+from bitcaster.cache.config import flag_enabled
+
+DEFAULT_TIMEOUT = 300
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 0.05
+INVALIDATION_WINDOW = 30
+PREFIX = "qs"
+
+
+def model_label(model: type[Model]) -> str:
+    return model._meta.label_lower
+
+
+def qs_models(qs: QuerySet[Model, Any]) -> list[type[Model]]:
+    """Models whose tables are read by `qs` (including joins)."""
+    tables = {alias.table_name for alias in qs.query.alias_map.values()}
+    tables.add(qs.model._meta.db_table)
+    return sorted(
+        (m for m in apps.get_models(include_auto_created=True) if m._meta.db_table in tables),
+        key=model_label,
+    )
+
+
+def _version_key(model: type[Model]) -> str:
+    return f"{PREFIX}:version:{model_label(model)}"
 
 
-def qs_to_cache(qs: QuerySet[Model], key: Optional[str] = None) -> list[Any]:
-    value = list(qs.values())
+def get_versions(models: Iterable[type[Model]]) -> dict[str, int]:
+    keys = {_version_key(m): model_label(m) for m in models}
+    versions = cache.get_many(keys)
+    return {label: versions.get(key, 0) for key, label in keys.items()}
+
+
+def invalidate(*models: type[Model]) -> None:
+    """Bump the version of `models`, discarding all the cached querysets that use them."""
+    for model in models:
+        key = _version_key(model)
+        if not cache.add(key, 1, timeout=None):
+            try:
+                cache.incr(key)
+            except ValueError:  # expired/evicted in the meantime
+                cache.set(key, 1, timeout=None)
+
+
+def invalidate_debounced(*models: type[Model], window: int = INVALIDATION_WINDOW) -> None:
+    for model in models:
+        if cache.add(f"{_version_key(model)}:debounce", 1, timeout=window):
+            invalidate(model)
+
+
+def qs_cache_key(qs: QuerySet[Model, Any], key: Optional[str] = None) -> str:
+    """Return a key that only depends on the query and on the versions of the models it reads."""
+    # compiling also sets up the joins used to find the models involved
+    sql, params = qs.query.sql_with_params()
+    if not key:
+        key = hashlib.sha256(f"{qs.db}|{sql}|{params!r}".encode()).hexdigest()
+    tags = ",".join(f"{label}={version}" for label, version in get_versions(qs_models(qs)).items())
+    return f"{PREFIX}:{key}:{hashlib.md5(tags.encode(), usedforsecurity=False).hexdigest()}"
+
+
+def qs_to_cache(qs: QuerySet[Model], key: Optional[str] = None, timeout: int = DEFAULT_TIMEOUT) -> list[Any]:
+    value = list(qs if issubclass(qs._iterable_class, ValuesIterable) else qs.values())
     if flag_enabled("DISABLE_CACHE"):
         return value
-    key = key or str(hash(qs.query))
-    cache.set(key, value)
+    cache.set(qs_cache_key(qs, key), value, timeout=timeout)
     return value
 
 
 def qs_from_cache(qs: QuerySet[Model], key: Optional[str] = None) -> Optional[list[Any]]:
     if flag_enabled("DISABLE_CACHE"):
         return None
-
-    key = key or str(hash(qs.query))
-    return cache.get(key)
+    return cache.get(qs_cache_key(qs, key))
 
 
 def qs_del_cache(qs: QuerySet[Model], key: Optional[str] = None) -> int:
-    key = key or str(hash(qs.query))
-    return cache.delete(key)
+    return cache.delete(qs_cache_key(qs, key))
 
 
-def qs_get_or_store(qs: QuerySet[Model, Any], key: Optional[str] = None) -> list[Any]:
-    if not (value := qs_from_cache(qs, key=key)):
-        value = qs_to_cache(qs, key=key)
-    return value
+def qs_get_or_store(qs: QuerySet[Model, Any], key: Optional[str] = None, timeout: int = DEFAULT_TIMEOUT) -> list[Any]:
+    if (value := qs_from_cache(qs, key=key)) is not None:
+        return value
+    lock = f"{qs_cache_key(qs, key)}:lock"
+    if cache.add(lock, 1, timeout=LOCK_TIMEOUT):
+        try:
+            return qs_to_cache(qs, key=key, timeout=timeout)
+        finally:
+            cache.delete(lock)
+    # somebody else is running the query: wait for its result
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_WAIT)
+        if (value := cache.get(qs_cache_key(qs, key))) is not None:
+            return value
+    return qs_to_cache(qs, key=key, timeout=timeout)
@@ -38,7 +38,13 @@ CONFIG: "Mapping[str, ConfigItem]" = {
     ),
     "AGENT_FILESYSTEM_ROOT": (str, "", "AgentFilesystem root directory"),
     "AGENT_FILESYSTEM_DISALLOWED": (list, "", "AgentFilesystem disallowed directories"),
+    "AGENT_FILESYSTEM_SCAN_WORKERS": (
+        int,
+        8,
+        "Max number of directories read in parallel by the recursive filesystem monitors",
+    ),
     "ALLOWED_HOSTS": (list, ["127.0.0.1", "localhost"], setting("allowed-hosts")),
+    "API_PAGE_SIZE": (int, 100, "Number of records per page returned by the API list endpoints, when paginated"),
     "AUTHENTICATION_BACKENDS": (list, [], setting("authentication-backends")),
     "BITCASTER_DOCUMENTATION_SITE_URL": (
         str,
@@ -51,6 +57,8 @@ CONFIG: "Mapping[str, ConfigItem]" = {
     ),
     "CATCH_ALL_EMAIL": (str, "If set all the emails will be sent to this address"),
     "CELERY_BROKER_URL": (str, NOT_SET, "https://docs.celeryq.dev/en/stable/django/first-steps-with-django.html"),
+    "CELERY_QUEUE_HIGH_PRIORITY": (str, "queue_hcr_high", "Queue used to process high priority Occurrences"),
+    "CELERY_QUEUE_LOW_PRIORITY": (str, "queue_hcr_low", "Queue used to process low priority Occurrences"),
     "CELERY_TASK_ALWAYS_EAGER": (
         bool,
         False,
@@ -67,6 +75,11 @@ CONFIG: "Mapping[str, ConfigItem]" = {
         1800,
         "https://docs.celeryq.dev/en/stable/userguide/configuration.html#broker-transport-options",
     ),
+    "CONFIG_CACHE_LOCAL_TIMEOUT": (
+        int,
+        60,
+        "Max seconds configuration objects are kept in the process memory without being revalidated",
+    ),
     "CSRF_COOKIE_SECURE": (bool, True, setting("csrf-cookie-secure"), False),
     "CSRF_COOKIE_SAMESITE": (str, setting("csrf-cookie-samesite")),
     "CSRF_TRUSTED_ORIGINS": (list, ["http://localhost", "http://127.0.0.1"]),
@@ -91,6 +104,13 @@ CONFIG: "Mapping[str, ConfigItem]" = {
     "MEDIA_FILE_STORAGE": (str, "django.core.files.storage.FileSystemStorage", setting("storages")),
     "MEDIA_ROOT": (str, None, setting("media-root")),
     "MEDIA_URL": (str, "/media/", setting("media-url")),
+    "METRICS_CACHE_TIMEOUT": (int, 15, "Seconds the database metrics are cached for"),
+    "METRICS_ENABLED": (bool, False, "Expose Prometheus metrics at /metrics/"),
+    "METRICS_WORKER_PORT": (int, 0, "If set, Celery workers expose Prometheus metrics on this port"),
+    "MONITOR_BATCH_SIZE": (int, 50, "Max number of Monitors checked by a single task"),
+    "MONITOR_CONCURRENCY": (int, 8, "Max number of Monitors checked in parallel by a task"),
+    "OTEL_ENABLED": (bool, False, "Enable OpenTelemetry tracing"),
+    "OTEL_SERVICE_NAME": (str, "bitcaster", "OpenTelemetry service name"),
     "ROOT_TOKEN": (str, "", ""),
     "SECRET_KEY": (str, NOT_SET, setting("secret-key")),
     "SECURE_HSTS_PRELOAD": (bool, True, setting("secure-hsts-preload"), False),
@@ -15,3 +15,33 @@ app.autodiscover_tasks(lambda: settings.INSTALLED_APPS, related_name="tasks")
 @signals.celeryd_init.connect
 def init_sentry(**_kwargs: Any) -> None:
     sentry_sdk.set_tag("celery", True)
+
+
+@signals.worker_init.connect
+def init_metrics(**_kwargs: Any) -> None:
+    if settings.METRICS_WORKER_PORT:
+        from bitcaster.metrics import start_worker_server
+
+        start_worker_server(settings.METRICS_WORKER_PORT)
+
+
+@signals.worker_process_shutdown.connect
+def mark_metrics_process_dead(pid: int, **_kwargs: Any) -> None:
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        from prometheus_client import multiprocess
+
+        multiprocess.mark_process_dead(pid)
+
+
+@signals.worker_process_shutdown.connect
+def close_ftp_sessions(**_kwargs: Any) -> None:
+    from bitcaster.agents.ftp import sessions
+
+    sessions.close_all()
+
+
+@signals.worker_process_init.connect
+def init_telemetry(**_kwargs: Any) -> None:
+    from bitcaster.telemetry import setup
+
+    setup("%s-worker" % settings.OTEL_SERVICE_NAME)
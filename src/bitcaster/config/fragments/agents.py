@@ -2,3 +2,7 @@ from ..settings import env
 
 AGENT_FILESYSTEM_VALIDATOR = env("AGENT_FILESYSTEM_VALIDATOR")
 AGENT_FILESYSTEM_ROOT = env("AGENT_FILESYSTEM_ROOT")
+AGENT_FILESYSTEM_SCAN_WORKERS = env("AGENT_FILESYSTEM_SCAN_WORKERS")
+
+MONITOR_BATCH_SIZE = env("MONITOR_BATCH_SIZE")
+MONITOR_CONCURRENCY = env("MONITOR_CONCURRENCY")
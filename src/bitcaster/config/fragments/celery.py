@@ -24,6 +24,12 @@ CELERY_WORKER_PREFETCH_MULTIPLIER = 1
 
 CELERY_SEND_TASK_ERROR_EMAILS = False
 
+OCCURRENCE_PRIORITY_QUEUES = {
+    "HIGH": env("CELERY_QUEUE_HIGH_PRIORITY"),
+    "NORMAL": CELERY_TASK_DEFAULT_QUEUE,
+    "LOW": env("CELERY_QUEUE_LOW_PRIORITY"),
+}
+
 CELERY_CACHE_BACKEND = "django-cache"
 
 # CELERY_RESULT_BACKEND = "django-db"
@@ -1,6 +1,7 @@
 from bitcaster.auth.constants import DEFAULT_GROUP_NAME
 
 CONSTANCE_BACKEND = "constance.backends.database.DatabaseBackend"
+CONSTANCE_DATABASE_CACHE_BACKEND = "config"
 
 
 CONSTANCE_ADDITIONAL_FIELDS = {
@@ -0,0 +1,5 @@
+from bitcaster.config import env
+
+METRICS_CACHE_TIMEOUT = env("METRICS_CACHE_TIMEOUT")
+METRICS_ENABLED = env("METRICS_ENABLED")
+METRICS_WORKER_PORT = env("METRICS_WORKER_PORT")
@@ -1,9 +1,10 @@
 from typing import Any, Dict
 
 from bitcaster import VERSION
+from bitcaster.config import env
 
 REST_FRAMEWORK: Dict[str, Any] = {
-    # "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "bitcaster.api.pagination.KeysetPagination",
     # "DEFAULT_VERSIONING_CLASS": "rest_framework.versioning.NamespaceVersioning",
     # "DEFAULT_FILTER_BACKENDS": ("django_filters.rest_framework.DjangoFilterBackend",),
     # "DEFAULT_RENDERER_CLASSES": (
@@ -11,7 +12,7 @@ REST_FRAMEWORK: Dict[str, Any] = {
     #     "rest_framework.renderers.BrowsableAPIRenderer",
     #     "rest_framework_datatables.renderers.DatatablesRenderer",
     # ),
-    # "PAGE_SIZE": 30,
+    "PAGE_SIZE": env("API_PAGE_SIZE"),
     "DEFAULT_AUTHENTICATION_CLASSES": [
         #     "rest_framework.authentication.BasicAuthentication",
         "rest_framework.authentication.SessionAuthentication",
@@ -0,0 +1,4 @@
+from bitcaster.config import env
+
+OTEL_ENABLED = env("OTEL_ENABLED")
+OTEL_SERVICE_NAME = env("OTEL_SERVICE_NAME")
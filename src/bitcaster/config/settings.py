@@ -122,6 +122,13 @@ REDIS_URL = urlparse(CACHE_URL).hostname
 CACHES = {
     "default": env.cache(),
     "select2": env.cache(),
+    "config": {
+        "BACKEND": "bitcaster.cache.backends.TwoTierCache",
+        "LOCATION": "default",
+        "KEY_PREFIX": "config",
+        "TIMEOUT": 3600,
+        "OPTIONS": {"LOCAL_TIMEOUT": env("CONFIG_CACHE_LOCAL_TIMEOUT"), "MAX_ENTRIES": 1000},
+    },
 }
 
 AUTH_USER_MODEL = "bitcaster.user"
@@ -231,8 +238,10 @@ from .fragments.csp import *  # noqa
 from .fragments.debug_toolbar import *  # noqa
 from .fragments.flags import *  # noqa
 from .fragments.logging import *  # noqa
+from .fragments.metrics import *  # noqa
 from .fragments.rest_framework import *  # noqa
 from .fragments.root import *  # noqa
 from .fragments.sentry import *  # noqa
 from .fragments.social_auth import *  # noqa
+from .fragments.telemetry import *  # noqa
 from .fragments.tinymce import *  # noqa
@@ -15,3 +15,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "bitcaster.config.settings")
 
 application: WSGIHandler = get_wsgi_application()
+
+from bitcaster.telemetry import setup_web  # noqa: E402
+
+setup_web()
@@ -1,6 +1,6 @@
 import enum
 import logging
-from typing import TYPE_CHECKING, Any, Optional, cast
+from typing import TYPE_CHECKING, Any, Iterable, NamedTuple, Optional, TypedDict, cast
 
 from constance import config
 from django.db import models
@@ -8,24 +8,47 @@ from django.db import models
 from bitcaster.utils.language import class_property
 
 if TYPE_CHECKING:
-    from bitcaster.models import Application, Event, Group, Occurrence, User
+    from bitcaster.models import Application, Group, Occurrence, User
     from bitcaster.models.occurrence import OccurrenceOptions
 
 logger = logging.getLogger(__name__)
 
 
+class SystemOccurrence(TypedDict, total=False):
+    context: Optional[dict[str, Any]]
+    options: "Optional[OccurrenceOptions]"
+    correlation_id: Optional[Any]
+    parent: "Optional[Occurrence]"
+
+
 class CacheKey:
     DASHBOARDS_EVENTS: str = "dashboard_events"
+    BITCASTER_APP: str = "bitcaster:app"
+    SYSTEM_EVENTS: str = "bitcaster:events"
+    SYSTEM_USER: str = "bitcaster:system_user"
+    EVENT_CHANNELS: str = "event:{}:channels"
+    EVENT_MESSAGES: str = "event:{}:messages"
+    MESSAGE: str = "message:{}:{}:{}"
+    FLAG: str = "flag:{}"
+    METRICS_PENDING: str = "metrics:pending"
+
+
+class SystemEventRef(NamedTuple):
+    id: int
+    slug: str
+    priority: int
+    application: str  # slug
 
 
 class Bitcaster:
     ORGANIZATION = "OS4D"
     PROJECT = "BITCASTER"
     APPLICATION = "Bitcaster"
-    _app: "Optional[Application]" = None
+    SYSTEM_USER = "__SYSTEM__"
 
     @staticmethod
     def initialize(admin: "User") -> "Application":
+        from bitcaster.cache.config import config_cache, forget
         from bitcaster.models import (
             Application,
             DistributionList,
@@ -41,18 +64,47 @@ class Bitcaster:
             app.register_event(event_name.value)
 
         DistributionList.objects.get_or_create(name=DistributionList.ADMINS, project=prj)
-        Bitcaster._app = None
+        forget(CacheKey.BITCASTER_APP)
+        config_cache().set(CacheKey.SYSTEM_EVENTS, Bitcaster.resolve_system_events(app))
         return app
 
     @class_property
     def app(cls) -> "Application":
+        from bitcaster.cache.config import get_or_load
         from bitcaster.models import Application
 
-        if not cls._app:
-            cls._app = Application.objects.select_related("project", "project__organization").get(
+        return get_or_load(
+            CacheKey.BITCASTER_APP,
+            lambda: Application.objects.select_related("project", "project__organization").get(
                 name=cls.APPLICATION, project__name=cls.PROJECT, project__organization__name=cls.ORGANIZATION
+            ),
+        )
+
+    @staticmethod
+    def resolve_system_events(app: "Application") -> dict[str, SystemEventRef]:
+        return {
+            name: SystemEventRef(*ref)
+            for name, *ref in app.events.filter(name__in=[e.value for e in SystemEvent]).values_list(
+                "name", "id", "slug", "priority", "application__slug"
             )
-        return cls._app
+        }
+
+    @classmethod
+    def get_system_events(cls) -> dict[str, SystemEventRef]:
+        """System events by name, resolved once and kept in the configuration cache."""
+        from bitcaster.cache.config import get_or_load
+
+        return get_or_load(CacheKey.SYSTEM_EVENTS, lambda: cls.resolve_system_events(cls.app))
+
+    @classmethod
+    def get_system_user_id(cls) -> int:
+        """Id of the user that owns the actions of the system (ie. Monitors runs), kept in the configuration cache."""
+        from bitcaster.cache.config import get_or_load
+        from bitcaster.models import User
+
+        return get_or_load(
+            CacheKey.SYSTEM_USER, lambda: User.objects.values_list("pk", flat=True).get(username=cls.SYSTEM_USER)
+        )
 
     @classmethod
     def trigger_event(
@@ -64,8 +116,30 @@ class Bitcaster:
         correlation_id: Optional[Any] = None,
         parent: "Optional[Occurrence]" = None,
     ) -> "Occurrence":
-        e: "Event" = cls.app.events.get(name=evt.value)
-        return e.trigger(context=(context or {}), options=options or {}, cid=correlation_id, parent=parent)
+        return cls.trigger_events(
+            evt, [{"context": context, "options": options, "correlation_id": correlation_id, "parent": parent}]
+        )[0]
+
+    @classmethod
+    def trigger_events(cls, evt: "SystemEvent", occurrences: "Iterable[SystemOccurrence]") -> "list[Occurrence]":
+        """Create the Occurrences of the system event `evt` with a single INSERT.
+
+        Used to report problems, so it must not amplify the load during incidents: no event lookup
+        and no per-occurrence queries.
+        """
+        from bitcaster.models import Occurrence
+
+        ref = cls.get_system_events()[evt.value]
+        objs = Occurrence.objects.bulk_create(
+            [
+                Occurrence.objects.build(
+                    ref.id, ref.priority, o.get("context"), o.get("options"), o.get("correlation_id"), o.get("parent")
+                )
+                for o in occurrences
+            ]
+        )
+        Occurrence.objects.triggered(objs, ref.application, ref.slug)
+        return objs
 
     @classmethod
     def get_default_group(cls) -> "Group":
@@ -130,6 +130,23 @@ class Dispatcher(metaclass=DispatcherMeta):
     def name(cls) -> str:
         return cls.verbose_name or cls.__name__.title()
 
+    def __enter__(self) -> "Dispatcher":
+        self.open()
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """Start a batch of sends. Dispatchers can use it to share resources or collapse deliveries."""
+
+    def close(self) -> None:
+        """Close a batch of sends started with `open()`."""
+
+    def group(self, assignments: list["Assignment"]) -> list["Assignment"]:
+        """Order the recipients of a batch of sends. Dispatchers can use it to keep related deliveries together."""
+        return assignments
+
     def send(self, address: str, payload: Payload, assignment: "Optional[Assignment]" = None, **kwargs: Any) -> bool:
         raise NotImplementedError
 
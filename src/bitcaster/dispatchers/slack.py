@@ -1,10 +1,13 @@
 import logging
+from threading import local
 from typing import TYPE_CHECKING, Any, Optional, Type
 
 import requests
 from django import forms
 from django.utils.translation import gettext as _
 from requests import Response
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from ..exceptions import DispatcherError
 from .base import Dispatcher, DispatcherConfig, MessageProtocol, Payload
@@ -15,6 +18,19 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+def get_session() -> requests.Session:
+    session = requests.Session()
+    retry = Retry(
+        total=3,
+        status_forcelist=(429,),
+        allowed_methods=frozenset({"POST"}),
+        respect_retry_after_header=True,
+    )
+    session.mount("https://", HTTPAdapter(max_retries=retry))
+    session.mount("http://", HTTPAdapter(max_retries=retry))
+    return session
+
+
 class SlackConfig(DispatcherConfig):
     url = forms.URLField(label=_("URL"), assume_scheme="https")
 
@@ -25,10 +41,31 @@ class SlackDispatcher(Dispatcher):
     config_class: Type[DispatcherConfig] = SlackConfig
     protocol = MessageProtocol.PLAINTEXT
 
+    session: requests.Session = get_session()
+    # channel pk -> (webhook url, message) already posted in the current batch
+    _batches = local()
+
+    @property
+    def posted(self) -> Optional[set[tuple[str, str]]]:
+        return getattr(self._batches, "posted", {}).get(self.channel.pk)
+
+    def open(self) -> None:
+        if not hasattr(self._batches, "posted"):
+            self._batches.posted = {}
+        self._batches.posted[self.channel.pk] = set()
+
+    def close(self) -> None:
+        getattr(self._batches, "posted", {}).pop(self.channel.pk, None)
+
     def send(self, address: str, payload: Payload, assignment: "Optional[Assignment]" = None, **kwargs: Any) -> bool:
         try:
-            conn = requests.Session()
-            res: Response = conn.post(self.config["url"], json={"text": payload.message})
+            url = self.config["url"]
+            posted = self.posted
+            if posted is not None and (url, payload.message) in posted:
+                return True
+            res: Response = self.session.post(url, json={"text": payload.message})
+            if res.status_code == 200 and posted is not None:
+                posted.add((url, payload.message))
             return res.status_code == 200
         except Exception as e:
             logger.exception(e)
@@ -1,9 +1,12 @@
 import logging
+from collections import OrderedDict
+from threading import Lock
 from typing import TYPE_CHECKING, Any, Optional, Type
 
 from django import forms
 from django.utils.translation import gettext as _
 from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
 from twilio.rest import Client
 
 from ..exceptions import DispatcherError
@@ -14,11 +17,33 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+MAX_CLIENTS = 64
+
+# channel pk -> (channel version, validated config, client), least recently used first
+_clients: OrderedDict[int, tuple[int, dict[str, Any], Client]] = OrderedDict()
+_lock = Lock()
+
+
+def _close(client: Client) -> None:
+    if session := getattr(client.http_client, "session", None):
+        session.close()
+
 
 class TwilioConfig(DispatcherConfig):
     sid = forms.CharField(label=_("SID"))
     token = forms.CharField(label=_("Token"))
-    number = forms.CharField(label=_("Number"))
+    number = forms.CharField(label=_("Number"), required=False)
+    messaging_service_sid = forms.CharField(
+        label=_("Messaging Service SID"),
+        required=False,
+        help_text=_("If set, messages are sent through this Messaging Service instead of the number"),
+    )
+
+    def clean(self) -> dict[str, Any] | None:
+        super().clean()
+        if not (self.cleaned_data.get("number") or self.cleaned_data.get("messaging_service_sid")):
+            raise forms.ValidationError(_("Please provide a Number or a Messaging Service SID"))
+        return self.cleaned_data
 
 
 class TwilioSMS(Dispatcher):
@@ -28,15 +53,43 @@ class TwilioSMS(Dispatcher):
     config_class: Type[DispatcherConfig] = TwilioConfig
     protocol = MessageProtocol.SMS
 
+    @staticmethod
+    def create_client(config: dict[str, Any]) -> Client:
+        return Client(
+            username=config["sid"], password=config["token"], http_client=TwilioHttpClient(pool_connections=True)
+        )
+
+    def get_client(self) -> tuple[dict[str, Any], Client]:
+        """Return validated config and client for this channel.
+
+        Clients of saved channels are shared by all the sends of the same channel version,
+        so the HTTP session (and its TLS connection) is reused across messages.
+        Only the client of the last version of a channel is kept, for `MAX_CLIENTS` channels at most.
+        """
+        if self.channel.pk is None:
+            config = self.config
+            return config, self.create_client(config)
+        pk, version = self.channel.pk, self.channel.version
+        with _lock:
+            entry = _clients.get(pk)
+            if entry is None or entry[0] != version:
+                if entry:
+                    _close(entry[2])
+                config = self.config
+                entry = _clients[pk] = (version, config, self.create_client(config))
+            _clients.move_to_end(pk)
+            while len(_clients) > MAX_CLIENTS:
+                _close(_clients.popitem(last=False)[1][2])
+            return entry[1], entry[2]
+
     def send(self, address: str, payload: Payload, assignment: "Optional[Assignment]" = None, **kwargs: Any) -> bool:
         try:
-            number = self.config.pop("number")
-            client = Client(username=self.config["sid"], password=self.config["token"])
-            client.messages.create(
-                body=payload.message,
-                from_=number,
-                to=address,
-            )
+            config, client = self.get_client()
+            if config.get("messaging_service_sid"):
+                sender = {"messaging_service_sid": config["messaging_service_sid"]}
+            else:
+                sender = {"from_": config["number"]}
+            client.messages.create(body=payload.message, to=address, **sender)
 
             return True
         except TwilioRestException as e:
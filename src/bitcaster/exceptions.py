@@ -8,6 +8,10 @@ class DispatcherError(Exception):
     pass
 
 
+class SubscriptionGoneError(DispatcherError):
+    pass
+
+
 class InvalidGrantError(Exception):
     pass
 
@@ -2,11 +2,17 @@ import logging
 from typing import Any
 
 from django.contrib.auth import user_logged_in
-from django.db.models.signals import post_save
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
 from bitcaster import models
-from bitcaster.models import Organization, Project
+from bitcaster.models import (
+    Occurrence,
+    OccurrenceRollup,
+    Organization,
+    Project,
+    RecipientSnapshot,
+)
 from bitcaster.state import state
 
 logger = logging.getLogger(__name__)
@@ -35,3 +41,40 @@ def on_login(sender: Any, user: models.User, **kwargs: Any) -> None:
     if not state.get_cookie("project"):  # pragma: no branch
         if prj := Project.objects.local().first():
             state.add_cookie("project", prj.pk)
+
+
+@receiver(m2m_changed, sender=models.DistributionList.recipients.through, dispatch_uid="sync_recipient_snapshots")
+def sync_recipient_snapshots(
+    sender: Any, instance: Any, action: str, reverse: bool, pk_set: set[int] | None, **kwargs: Any
+) -> None:
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if reverse:  # instance is an Assignment
+        RecipientSnapshot.objects.sync([instance.pk])
+    elif action == "post_clear":
+        RecipientSnapshot.objects.clear(instance)
+    elif pk_set:
+        RecipientSnapshot.objects.sync(pk_set)
+
+
+@receiver(post_save, sender=models.Assignment, dispatch_uid="sync_assignment_snapshots")
+@receiver(post_delete, sender=models.Assignment, dispatch_uid="sync_deleted_assignment_snapshots")
+def sync_assignment_snapshots(sender: Any, instance: models.Assignment, created: bool = False, **kwargs: Any) -> None:
+    # a new Assignment does not belong to any DistributionList yet
+    if not created:
+        RecipientSnapshot.objects.sync([instance.pk])
+
+
+@receiver(post_save, sender=models.Occurrence, dispatch_uid="update_occurrence_rollup")
+def update_occurrence_rollup(sender: Any, instance: Occurrence, created: bool, using: str, **kwargs: Any) -> None:
+    rollup = OccurrenceRollup.objects.db_manager(using)
+    if created:
+        rollup.add([(instance.event_id, instance.timestamp, instance.status, 1)])
+    elif instance._initial_status and instance._initial_status != instance.status:
+        rollup.add(
+            [
+                (instance.event_id, instance.timestamp, instance._initial_status, -1),
+                (instance.event_id, instance.timestamp, instance.status, 1),
+            ]
+        )
+    instance._initial_status = instance.status
@@ -0,0 +1,81 @@
+import csv
+import json
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterator, TextIO
+
+from django.core.management import BaseCommand, CommandError
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+FORMATS = ("csv", "json", "ndjson")
+
+
+def read_csv(stream: TextIO) -> Iterator[dict[str, Any]]:
+    """Columns: email, first_name, last_name, channels (`;` separated)."""
+    for row in csv.DictReader(stream):
+        record: dict[str, Any] = {k: (v or "").strip() for k, v in row.items() if k}
+        record["channels"] = [c.strip() for c in record.pop("channels", "").split(";") if c.strip()]
+        yield record
+
+
+def read_ndjson(stream: TextIO) -> Iterator[dict[str, Any]]:
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except ValueError:
+                yield {}
+
+
+class Command(BaseCommand):
+    help = "Create/update the users of an Organization, with their addresses and channels, from a file"
+
+    def add_arguments(self, parser: "ArgumentParser") -> None:
+        parser.add_argument("organization", help="Organization slug")
+        parser.add_argument("source", help="File to read ('-' for stdin)")
+        parser.add_argument(
+            "--format", choices=FORMATS, default=None, help="Source format (default: from the file extension)"
+        )
+        parser.add_argument(
+            "--group", default=None, help="Group assigned to the users (default: NEW_USER_DEFAULT_GROUP)"
+        )
+        parser.add_argument("--batch-size", type=int, default=1000, dest="batch_size")
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        from django.contrib.auth.models import Group
+
+        from bitcaster.models import Organization
+        from bitcaster.provisioning import Provisioner
+
+        try:
+            org = Organization.objects.get(slug=options["organization"])
+            group = Group.objects.get(name=options["group"]) if options["group"] else None
+        except (Organization.DoesNotExist, Group.DoesNotExist) as e:
+            raise CommandError(str(e))
+
+        source = options["source"]
+        fmt = options["format"] or Path(source).suffix.lstrip(".").replace("jsonl", "ndjson")
+        if fmt not in FORMATS:
+            raise CommandError(f"Unable to detect the format of '{source}'. Use --format")
+        stream = sys.stdin if source == "-" else open(source, encoding="utf-8-sig", newline="")
+        try:
+            if fmt == "csv":
+                records = read_csv(stream)
+            elif fmt == "json":
+                records = json.load(stream)
+            else:
+                records = read_ndjson(stream)
+            result = Provisioner(org, group=group, batch_size=options["batch_size"]).run(records)
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+
+        for error in result.errors:
+            self.stderr.write(self.style.WARNING(f"Row {error['row']}: {error['error']}"))
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{result.users} users, {result.addresses} addresses, {result.assignments} assignments processed"
+            )
+        )
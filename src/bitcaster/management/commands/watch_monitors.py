@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING, Any
+
+from django.core.management import BaseCommand, CommandError
+
+if TYPE_CHECKING:
+    from argparse import ArgumentParser
+
+
+class Command(BaseCommand):
+    help = "Watch the `incremental` filesystem monitors, checking the changed paths as soon as inotify reports them"
+
+    def add_arguments(self, parser: "ArgumentParser") -> None:
+        parser.add_argument(
+            "--flush-interval",
+            type=float,
+            default=2,
+            dest="flush_interval",
+            help="Seconds the changes are collected before being checked (default: 2)",
+        )
+        parser.add_argument(
+            "--reload-interval",
+            type=float,
+            default=60,
+            dest="reload_interval",
+            help="Seconds between reloads of the monitors list (default: 60)",
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        from bitcaster.agents.inotify import is_supported
+        from bitcaster.agents.watch import FileSystemWatcher
+
+        if not is_supported():
+            raise CommandError("inotify is not available on this system")
+        watcher = FileSystemWatcher(flush_interval=options["flush_interval"])
+        self.stdout.write("Watching filesystem monitors...")
+        try:
+            watcher.run(reload_interval=options["reload_interval"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.inotify.close()
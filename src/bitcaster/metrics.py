@@ -0,0 +1,93 @@
+"""Prometheus metrics.
+
+Metrics are collected by the web processes (triggers) and by the Celery workers (deliveries).
+When more than one process is used (uwsgi workers, Celery prefork pool) `PROMETHEUS_MULTIPROC_DIR`
+must point to a shared, writable directory so that all the processes values are aggregated.
+"""
+
+import os
+from typing import TYPE_CHECKING, Iterable
+
+from prometheus_client import (  # noqa: F401
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+from prometheus_client.registry import Collector
+
+if TYPE_CHECKING:
+    from prometheus_client import Metric
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+DELIVERY_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+
+TRIGGERED = Counter("bitcaster_occurrences_triggered", "Triggered events", ["application", "event"])
+FIRST_DELIVERY = Histogram(
+    "bitcaster_occurrence_first_delivery_seconds",
+    "Time from event trigger to first delivered message",
+    buckets=DELIVERY_BUCKETS,
+)
+SEND_LATENCY = Histogram(
+    "bitcaster_send_seconds", "Time spent sending a message", ["dispatcher", "channel"], buckets=LATENCY_BUCKETS
+)
+SEND_ERRORS = Counter("bitcaster_send_errors", "Failed sends", ["dispatcher"])
+RENDER_TIME = Histogram("bitcaster_render_seconds", "Message templates render time", buckets=LATENCY_BUCKETS)
+
+
+def pending_occurrences() -> dict[int, int]:
+    """Number of the Occurrences waiting to be processed, by priority."""
+    from django.db.models import Count
+
+    from bitcaster.models import Occurrence
+
+    qs = Occurrence.objects.filter(status=Occurrence.Status.NEW).order_by()
+    return dict(qs.values_list("priority").annotate(c=Count("id")))
+
+
+class OccurrenceCollector(Collector):
+    """Occurrences queue depth, read from the database at most once every `METRICS_CACHE_TIMEOUT` seconds."""
+
+    def collect(self) -> "Iterable[Metric]":
+        from django.conf import settings
+        from django.core.cache import cache
+
+        from bitcaster.constants import CacheKey
+        from bitcaster.models import Event
+
+        counts = cache.get_or_set(CacheKey.METRICS_PENDING, pending_occurrences, settings.METRICS_CACHE_TIMEOUT)
+        gauge = GaugeMetricFamily(
+            "bitcaster_occurrences_pending", "Occurrences waiting to be processed", labels=["priority"]
+        )
+        for priority in Event.Priority:
+            gauge.add_metric([priority.name], counts.get(priority.value, 0))
+        yield gauge
+
+
+class RegistryCollector(Collector):
+    def __init__(self, registry: CollectorRegistry) -> None:
+        self.registry = registry
+
+    def collect(self) -> "Iterable[Metric]":
+        return self.registry.collect()
+
+
+def get_registry(with_database: bool = True) -> CollectorRegistry:
+    registry = CollectorRegistry()
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry.register(RegistryCollector(REGISTRY))
+    if with_database:
+        registry.register(OccurrenceCollector())
+    return registry
+
+
+def start_worker_server(port: int) -> None:
+    """Expose the metrics of the Celery worker (and of its pool processes) on `port`."""
+    start_http_server(port, registry=get_registry(with_database=False))
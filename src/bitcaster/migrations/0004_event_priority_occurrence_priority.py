@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2024-10-02 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bitcaster", "0003_alter_apikey_key_alter_channel_protocol_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="priority",
+            field=models.IntegerField(
+                choices=[(1, "High"), (5, "Normal"), (9, "Low")],
+                default=5,
+                help_text="Processing lane of the Occurrences of this event. "
+                "High priority Occurrences are dispatched as soon as they are created.",
+            ),
+        ),
+        migrations.AddField(
+            model_name="occurrence",
+            name="priority",
+            field=models.IntegerField(choices=[(1, "High"), (5, "Normal"), (9, "Low")], default=5),
+        ),
+        migrations.AddIndex(
+            model_name="occurrence",
+            index=models.Index(fields=["status", "priority", "timestamp"], name="occurrence_lane"),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2024-10-04 10:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bitcaster", "0004_event_priority_occurrence_priority"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="occurrence",
+            name="trace",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, help_text="Timings of the last processing, per phase"
+            ),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.1 on 2024-10-07 09:12
+
+import concurrency.fields
+import django.contrib.postgres.fields
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bitcaster", "0005_occurrence_trace"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecipientSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("version", concurrency.fields.IntegerVersionField(default=0, help_text="record revision number")),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+                ("created", models.DateTimeField(auto_now_add=True)),
+                ("revision", models.PositiveIntegerField(default=0)),
+                (
+                    "recipients",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(), blank=True, default=list, size=None
+                    ),
+                ),
+                (
+                    "validated",
+                    django.contrib.postgres.fields.ArrayField(
+                        base_field=models.BigIntegerField(), blank=True, default=list, size=None
+                    ),
+                ),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="+", to="bitcaster.channel"
+                    ),
+                ),
+                (
+                    "distribution",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshots",
+                        to="bitcaster.distributionlist",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Recipient Snapshot",
+                "verbose_name_plural": "Recipient Snapshots",
+                "unique_together": {("distribution", "channel")},
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(fields=["recipients"], name="recipientsnapshot_recipients")
+                ],
+            },
+        ),
+    ]
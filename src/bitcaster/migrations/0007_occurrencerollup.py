@@ -0,0 +1,45 @@
+# Generated by Django 5.1.1 on 2024-10-08 15:40
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+BACKFILL = """
+INSERT INTO bitcaster_occurrencerollup (event_id, minute, status, count)
+SELECT event_id, date_trunc('minute', "timestamp"), status, count(*)
+FROM bitcaster_occurrence
+GROUP BY 1, 2, 3
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bitcaster", "0006_recipientsnapshot"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OccurrenceRollup",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("minute", models.DateTimeField()),
+                ("status", models.CharField(max_length=20)),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "event",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE, related_name="rollups", to="bitcaster.event"
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Occurrence Rollup",
+                "verbose_name_plural": "Occurrence Rollups",
+                "indexes": [models.Index(fields=["minute"], name="occurrencerollup_minute")],
+                "constraints": [
+                    models.UniqueConstraint(fields=("event", "minute", "status"), name="occurrencerollup_unique")
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL, migrations.RunSQL.noop),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 5.1.1 on 2024-10-10 09:12
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bitcaster", "0007_occurrencerollup"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MonitorSnapshot",
+            fields=[
+                ("id", models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name="ID")),
+                ("digest", models.CharField(max_length=64)),
+                ("entries", models.PositiveIntegerField(default=0)),
+                ("content", models.BinaryField()),
+                ("last_updated", models.DateTimeField(auto_now=True)),
+                (
+                    "monitor",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="snapshot",
+                        to="bitcaster.monitor",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,39 @@
+import json
+from typing import Any
+
+from django.db import migrations
+
+
+def share_schedules(apps: Any, schema_editor: Any) -> None:
+    """Replace the PeriodicTask of each Monitor with one shared by all the Monitors with the same crontab."""
+    Monitor = apps.get_model("bitcaster", "Monitor")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    for monitor in Monitor.objects.filter(schedule__task="bitcaster.tasks.monitor_run").select_related("schedule"):
+        old = monitor.schedule
+        if old.crontab_id is None:  # interval based, not managed by Bitcaster
+            continue
+        name = f"monitors-{old.crontab_id}"
+        monitor.schedule, __ = PeriodicTask.objects.get_or_create(
+            name=name,
+            defaults={
+                "task": "bitcaster.tasks.monitor_schedule",
+                "crontab_id": old.crontab_id,
+                "kwargs": json.dumps({"name": name}),
+                "enabled": old.enabled,
+            },
+        )
+        monitor.save(update_fields=["schedule"])
+        old.delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("bitcaster", "0008_monitorsnapshot"),
+        ("django_celery_beat", "0019_alter_periodictasks_options"),
+    ]
+
+    operations = [
+        migrations.RunPython(share_schedules, migrations.RunPython.noop),
+    ]
@@ -4,7 +4,7 @@ from .address import Address  # noqa
 from .application import Application  # noqa
 from .assignment import Assignment  # noqa
 from .channel import Channel  # noqa
-from .distribution import DistributionList  # noqa
+from .distribution import DistributionList, RecipientSnapshot  # noqa
 from .event import Event  # noqa
 from .group import Group  # noqa
 from .internal import LogMessage  # noqa
@@ -12,11 +12,12 @@ from .key import ApiKey  # noqa
 from .log import LogEntry  # noqa
 from .media import MediaFile  # noqa
 from .message import Message  # noqa
-from .monitor import Monitor  # noqa
+from .monitor import Monitor, MonitorSnapshot  # noqa
 from .notification import Notification  # noqa
 from .occurrence import Occurrence  # noqa
 from .organization import Organization  # noqa
 from .project import Project  # noqa
+from .rollup import OccurrenceRollup  # noqa
 from .user import User  # noqa
 from .userrole import UserRole  # noqa
 
@@ -34,11 +35,14 @@ __all__ = [
     "MediaFile",
     "Message",
     "Monitor",
+    "MonitorSnapshot",
     "Notification",
     "Occurrence",
+    "OccurrenceRollup",
     "Organization",
     "Organization",
     "Project",
+    "RecipientSnapshot",
     "SocialProvider",
     "User",
     "UserRole",
@@ -1,8 +1,11 @@
 import logging
-from typing import TYPE_CHECKING, Any
+from typing import TYPE_CHECKING, Any, Iterable
 
-from django.db import models
-from django.db.models import QuerySet
+from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.db import connections, models, transaction
+from django.db.models import F, Func, QuerySet
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from .assignment import Assignment
@@ -10,11 +13,14 @@ from .mixins import BitcasterBaselManager, BitcasterBaseModel
 from .project import Project
 
 if TYPE_CHECKING:
+    from .channel import Channel
     from .notification import Notification
 
 
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_CHUNK_SIZE = 10000
+
 
 class DistributionListManager(BitcasterBaselManager["DistributionList"]):
 
@@ -28,6 +34,7 @@ class DistributionList(BitcasterBaseModel):
     project = models.ForeignKey(Project, on_delete=models.CASCADE)
     recipients = models.ManyToManyField(Assignment, blank=True)
     notifications: "QuerySet[Notification]"
+    snapshots: "QuerySet[RecipientSnapshot]"
 
     objects = DistributionListManager()
 
@@ -41,3 +48,156 @@ class DistributionList(BitcasterBaseModel):
         verbose_name = _("Distribution List")
         verbose_name_plural = _("Distribution Lists")
         unique_together = (("name", "project"),)
+
+
+class RecipientSnapshotManager(BitcasterBaselManager["RecipientSnapshot"]):
+
+    def get_by_natural_key(
+        self, name: str, prj: str, org: str, ch: str, ch_prj: str | None, ch_org: str, *args: Any
+    ) -> "RecipientSnapshot":
+        filters: dict[str, Any] = {}
+        if ch_prj:
+            filters["channel__project__slug"] = ch_prj
+        else:
+            filters["channel__project"] = None
+        return self.get(
+            distribution__project__organization__slug=org,
+            distribution__project__slug=prj,
+            distribution__name=name,
+            channel__organization__slug=ch_org,
+            channel__name=ch,
+            **filters,
+        )
+
+    def compute(self, distribution_id: int, channel_id: int) -> tuple[list[int], list[int]]:
+        """Return the sorted ids of the active and of the active and validated recipients."""
+        rows = (
+            distribution_recipients()
+            .filter(distributionlist_id=distribution_id, assignment__channel_id=channel_id, assignment__active=True)
+            .order_by("assignment_id")
+            .values_list("assignment_id", "assignment__validated")
+        )
+        recipients, validated = [], []
+        for pk, is_validated in rows.iterator(chunk_size=SNAPSHOT_CHUNK_SIZE):
+            recipients.append(pk)
+            if is_validated:
+                validated.append(pk)
+        return recipients, validated
+
+    def get_for(self, distribution: "DistributionList", channel: "Channel") -> "RecipientSnapshot":
+        """Return the snapshot of `distribution` for `channel`, building it the first time."""
+        try:
+            return self.get(distribution=distribution, channel=channel)
+        except self.model.DoesNotExist:
+            recipients, validated = self.compute(distribution.pk, channel.pk)
+            snapshot, __ = self.get_or_create(
+                distribution=distribution,
+                channel=channel,
+                defaults={"recipients": recipients, "validated": validated, "revision": 1},
+            )
+            return snapshot
+
+    def rebuild(self, distribution: "DistributionList") -> None:
+        """Recompute all the existing snapshots of `distribution` from scratch."""
+        with transaction.atomic():
+            for snapshot in self.select_for_update().filter(distribution=distribution):
+                snapshot.recipients, snapshot.validated = self.compute(distribution.pk, snapshot.channel_id)
+                snapshot.revision += 1
+                snapshot.save(update_fields=["recipients", "validated", "revision", "last_updated"])
+
+    def sync(self, assignment_ids: "Iterable[int]") -> int:
+        """Apply the changes of the given Assignments to the snapshots containing them (or that should).
+
+        The delta is applied by a single UPDATE: the given ids are removed from the arrays and
+        the ones still active in each (distribution, channel) are added back, so no snapshot is
+        transferred to Python. Returns the number of updated snapshots.
+        """
+        ids = sorted(set(assignment_ids))
+        if not ids:
+            return 0
+        snapshot = self.model._meta.db_table
+        members = distribution_recipients().model._meta.db_table
+        assignment = Assignment._meta.db_table
+        sql = f"""
+            WITH changed AS (
+                SELECT m.distributionlist_id AS distribution_id, a.channel_id,
+                    coalesce(array_agg(a.id) FILTER (WHERE a.active), '{{}}') AS added,
+                    coalesce(array_agg(a.id) FILTER (WHERE a.active AND a.validated), '{{}}') AS added_validated
+                FROM {members} m JOIN {assignment} a ON a.id = m.assignment_id
+                WHERE m.assignment_id = ANY(%(ids)s::bigint[])
+                GROUP BY m.distributionlist_id, a.channel_id
+            ), targets AS (
+                SELECT s.id, coalesce(c.added, '{{}}') AS added, coalesce(c.added_validated, '{{}}') AS added_validated
+                FROM {snapshot} s LEFT JOIN changed c
+                    ON c.distribution_id = s.distribution_id AND c.channel_id = s.channel_id
+                WHERE s.recipients && %(ids)s::bigint[] OR c.distribution_id IS NOT NULL
+                ORDER BY s.id
+                FOR UPDATE OF s
+            )
+            UPDATE {snapshot} s SET
+                recipients = ARRAY(
+                    SELECT x FROM unnest(s.recipients) x WHERE x <> ALL(%(ids)s::bigint[])
+                    UNION SELECT unnest(t.added) ORDER BY 1
+                ),
+                validated = ARRAY(
+                    SELECT x FROM unnest(s.validated) x WHERE x <> ALL(%(ids)s::bigint[])
+                    UNION SELECT unnest(t.added_validated) ORDER BY 1
+                ),
+                revision = s.revision + 1,
+                last_updated = %(now)s
+            FROM targets t
+            WHERE s.id = t.id
+        """  # nosec
+        with transaction.atomic(using=self.db), connections[self.db].cursor() as cursor:
+            cursor.execute(sql, {"ids": ids, "now": timezone.now()})
+            return cursor.rowcount
+
+    def clear(self, distribution: "DistributionList") -> int:
+        return self.filter(distribution=distribution).update(
+            recipients=[], validated=[], revision=F("revision") + 1, last_updated=timezone.now()
+        )
+
+
+class RecipientSnapshot(BitcasterBaseModel):
+    """Precomputed recipients of a DistributionList for a Channel.
+
+    Holds the sorted ids of the active Assignments (and of the active and validated ones),
+    so that resolving the recipients of a Notification is a single read of a compact array
+    instead of a join on the members table. Snapshots are built on first use and then
+    kept up to date by the signal handlers (see `bitcaster.handlers`); `revision` is
+    incremented at each change.
+    """
+
+    distribution = models.ForeignKey(DistributionList, on_delete=models.CASCADE, related_name="snapshots")
+    channel = models.ForeignKey("bitcaster.Channel", on_delete=models.CASCADE, related_name="+")
+    revision = models.PositiveIntegerField(default=0)
+    recipients = ArrayField(models.BigIntegerField(), default=list, blank=True)
+    validated = ArrayField(models.BigIntegerField(), default=list, blank=True)
+
+    objects = RecipientSnapshotManager()
+
+    class Meta:
+        verbose_name = _("Recipient Snapshot")
+        verbose_name_plural = _("Recipient Snapshots")
+        unique_together = (("distribution", "channel"),)
+        # used by `sync()` to find the snapshots containing an Assignment
+        indexes = [GinIndex(fields=["recipients"], name="recipientsnapshot_recipients")]
+
+    def __str__(self) -> str:
+        return f"{self.distribution} - {self.channel}"
+
+    def natural_key(self) -> tuple[str | None, ...]:
+        return *self.distribution.natural_key(), *self.channel.natural_key()
+
+    def members(self, validated: bool = False) -> QuerySet["RecipientSnapshot"]:
+        """Subquery returning the ids of the snapshot, usable as `id__in=` filter."""
+        field = "validated" if validated else "recipients"
+        return (
+            RecipientSnapshot.objects.filter(pk=self.pk)
+            .annotate(member=Func(F(field), function="unnest", output_field=models.BigIntegerField()))
+            .values("member")
+        )
+
+
+def distribution_recipients() -> QuerySet[Any]:
+    return DistributionList.recipients.through.objects.all()
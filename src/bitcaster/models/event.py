@@ -28,12 +28,24 @@ class EventManager(BitcasterBaselManager["Event"]):
 
 class Event(SlugMixin, LockMixin, BitcasterBaseModel):
     # messages: "QuerySet[Message]"
+    class Priority(models.IntegerChoices):
+        HIGH = 1, _("High")
+        NORMAL = 5, _("Normal")
+        LOW = 9, _("Low")
 
     application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name="events")
     description = models.CharField(max_length=255, blank=True, null=True)
     active = models.BooleanField(default=True)
     newsletter = models.BooleanField(default=False, help_text=_("Do not customise notifications per single user"))
     channels = models.ManyToManyField(Channel, blank=True)
+    priority = models.IntegerField(
+        choices=Priority,
+        default=Priority.NORMAL,
+        help_text=_(
+            "Processing lane of the Occurrences of this event. "
+            "High priority Occurrences are dispatched as soon as they are created."
+        ),
+    )
     occurrence_retention = models.IntegerField(
         blank=True,
         null=True,
@@ -73,11 +85,18 @@ class Event(SlugMixin, LockMixin, BitcasterBaseModel):
     ) -> "Occurrence":
         from .occurrence import Occurrence
 
-        if cid:
-            cid = str(cid)
-        return Occurrence.objects.create(
-            event=self, context=context, options=options or {}, correlation_id=cid, parent=parent
-        )
+        o = Occurrence.objects.build(self.pk, self.priority, context, options, cid, parent)
+        o.event = self
+        o.save(force_insert=True)
+        Occurrence.objects.triggered([o], self.application.slug, self.slug)
+        return o
+
+    def get_channels(self) -> list[Channel]:
+        """Channels of this event, from the configuration cache."""
+        from bitcaster.cache.config import get_or_load
+        from bitcaster.constants import CacheKey
+
+        return get_or_load(CacheKey.EVENT_CHANNELS.format(self.pk), lambda: list(self.channels.all()))
 
     def create_message(self, name: str, channel: Channel, defaults: Optional[dict[str, Any]] = None) -> "Message":
         return self.messages.get_or_create(
@@ -1,5 +1,5 @@
 import logging
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from django.db import models
 from django.db.models import UniqueConstraint
@@ -79,6 +79,11 @@ class Message(Scoped3Mixin, BitcasterBaseModel):
             UniqueConstraint(fields=["organization", "name"], name="unique_message_org"),
         ]
 
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        # event as loaded from the database, used to invalidate the cached templates
+        self._initial_event_id: int | None = self.__dict__.get("event_id")
+
     def __str__(self) -> str:
         return self.name
 
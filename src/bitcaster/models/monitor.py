@@ -9,6 +9,21 @@ from strategy_field.fields import StrategyField
 from bitcaster.agents.base import Agent, agentManager
 from bitcaster.models.mixins import AdminReversable, BaseQuerySet, BitcasterBaselManager
 
+MONITOR_SCHEDULE_TASK = "bitcaster.tasks.monitor_schedule"
+
+
+def get_schedule(crontab: CrontabSchedule) -> PeriodicTask:
+    """PeriodicTask that runs all the Monitors scheduled with `crontab`.
+
+    Monitors share the PeriodicTasks, so celery-beat only handles one entry for each distinct crontab.
+    """
+    name = f"monitors-{crontab.pk}"
+    pt, __ = PeriodicTask.objects.get_or_create(
+        name=name,
+        defaults={"task": MONITOR_SCHEDULE_TASK, "crontab": crontab, "kwargs": json.dumps({"name": name})},
+    )
+    return pt
+
 
 class MonitorQuerySet(BaseQuerySet["Monitor"]):
     def get_by_natural_key(self, name: str, *args: Any) -> "Monitor":
@@ -51,22 +66,48 @@ class Monitor(AdminReversable, models.Model):
         using: Optional[str] = None,
         update_fields: Optional[Iterable[str]] = None,
     ) -> None:
+        if self.schedule is None:
+            every_hour, _ = CrontabSchedule.objects.get_or_create(hour="*/1")
+            self.schedule = get_schedule(every_hour)
+            if update_fields is not None:
+                update_fields = {*update_fields, "schedule"}
         super().save(
             *args, force_insert=force_insert, force_update=force_update, using=using, update_fields=update_fields
         )
-        if self.schedule is None:
-            every_hour, _ = CrontabSchedule.objects.get_or_create(hour="*/1")
-            pt, __ = PeriodicTask.objects.get_or_create(
-                name=self.name,
-                task="bitcaster.tasks.monitor_run",
-                kwargs=json.dumps({"pk": self.pk}),
-                defaults={"crontab": every_hour},
-            )
-            self.schedule = pt
-            self.save()
+
+    def set_crontab(self, crontab: CrontabSchedule) -> None:
+        self.schedule = get_schedule(crontab)
+        self.save(update_fields=["schedule"])
 
     def natural_key(self) -> tuple[str | None, ...]:
         return (self.name,)
 
     def has_changes(self) -> bool:
         return self.agent.changes_detected()
+
+
+class MonitorSnapshotManager(models.Manager["MonitorSnapshot"]):
+    def get_by_natural_key(self, name: str, *args: Any) -> "MonitorSnapshot":
+        return self.get(monitor__name=name)
+
+
+class MonitorSnapshot(models.Model):
+    """Last state seen by the Monitor agent, encoded by `bitcaster.agents.snapshot`.
+
+    Kept out of `Monitor.data` so that the monitor row stays small, and rewritten only
+    when its `digest` changes.
+    """
+
+    monitor = models.OneToOneField(Monitor, on_delete=models.CASCADE, related_name="snapshot")
+    digest = models.CharField(max_length=64)
+    entries = models.PositiveIntegerField(default=0)
+    content = models.BinaryField()
+    last_updated = models.DateTimeField(auto_now=True)
+
+    objects = MonitorSnapshotManager()
+
+    def __str__(self) -> str:
+        return f"{self.monitor} snapshot"
+
+    def natural_key(self) -> tuple[str | None, ...]:
+        return self.monitor.natural_key()
@@ -1,5 +1,5 @@
 import logging
-from typing import TYPE_CHECKING, Any, Optional
+from typing import TYPE_CHECKING, Any, Literal, Optional
 
 import jmespath
 import yaml
@@ -10,9 +10,12 @@ from django.utils.functional import cached_property
 from django.utils.translation import gettext as _
 
 from ..dispatchers.base import Payload
+from ..metrics import RENDER_TIME, SEND_ERRORS, SEND_LATENCY
+from ..telemetry import ATTR_CHANNEL, ATTR_DISPATCHER, tracer
 from ..utils.shortcuts import render_string
+from ..utils.trace import DeliveryTrace
 from .assignment import Assignment
-from .distribution import DistributionList
+from .distribution import DistributionList, RecipientSnapshot
 from .mixins import BaseQuerySet, BitcasterBaselManager, BitcasterBaseModel
 
 if TYPE_CHECKING:
@@ -89,33 +92,63 @@ class Notification(BitcasterBaseModel):
         return {**ctx, "notification": self.name}
 
     def get_pending_subscriptions(self, delivered: list[str | int], channel: "Channel") -> QuerySet[Assignment]:
-        return (
-            self.distribution.recipients.select_related(
+        need_subscription = channel.dispatcher.need_subscription
+        snapshot = RecipientSnapshot.objects.get_for(self.distribution, channel)
+        qs = (
+            Assignment.objects.select_related(
                 "address",
                 "channel",
                 "address__user",
             )
-            .filter(active=True, channel=channel)
+            .filter(id__in=snapshot.members(validated=need_subscription), active=True, channel=channel)
             .exclude(id__in=delivered)
         )
-
-    def notify_to_channel(self, channel: "Channel", assignment: Assignment, context: dict[str, Any]) -> Optional[str]:
+        if need_subscription:
+            qs = qs.filter(validated=True)
+        return qs
+
+    def notify_to_channel(
+        self,
+        channel: "Channel",
+        assignment: Assignment,
+        context: dict[str, Any],
+        trace: Optional[DeliveryTrace] = None,
+    ) -> Optional[str | Literal[False]]:
+        """Send the message to `assignment` and return its address.
+
+        Returns None if the channel has no message for this notification, False if the dispatcher
+        did not deliver it (ie. WebPush subscription gone).
+        """
         message: Optional["Message"]
         dispatcher: "Dispatcher" = channel.dispatcher
         addr: "Address" = assignment.address
+        trace = trace or DeliveryTrace()
 
         if message := self.get_message(channel):
             context.update({"channel": channel, "address": addr.value})
-            payload: Payload = Payload(
-                event=self.event,
-                user=addr.user,
-                subject=render_string(message.subject, context),
-                message=render_string(message.content, context),
-                html_message=render_string(message.html_content, context),
-                # message=message.render(context),
-            )
-            dispatcher.send(addr.value, payload)
-            return addr.value
+            with RENDER_TIME.time(), trace.phase("render"):
+                payload: Payload = Payload(
+                    event=self.event,
+                    user=addr.user,
+                    subject=render_string(message.subject, context),
+                    message=render_string(message.content, context),
+                    html_message=render_string(message.html_content, context),
+                    # message=message.render(context),
+                )
+            try:
+                with (
+                    SEND_LATENCY.labels(type(dispatcher).__name__, channel.name).time(),
+                    trace.phase(f"send:{channel.name}"),
+                    tracer.start_as_current_span(
+                        "Dispatcher.send",
+                        attributes={ATTR_DISPATCHER: type(dispatcher).__name__, ATTR_CHANNEL: channel.name},
+                    ),
+                ):
+                    sent = dispatcher.send(addr.value, payload, assignment=assignment)
+            except Exception:
+                SEND_ERRORS.labels(type(dispatcher).__name__).inc()
+                raise
+            return addr.value if sent else False
 
         return None
 
@@ -160,9 +193,18 @@ class Notification(BitcasterBaseModel):
         )
 
     def get_message(self, channel: "Channel") -> "Optional[Message]":
+        """Template to use for `channel`, resolved once per (notification, channel).
+
+        Resolutions are shared across processes and discarded when any Message of the event changes.
+        """
+        from bitcaster.cache.config import generation, get_or_load
+        from bitcaster.constants import CacheKey
+
         if channel not in self._cached_messages:
-            ret = self.get_messages(channel).first()
-            self._cached_messages[channel] = ret
+            key = CacheKey.MESSAGE.format(
+                generation(CacheKey.EVENT_MESSAGES.format(self.event_id)), self.pk, channel.pk
+            )
+            self._cached_messages[channel] = get_or_load(key, lambda: self.get_messages(channel).first())
         return self._cached_messages[channel]
 
     def create_message(self, name: str, channel: "Channel", defaults: Optional[dict[str, Any]] = None) -> "Message":
@@ -1,18 +1,30 @@
 import logging
 from datetime import timedelta
-from typing import TYPE_CHECKING, Any, NotRequired, TypedDict
+from typing import TYPE_CHECKING, Any, Iterable, NotRequired, Optional, TypedDict
 
 from constance import config
-from django.db import models
+from django.conf import settings
+from django.db import models, transaction
 from django.db.models.expressions import F
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.translation import gettext as _
 
 from ..constants import Bitcaster
+from ..metrics import FIRST_DELIVERY, TRIGGERED
+from ..telemetry import (
+    ATTR_CORRELATION_ID,
+    ATTR_OCCURRENCE,
+    context_links,
+    inject_context,
+    set_attributes,
+    tracer,
+)
+from ..utils.trace import DeliveryTrace, TraceData
 from .assignment import Assignment
 from .event import Event
 from .mixins import BitcasterBaselManager, BitcasterBaseModel
+from .rollup import OccurrenceRollup
 
 if TYPE_CHECKING:
     from .channel import Channel
@@ -24,7 +36,13 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 OccurrenceOptions = TypedDict(
     "OccurrenceOptions",
-    {"limit_to": NotRequired[list[str]], "channels": NotRequired[list[str]], "environs": NotRequired[list[str]]},
+    {
+        "limit_to": NotRequired[list[str]],
+        "channels": NotRequired[list[str]],
+        "environs": NotRequired[list[str]],
+        "priority": NotRequired[int],
+        "traceparent": NotRequired[str],
+    },
 )
 
 
@@ -39,6 +57,40 @@ class OccurrenceManager(BitcasterBaselManager["Occurrence"]):
             event__slug=evt,
         )
 
+    def bulk_create(self, objs: Iterable["Occurrence"], *args: Any, **kwargs: Any) -> list["Occurrence"]:
+        """Insert `objs`, updating the rollup counters (post_save is not sent by bulk_create)."""
+        objs = super().bulk_create(objs, *args, **kwargs)
+        OccurrenceRollup.objects.db_manager(self.db).add((o.event_id, o.timestamp, o.status, 1) for o in objs if o.pk)
+        return objs
+
+    def build(
+        self,
+        event_id: int,
+        default_priority: int,
+        context: Optional[dict[str, Any]] = None,
+        options: "Optional[OccurrenceOptions]" = None,
+        correlation_id: Optional[Any] = None,
+        parent: "Optional[Occurrence]" = None,
+    ) -> "Occurrence":
+        """New (not saved) Occurrence of the event `event_id`, linked to the current trace."""
+        options = OccurrenceOptions(**(options or {}))
+        inject_context(options)  # type: ignore[arg-type]
+        return self.model(
+            event_id=event_id,
+            context=context or {},
+            options=options,
+            correlation_id=str(correlation_id) if correlation_id else None,
+            parent=parent,
+            priority=options.get("priority", default_priority),
+        )
+
+    def triggered(self, objs: list["Occurrence"], application: str, event: str) -> None:
+        """Count the saved `objs` and enqueue the high priority ones once the transaction commits."""
+        TRIGGERED.labels(application, event).inc(len(objs))
+        for o in objs:
+            if o.priority == Event.Priority.HIGH:
+                transaction.on_commit(o.enqueue)
+
     def system(self, *args: Any, **kwargs: Any) -> models.QuerySet["Occurrence"]:
         return self.filter(event__application__name=Bitcaster.APPLICATION).filter(*args, **kwargs)
 
@@ -72,7 +124,11 @@ class Occurrence(BitcasterBaseModel):
         default=dict, help_text=_("Information about the processing (recipients, channels)")
     )
     status = models.CharField(choices=Status, default=Status.NEW.value, max_length=20)
+    priority = models.IntegerField(choices=Event.Priority, default=Event.Priority.NORMAL)
     attempts = models.IntegerField(default=5)
+    trace: TraceData = models.JSONField(  # type: ignore[assignment]
+        default=dict, blank=True, editable=False, help_text=_("Timings of the last processing, per phase")
+    )
     parent = models.ForeignKey("self", editable=False, blank=True, null=True, on_delete=models.CASCADE)
 
     objects = OccurrenceManager()
@@ -80,6 +136,7 @@ class Occurrence(BitcasterBaseModel):
     class Meta:
         ordering = ("timestamp",)
         constraints = [models.UniqueConstraint(fields=("timestamp", "event"), name="occurrence_unique")]
+        indexes = [models.Index(fields=("status", "priority", "timestamp"), name="occurrence_lane")]
 
     def __str__(self) -> str:
         return f"Occurrence of {self.event.name} on {self.timestamp}"
@@ -90,6 +147,18 @@ class Occurrence(BitcasterBaseModel):
     def __init__(self, *args: Any, **kwargs: Any):
         self._cached_messages: dict[Channel, Message] = {}
         super().__init__(*args, **kwargs)
+        # status as loaded from the database, used to update the rollup counters
+        self._initial_status: str | None = self.__dict__.get("status")
+
+    @property
+    def queue(self) -> str:
+        lane = Event.Priority(self.priority).name
+        return settings.OCCURRENCE_PRIORITY_QUEUES.get(lane, settings.CELERY_TASK_DEFAULT_QUEUE)
+
+    def enqueue(self) -> None:
+        from bitcaster.tasks import process_occurrence
+
+        process_occurrence.apply_async(args=[self.pk], queue=self.queue)
 
     def get_context(self) -> dict[str, Any]:
         return {
@@ -98,36 +167,56 @@ class Occurrence(BitcasterBaseModel):
         }
 
     def process(self) -> bool:
+        with tracer.start_as_current_span("Occurrence.process", links=context_links(self.options)):
+            return self._process()
+
+    def _process(self) -> bool:
         assignment: "Assignment"
         notification: "Notification"
         delivered = self.data.get("delivered", [])
         recipients = self.data.get("recipients", [])
         assignment_filter = {}
         notification_filter = {}
-        channel_filter = {}
         if limit := self.options.get("limit_to", []):
             assignment_filter["address__value__in"] = limit
 
-        if channels := self.options.get("channels", []):
-            channel_filter["pk__in"] = channels
+        channels = self.event.get_channels()
+        if channel_filter := {str(pk) for pk in self.options.get("channels", [])}:
+            channels = [ch for ch in channels if str(ch.pk) in channel_filter]
         if environs := self.options.get("environs", []):
             notification_filter["environments__overlap"] = environs
 
-        for notification in self.event.notifications.filter(**notification_filter).match(self.context):
-            context = notification.get_context(self.get_context())
-            for channel in self.event.channels.filter(**channel_filter):
-                for assignment in notification.get_pending_subscriptions(delivered, channel).filter(
-                    **assignment_filter
-                ):
-                    try:
-                        notification.notify_to_channel(channel, assignment, context)
-
-                        delivered.append(assignment.id)
-                        recipients.append((assignment.address.value, assignment.channel.name))
-                    except Exception as e:
-                        logger.exception(e)
-                        return False
-                    finally:
-                        self.data = {"delivered": delivered, "recipients": recipients}
-                        self.save()
+        set_attributes({ATTR_OCCURRENCE: self.pk, ATTR_CORRELATION_ID: self.correlation_id})
+        trace = DeliveryTrace()
+        try:
+            with trace.phase("match"):
+                notifications = list(self.event.notifications.filter(**notification_filter).match(self.context))
+            for notification in notifications:
+                context = notification.get_context(self.get_context())
+                for channel in channels:
+                    with channel.dispatcher:
+                        with trace.phase("resolve"):
+                            pending = notification.get_pending_subscriptions(delivered, channel)
+                            assignments = channel.dispatcher.group(list(pending.filter(**assignment_filter)))
+                        for assignment in assignments:
+                            try:
+                                if notification.notify_to_channel(channel, assignment, context, trace=trace) is False:
+                                    continue
+                                if not delivered:
+                                    FIRST_DELIVERY.observe((timezone.now() - self.timestamp).total_seconds())
+                                delivered.append(assignment.id)
+                                recipients.append((assignment.address.value, assignment.channel.name))
+                            except Exception as e:
+                                logger.exception(e)
+                                return False
+        finally:
+            # progress is saved once per run, not per recipient: delivery happens inside
+            # process_occurrence() transaction, so intermediate saves would not survive a crash anyway
+            self.trace = trace.as_dict()
+            if delivered:
+                self.data = {"delivered": delivered, "recipients": recipients}
+                with trace.phase("persist"):
+                    self.save()
+                # saved by the caller with the final status
+                self.trace = trace.as_dict()
         return True
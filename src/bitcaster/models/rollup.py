@@ -0,0 +1,98 @@
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Any, Iterable
+
+from django.db import connections, models
+from django.db.models import Max, Q, QuerySet, Sum
+from django.utils import timezone
+from django.utils.translation import gettext as _
+
+from ..cache.storage import invalidate_debounced
+from .event import Event
+from .mixins import BitcasterBaselManager
+
+# (event id, timestamp, status, delta)
+RollupChange = tuple[int, datetime, str, int]
+
+
+def truncate_minute(ts: datetime) -> datetime:
+    return ts.replace(second=0, microsecond=0)
+
+
+class OccurrenceRollupManager(BitcasterBaselManager["OccurrenceRollup"]):
+
+    def get_by_natural_key(
+        self, minute: str, status: str, evt: str, app: str, prj: str, org: str
+    ) -> "OccurrenceRollup":
+        return self.get(
+            minute=minute,
+            status=status,
+            event__application__project__organization__slug=org,
+            event__application__project__slug=prj,
+            event__application__slug=app,
+            event__slug=evt,
+        )
+
+    def add(self, changes: Iterable[RollupChange]) -> None:
+        """Apply `changes` to the counters, using a single `INSERT .. ON CONFLICT DO UPDATE`."""
+        totals: Counter[tuple[int, datetime, str]] = Counter()
+        for event_id, ts, status, delta in changes:
+            totals[(event_id, truncate_minute(ts), status)] += delta
+        rows = [(*key, delta) for key, delta in totals.items() if delta]
+        if not rows:
+            return
+        connection = connections[self.db]
+        table = connection.ops.quote_name(self.model._meta.db_table)
+        values = ", ".join(["(%s, %s, %s, %s)"] * len(rows))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (event_id, minute, status, count) VALUES {values} "  # nosec
+                f"ON CONFLICT (event_id, minute, status) DO UPDATE SET count = {table}.count + EXCLUDED.count",
+                [v for row in rows for v in row],
+            )
+        invalidate_debounced(self.model)
+
+    def summary(self, since: datetime) -> QuerySet["OccurrenceRollup", dict[str, Any]]:
+        """Occurrences per event after `since`, by status."""
+        from .occurrence import Occurrence
+
+        return (
+            self.filter(minute__gte=truncate_minute(since))
+            .values("event_id", "event__name", application=models.F("event__application__name"))
+            .annotate(
+                total=Sum("count"),
+                last=Max("minute"),
+                **{s.value.lower(): Sum("count", filter=Q(status=s.value), default=0) for s in Occurrence.Status},
+            )
+            .order_by("-last")
+        )
+
+    def purge(self, days: int) -> int:
+        return self.filter(minute__lt=timezone.now() - timedelta(days=days)).delete()[0]
+
+
+class OccurrenceRollup(models.Model):
+    """Number of Occurrences of an Event, per minute and status.
+
+    Counters are updated when an Occurrence is created or changes status (see `bitcaster.handlers`),
+    so the dashboard reads at most (events * minutes * statuses) rows, whatever the traffic.
+    """
+
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name="rollups")
+    minute = models.DateTimeField()
+    status = models.CharField(max_length=20)
+    count = models.IntegerField(default=0)
+
+    objects = OccurrenceRollupManager()
+
+    class Meta:
+        verbose_name = _("Occurrence Rollup")
+        verbose_name_plural = _("Occurrence Rollups")
+        constraints = [models.UniqueConstraint(fields=("event", "minute", "status"), name="occurrencerollup_unique")]
+        indexes = [models.Index(fields=("minute",), name="occurrencerollup_minute")]
+
+    def __str__(self) -> str:
+        return f"{self.event} {self.minute} {self.status}: {self.count}"
+
+    def natural_key(self) -> tuple[str, ...]:
+        return str(self.minute), self.status, *self.event.natural_key()
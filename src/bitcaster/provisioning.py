@@ -0,0 +1,288 @@
+"""Bulk provisioning of Organization's users.
+
+Each record describes a user and (optionally) its addresses and the channels they must be
+assigned to::
+
+    {"email": "user@example.com", "first_name": "John", "last_name": "Doe",
+     "addresses": [{"name": "work", "value": "+3900000000", "channels": ["SMS"]}]}
+
+The `email` is always added as an address named "email". Records are processed in batches,
+each batch upserts (`INSERT .. ON CONFLICT DO UPDATE`) users, roles, addresses and assignments
+with a constant number of queries.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+
+from .constants import Bitcaster
+from .models import (
+    Address,
+    Assignment,
+    Channel,
+    Organization,
+    RecipientSnapshot,
+    User,
+    UserRole,
+)
+from .utils.address import is_email
+
+if TYPE_CHECKING:
+    from django.contrib.auth.models import Group
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 1000
+EMAIL_ADDRESS_NAME = "email"
+
+
+@dataclass
+class ProvisioningResult:
+    users: int = 0
+    addresses: int = 0
+    assignments: int = 0
+    errors: list[dict[str, Any]] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "users": self.users,
+            "addresses": self.addresses,
+            "assignments": self.assignments,
+            "errors": self.errors,
+        }
+
+
+def batched(records: Iterable[dict[str, Any]], size: int) -> Iterator[list[tuple[int, dict[str, Any]]]]:
+    batch: list[tuple[int, dict[str, Any]]] = []
+    for num, record in enumerate(records, 1):
+        batch.append((num, record))
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class Provisioner:
+    def __init__(self, organization: Organization, group: "Optional[Group]" = None, batch_size: int = BATCH_SIZE):
+        self.organization = organization
+        self.group = group or Bitcaster.get_default_group()
+        self.batch_size = batch_size
+        self.channels: dict[str, list[int]] = {}
+        for pk, name in Channel.objects.filter(organization=organization).values_list("pk", "name"):
+            self.channels.setdefault(name.lower(), []).append(pk)
+
+    def run(self, records: Iterable[dict[str, Any]]) -> ProvisioningResult:
+        result = ProvisioningResult()
+        for batch in batched(records, self.batch_size):
+            batch_result = ProvisioningResult()
+            try:
+                with transaction.atomic():
+                    self.process(batch, batch_result)
+            except IntegrityError as e:  # conflicts with rows written concurrently
+                logger.exception(e)
+                batch_result = ProvisioningResult(
+                    errors=[{"row": num, "error": "Conflicting data"} for num, __ in batch]
+                )
+            result.users += batch_result.users
+            result.addresses += batch_result.addresses
+            result.assignments += batch_result.assignments
+            result.errors.extend(batch_result.errors)
+        return result
+
+    def clean(self, num: int, record: Any, result: ProvisioningResult) -> Optional[dict[str, Any]]:
+        if not isinstance(record, dict) or not is_email(email := str(record.get("email", "")).strip().lower()):
+            result.errors.append({"row": num, "error": "Invalid or missing email"})
+            return None
+        addresses = {EMAIL_ADDRESS_NAME: (email, [])}
+        for entry in record.get("addresses", []):
+            if not isinstance(entry, dict) or not entry.get("value"):
+                result.errors.append({"row": num, "error": f"Invalid address {entry}"})
+                continue
+            name = entry.get("name") or Address.objects.get_type_from_value(entry["value"]).value
+            addresses[name] = (entry["value"], entry.get("channels", []))
+        if channels := record.get("channels"):  # shortcut for the email address channels
+            addresses[EMAIL_ADDRESS_NAME] = (email, channels)
+        names: dict[str, str] = {}
+        for name, (value, __) in list(addresses.items()):  # (user, value) is unique too
+            if value in names:
+                result.errors.append({"row": num, "error": f"Duplicate address {value} ({names[value]}, {name})"})
+                del addresses[name]
+            else:
+                names[value] = name
+        for __, channels in addresses.values():
+            if unknown := [ch for ch in channels if ch.lower() not in self.channels]:
+                result.errors.append({"row": num, "error": f"Unknown channel(s) {', '.join(unknown)}"})
+                channels[:] = [ch for ch in channels if ch.lower() in self.channels]
+        return {
+            "row": num,
+            "email": email,
+            "first_name": record.get("first_name"),
+            "last_name": record.get("last_name"),
+            "addresses": addresses,
+        }
+
+    def process(self, batch: list[tuple[int, dict[str, Any]]], result: ProvisioningResult) -> None:
+        records: dict[str, dict[str, Any]] = {}
+        for num, record in batch:
+            if cleaned := self.clean(num, record, result):
+                records[cleaned["email"]] = cleaned  # last one wins
+        if not records:
+            return
+        user_ids = self.upsert_users(records, result)
+        address_ids = self.upsert_addresses(records, user_ids, result)
+        self.upsert_assignments(records, user_ids, address_ids, result)
+
+    def upsert_users(self, records: dict[str, dict[str, Any]], result: ProvisioningResult) -> dict[str, int]:
+        """Upsert the users (and their roles) of `records`, returning their ids by email.
+
+        Records of users already in the batch are removed from `records`. Existing users that are
+        not members of the organization are only added to it: their data belongs to other
+        organizations and is never changed (these records are marked as `shared`).
+        """
+        # users are matched by email (as the single user API does) then by username.
+        # Fields missing in the record keep their current value
+        existing: dict[str, User] = {}
+        for u in (
+            User.objects.annotate(lower_email=Lower("email"))
+            .filter(Q(lower_email__in=records) | Q(username__in=records))
+            .only("username", "email", "first_name", "last_name")
+            .order_by("-pk")
+        ):
+            existing[u.email.lower() if u.email.lower() in records else u.username] = u
+        members = set(
+            UserRole.objects.filter(
+                organization=self.organization, user_id__in=[u.pk for u in existing.values()]
+            ).values_list("user_id", flat=True)
+        )
+        user_ids: dict[str, int] = {}
+        users: dict[str, User] = {}
+        usernames: set[str] = set()
+        for email, record in list(records.items()):
+            current = existing.get(email)
+            user = User(username=current.username if current else email, email=current.email if current else email)
+            if user.username in usernames:
+                result.errors.append({"row": record["row"], "error": f"Duplicate user {user.username}"})
+                del records[email]
+                continue
+            usernames.add(user.username)
+            record["shared"] = bool(current and current.pk not in members)
+            if record["shared"]:
+                user_ids[email] = current.pk
+                continue
+            for attr in ("first_name", "last_name"):
+                if record[attr] is not None:
+                    setattr(user, attr, record[attr])
+                elif current:
+                    setattr(user, attr, getattr(current, attr))
+            users[email] = user
+        upserted = User.objects.bulk_create(
+            list(users.values()),
+            update_conflicts=True,
+            unique_fields=["username"],
+            update_fields=["first_name", "last_name", "last_updated"],
+        )
+        user_ids.update({email: u.pk for email, u in zip(users, upserted)})
+        result.users += len(user_ids)
+
+        UserRole.objects.bulk_create(
+            [UserRole(user_id=pk, organization=self.organization, group=self.group) for pk in user_ids.values()],
+            ignore_conflicts=True,
+        )
+        return user_ids
+
+    def upsert_addresses(
+        self, records: dict[str, dict[str, Any]], user_ids: dict[str, int], result: ProvisioningResult
+    ) -> dict[tuple[int, str], int]:
+        """Upsert the addresses of `records`, returning their ids by (user id, name).
+
+        Addresses of `shared` users are only created, existing ones are never changed.
+        """
+        # addresses are upserted by (user, name). If the value is already used by another address
+        # of the same user, that one is used (to not violate the (user, value) constraint)
+        in_use = {
+            (uid, value): (name, pk)
+            for uid, value, name, pk in Address.objects.filter(user_id__in=user_ids.values()).values_list(
+                "user_id", "value", "name", "pk"
+            )
+        }
+        address_ids: dict[tuple[int, str], int] = {}
+        addresses = []
+        missing: dict[tuple[int, str], tuple[int, str]] = {}  # shared users: (uid, value) -> (row, name)
+        for email, record in records.items():
+            uid = user_ids[email]
+            for name, (value, __) in record["addresses"].items():
+                current_name, pk = in_use.get((uid, value), (name, None))
+                if record["shared"] and pk:
+                    address_ids[(uid, name)] = pk
+                elif record["shared"]:
+                    missing[(uid, value)] = (record["row"], name)
+                elif current_name != name:
+                    address_ids[(uid, name)] = pk
+                else:
+                    addresses.append(
+                        Address(user_id=uid, name=name, value=value, type=Address.objects.get_type_from_value(value))
+                    )
+        addresses = Address.objects.bulk_create(
+            addresses,
+            update_conflicts=True,
+            unique_fields=["user", "name"],
+            update_fields=["value", "type", "last_updated"],
+        )
+        result.addresses += len(addresses)
+        address_ids.update({(a.user_id, a.name): a.pk for a in addresses})
+        if missing:
+            Address.objects.bulk_create(
+                [
+                    Address(user_id=uid, name=name, value=value, type=Address.objects.get_type_from_value(value))
+                    for (uid, value), (__, name) in missing.items()
+                ],
+                ignore_conflicts=True,
+            )
+            created = Address.objects.filter(
+                user_id__in={uid for uid, __ in missing}, value__in={value for __, value in missing}
+            ).values_list("user_id", "value", "pk")
+            for uid, value, pk in created:
+                if (uid, value) in missing:
+                    row, name = missing.pop((uid, value))
+                    address_ids[(uid, name)] = pk
+                    result.addresses += 1
+            for (__, value), (row, name) in missing.items():  # the name is used by another address
+                result.errors.append({"row": row, "error": f"Address {name} already exists"})
+        return address_ids
+
+    def upsert_assignments(
+        self,
+        records: dict[str, dict[str, Any]],
+        user_ids: dict[str, int],
+        address_ids: dict[tuple[int, str], int],
+        result: ProvisioningResult,
+    ) -> None:
+        assignments = []
+        for email, record in records.items():
+            uid = user_ids[email]
+            for name, (__, channels) in record["addresses"].items():
+                if (uid, name) not in address_ids:
+                    continue
+                for ch_name in channels:
+                    for ch_id in self.channels[ch_name.lower()]:
+                        assignments.append(Assignment(address_id=address_ids[(uid, name)], channel_id=ch_id))
+        assignments = Assignment.objects.bulk_create(
+            assignments,
+            update_conflicts=True,
+            unique_fields=["address", "channel"],
+            update_fields=["active", "last_updated"],
+        )
+        result.assignments += len(assignments)
+        # re-activated assignments may belong to distribution lists
+        RecipientSnapshot.objects.sync([a.pk for a in assignments])
+
+
+def provision(
+    organization: Organization, records: Iterable[dict[str, Any]], batch_size: int = BATCH_SIZE
+) -> ProvisioningResult:
+    return Provisioner(organization, batch_size=batch_size).run(records)
@@ -1,11 +1,23 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Iterable
 
+from django.conf import settings
 from django.core.exceptions import ObjectDoesNotExist
-from django.db import transaction
+from django.db import connections, transaction
 
 from bitcaster.config.celery import app
 from bitcaster.constants import Bitcaster, SystemEvent
-from bitcaster.models import LogEntry, User
+from bitcaster.models import LogEntry
+from bitcaster.telemetry import (
+    ATTR_CORRELATION_ID,
+    ATTR_EVENT,
+    ATTR_OCCURRENCE,
+    set_attributes,
+)
+
+if TYPE_CHECKING:
+    from bitcaster.models import Monitor
 
 logger = logging.getLogger(__name__)
 
@@ -17,6 +29,7 @@ def process_occurrence(occurrence_pk: int) -> int | Exception:
     try:
         with transaction.atomic():
             o: Occurrence = Occurrence.objects.select_related("event").select_for_update().get(id=occurrence_pk)
+            set_attributes({ATTR_OCCURRENCE: o.pk, ATTR_EVENT: o.event.slug, ATTR_CORRELATION_ID: o.correlation_id})
             if o.attempts > 0:
                 o.attempts = o.attempts - 1
                 o.save()
@@ -57,8 +70,8 @@ def schedule_occurrences() -> None | Exception:
 
     o: Occurrence
     try:
-        for o in Occurrence.objects.select_related("event").filter(status=Occurrence.Status.NEW):
-            process_occurrence.delay(o.id)
+        for o in Occurrence.objects.filter(status=Occurrence.Status.NEW).order_by("priority", "timestamp"):
+            o.enqueue()
     except Exception as e:
         logger.exception(e)
         return e
@@ -66,45 +79,118 @@ def schedule_occurrences() -> None | Exception:
 
 @app.task()
 def purge_occurrences() -> None | Exception:
-    from bitcaster.models import Occurrence
+    from constance import config
+
+    from bitcaster.models import Occurrence, OccurrenceRollup
 
     try:
         Occurrence.objects.purgeable().delete()
+        OccurrenceRollup.objects.purge(config.OCCURRENCE_DEFAULT_RETENTION)
     except Exception as e:
         logger.exception(e)
         return e
 
 
-@app.task()
-def monitor_run(pk: str) -> str:
+def monitor_log_entries(monitors: "Iterable[Monitor]") -> list[LogEntry]:
     from django.contrib.contenttypes.models import ContentType
 
     from bitcaster.models import Monitor
 
+    # both lookups are cached
+    content_type = ContentType.objects.get_for_model(Monitor)
+    user_id = Bitcaster.get_system_user_id()
+    return [
+        LogEntry(
+            content_type=content_type,
+            object_id=m.pk,
+            action_flag=100,
+            user_id=user_id,
+            object_repr=str(m),
+            change_message="Monitor started",
+        )
+        for m in monitors
+    ]
+
+
+def check_monitor(monitor: "Monitor") -> None:
+    """Run the Monitor agent and set its `result`. Monitors that fail are deactivated."""
+    try:
+        monitor.agent.check()
+        monitor.result = {"message": "Success", "changes": monitor.agent.changes_detected()}
+    except Exception as e:
+        monitor.active = False
+        monitor.result = {"error": str(e)}
+        raise
+
+
+def try_check_monitor(monitor: "Monitor") -> bool:
+    try:
+        check_monitor(monitor)
+        return True
+    except Exception as e:
+        logger.exception(e)
+        return False
+
+
+def try_check_monitor_in_thread(monitor: "Monitor") -> bool:
+    try:
+        return try_check_monitor(monitor)
+    finally:
+        connections.close_all()  # only the connections opened by this thread
+
+
+@app.task()
+def monitor_schedule(name: str) -> int:
+    """Run the Monitors scheduled by the `name` PeriodicTask, split in `MONITOR_BATCH_SIZE` tasks."""
+    from bitcaster.models import Monitor
+
+    pks = list(Monitor.objects.filter(schedule__name=name, active=True).order_by("pk").values_list("pk", flat=True))
+    size = settings.MONITOR_BATCH_SIZE
+    for start in range(0, len(pks), size):
+        end = start + size
+        monitor_run_batch.delay(pks[start:end])
+    return len(pks)
+
+
+@app.task()
+def monitor_run_batch(pks: list[int]) -> dict[str, int]:
+    """Run the Monitors `pks`, up to `MONITOR_CONCURRENCY` at the same time.
+
+    Checks mostly wait for filesystems and FTP servers, so they run in threads.
+    """
+    from bitcaster.models import Monitor
+
+    monitors = list(Monitor.objects.filter(pk__in=pks, active=True).select_related("event"))
+    LogEntry.objects.bulk_create(monitor_log_entries(monitors))
+    workers = min(settings.MONITOR_CONCURRENCY, len(monitors))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="monitor") as pool:
+            results = list(pool.map(try_check_monitor_in_thread, monitors))
+    else:
+        results = [try_check_monitor(m) for m in monitors]
+    # the agents save `data` themselves, only when the state changes
+    Monitor.objects.bulk_update(monitors, ["active", "result"])
+    return {"done": results.count(True), "errors": results.count(False), "inactive": len(set(pks)) - len(monitors)}
+
+
+@app.task()
+def monitor_run(pk: str) -> str:
+    from bitcaster.models import Monitor
+
     try:
-        monitor: "Monitor" = Monitor.objects.get(pk=pk)
+        monitor: "Monitor" = Monitor.objects.select_related("event").get(pk=pk)
     except ObjectDoesNotExist as e:
         logger.exception(e)
         raise
 
-    try:
-        if monitor.active:
-            LogEntry.objects.create(
-                content_type=ContentType.objects.get_for_model(Monitor),
-                object_id=pk,
-                action_flag=100,
-                user=User.objects.get(username="__SYSTEM__"),
-                object_repr=str(monitor),
-                change_message="Monitor started",
-            )
-            monitor.agent.check()
-            monitor.result = {"message": "Success", "changes": monitor.agent.changes_detected()}
-            return "done"
+    if not monitor.active:
         return "inactive"
+    monitor_log_entries([monitor])[0].save()
+    try:
+        check_monitor(monitor)
+        return "done"
     except Exception as e:
         logger.exception(e)
-        monitor.active = False
-        monitor.result = {"error": str(e)}
         raise
     finally:
-        monitor.save()
+        monitor.save(update_fields=["active", "result"])
@@ -0,0 +1,77 @@
+"""OpenTelemetry tracing.
+
+Spans cover the trigger API, the Celery hop (context is propagated through the task headers),
+`Occurrence.process()` and each `Dispatcher.send()`, and carry the Occurrence `correlation_id`.
+Normal and low priority Occurrences are enqueued later by the scheduler, so the trace context of the
+trigger is stored in the Occurrence `options` (W3C `traceparent`) and linked from `Occurrence.process()`.
+Tracing is configured only if `OTEL_ENABLED` is set, otherwise the OpenTelemetry API
+falls back to its no-op implementation and nothing is recorded nor exported.
+Exporter is configured using the standard `OTEL_EXPORTER_OTLP_*` environment variables.
+"""
+
+import logging
+from typing import Any, Mapping, Optional
+
+from django.conf import settings
+from opentelemetry import propagate, trace
+
+logger = logging.getLogger(__name__)
+
+tracer = trace.get_tracer("bitcaster")
+
+ATTR_CORRELATION_ID = "bitcaster.correlation_id"
+ATTR_OCCURRENCE = "bitcaster.occurrence"
+ATTR_EVENT = "bitcaster.event"
+ATTR_CHANNEL = "bitcaster.channel"
+ATTR_DISPATCHER = "bitcaster.dispatcher"
+
+
+def setup(service_name: Optional[str] = None) -> bool:
+    if not settings.OTEL_ENABLED:
+        return False
+
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.instrumentation.celery import CeleryInstrumentor
+    from opentelemetry.instrumentation.django import DjangoInstrumentor
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    provider = TracerProvider(resource=Resource.create({"service.name": service_name or settings.OTEL_SERVICE_NAME}))
+    provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    trace.set_tracer_provider(provider)
+    DjangoInstrumentor().instrument()
+    CeleryInstrumentor().instrument()
+    logger.info("OpenTelemetry tracing enabled")
+    return True
+
+
+def setup_web() -> None:
+    """Configure tracing for the web processes.
+
+    Under uwsgi the exporter thread must be started in each worker, after the fork.
+    """
+    try:
+        from uwsgidecorators import postfork
+    except ImportError:
+        setup()
+    else:  # pragma: no cover
+        postfork(setup)
+
+
+def set_attributes(attributes: dict[str, Any]) -> None:
+    """Add the not empty `attributes` to the current span."""
+    span = trace.get_current_span()
+    if span.is_recording():
+        span.set_attributes({k: v for k, v in attributes.items() if v is not None})
+
+
+def inject_context(carrier: dict[str, Any]) -> None:
+    """Store the current trace context (W3C `traceparent`) in `carrier`."""
+    propagate.inject(carrier)
+
+
+def context_links(carrier: Mapping[str, Any]) -> list[trace.Link]:
+    """Link to the span stored in `carrier` by `inject_context()`, if any."""
+    span_context = trace.get_current_span(propagate.extract(carrier)).get_span_context()
+    return [trace.Link(span_context)] if span_context.is_valid else []
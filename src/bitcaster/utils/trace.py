@@ -0,0 +1,42 @@
+import time
+from contextlib import contextmanager
+from typing import Generator, TypedDict
+
+# phase name -> [calls, total ms, max ms]
+TraceData = TypedDict("TraceData", {"elapsed": float, "phases": dict[str, list[float]]})
+
+
+class DeliveryTrace:
+    """Aggregated timings of the phases of an Occurrence processing.
+
+    Each phase keeps only calls count, total and max time, so the size of the trace
+    does not depend on the number of recipients.
+    """
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.phases: dict[str, list[float]] = {}
+
+    @contextmanager
+    def phase(self, name: str) -> Generator[None, None, None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def add(self, name: str, elapsed: float) -> None:
+        ms = elapsed * 1000
+        if name in self.phases:
+            stats = self.phases[name]
+            stats[0] += 1
+            stats[1] += ms
+            stats[2] = max(stats[2], ms)
+        else:
+            self.phases[name] = [1, ms, ms]
+
+    def as_dict(self) -> TraceData:
+        return {
+            "elapsed": round((time.perf_counter() - self.start) * 1000, 3),
+            "phases": {name: [int(c), round(t, 3), round(m, 3)] for name, (c, t, m) in self.phases.items()},
+        }
@@ -11,5 +11,6 @@ urlpatterns = [
     path("logout/", views.LogoutView.as_view(), name="logout"),
     path("admin/logout/", views.LogoutView.as_view(), name="logout"),
     path("healthcheck/", views.HealthCheckView.as_view(), name="healthcheck"),
+    path("metrics/", views.MetricsView.as_view(), name="metrics"),
     re_path(r"^%s(?P<path>.*)$" % re.escape(settings.MEDIA_URL.lstrip("/")), views.MediaView.as_view()),
 ]
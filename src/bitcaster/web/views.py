@@ -39,6 +39,16 @@ class HealthCheckView(View):
         return HttpResponse("Ok")
 
 
+class MetricsView(View):
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        from bitcaster import metrics
+
+        if not settings.METRICS_ENABLED:
+            raise Http404
+        return HttpResponse(metrics.generate_latest(metrics.get_registry()), content_type=metrics.CONTENT_TYPE_LATEST)
+
+
 class MediaView(View):
 
     def get(self, request: HttpRequest, path: str) -> HttpResponse | FileResponse:
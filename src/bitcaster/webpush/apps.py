@@ -11,3 +11,4 @@ class Config(AppConfig):
 
         from . import admin  # noqa
         from . import dispatcher  # noqa
+        from . import tasks  # noqa
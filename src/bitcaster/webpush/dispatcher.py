@@ -13,7 +13,7 @@ from bitcaster.dispatchers.base import (
     MessageProtocol,
     Payload,
 )
-from bitcaster.exceptions import DispatcherError
+from bitcaster.exceptions import DispatcherError, SubscriptionGoneError
 from bitcaster.models import Assignment
 from bitcaster.state import state
 
@@ -79,9 +79,18 @@ class WebPushDispatcher(Dispatcher):
     protocol = MessageProtocol.WEBPUSH
     need_subscription = True
 
+    def group(self, assignments: list[Assignment]) -> list[Assignment]:
+        """Send the messages of the same push service one after the other, over its open connections."""
+        from .engine import group_by_origin
+
+        return group_by_origin(
+            assignments, lambda a: (a.data or {}).get("webpush", {}).get("subscription", {}).get("endpoint", "")
+        )
+
     def send(self, address: str, payload: Payload, assignment: "Optional[Assignment]" = None, **kwargs: Any) -> bool:
+        from .utils import prune_subscription, webpush_send_message
+
         try:
-            from .utils import webpush_send_message
 
             if not assignment:
                 raise ValueError(_("WebPushDispatcher: assignment arg must be provided"))
@@ -91,6 +100,10 @@ class WebPushDispatcher(Dispatcher):
             msg = json.dumps({"message": payload.message, "subject": payload.subject})
             res: dict[str, Any] = webpush_send_message(message=msg, assignment=assignment, **kwargs)
             return res["success"] == 1
+        except SubscriptionGoneError as e:
+            logger.warning(f"Subscription gone for {assignment}: {e}")
+            prune_subscription(assignment)
+            return False
         except Exception as e:
             logger.exception(e)
             raise DispatcherError(e)
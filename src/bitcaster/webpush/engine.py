@@ -0,0 +1,99 @@
+import json
+import logging
+import time
+from threading import Lock
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional, TypeVar
+from urllib.parse import urlparse
+
+import requests
+from py_vapid import Vapid02
+from pywebpush import WebPusher, WebPushException
+from requests.adapters import HTTPAdapter
+
+if TYPE_CHECKING:
+    from requests import Response
+
+    from bitcaster.models import Channel
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def get_origin(endpoint: str) -> str:
+    url = urlparse(endpoint)
+    return f"{url.scheme}://{url.netloc}"
+
+
+def group_by_origin(items: Iterable[T], endpoint: Callable[[T], str]) -> list[T]:
+    """`items` with the ones of the same push service origin next to each other (in their original order)."""
+    groups: dict[str, list[T]] = {}
+    for item in items:
+        groups.setdefault(get_origin(endpoint(item)), []).append(item)
+    return [item for group in groups.values() for item in group]
+
+
+class WebPushEngine:
+    """Deliver WebPush messages reusing VAPID keys, signatures and HTTP connections.
+
+    Parsed private keys are cached per channel configuration; signed VAPID headers are cached
+    per (configuration, push service origin) until they are close to expire.
+    Requests are grouped by push service origin: each origin has its own keep-alive session
+    (and connection pool), and the dispatcher sends the messages of the same origin one after the other.
+    """
+
+    signature_ttl: int = 12 * 60 * 60
+    signature_margin: int = 10 * 60
+    pool_maxsize: int = 20
+
+    def __init__(self) -> None:
+        self._lock = Lock()
+        self._keys: dict[tuple[str, str], tuple[Optional[Vapid02], dict[str, Any]]] = {}
+        self._signatures: dict[tuple[str, str, str], tuple[int, dict[str, str]]] = {}
+        self._sessions: dict[str, requests.Session] = {}
+
+    def get_session(self, origin: str) -> requests.Session:
+        with self._lock:
+            if origin not in self._sessions:
+                session = requests.Session()
+                session.mount(origin, HTTPAdapter(pool_maxsize=self.pool_maxsize))
+                self._sessions[origin] = session
+            return self._sessions[origin]
+
+    def get_key(self, config: dict[str, str]) -> tuple[Optional[Vapid02], dict[str, Any]]:
+        key = (config.get("private_key", ""), config.get("CLAIMS", ""))
+        with self._lock:
+            if key not in self._keys:
+                claims = json.loads(config["CLAIMS"]) if config.get("CLAIMS") else {}
+                vapid = Vapid02.from_string(private_key=config["private_key"]) if claims else None
+                self._keys[key] = (vapid, claims)
+            return self._keys[key]
+
+    def get_vapid_headers(self, config: dict[str, str], endpoint: str) -> dict[str, str]:
+        vapid, claims = self.get_key(config)
+        if not vapid:
+            return {}
+        origin = get_origin(endpoint)
+        key = (config.get("private_key", ""), config.get("CLAIMS", ""), origin)
+        now = int(time.time())
+        with self._lock:
+            expires, headers = self._signatures.get(key, (0, {}))
+            if expires - self.signature_margin <= now:
+                expires = now + self.signature_ttl
+                headers = vapid.sign({**claims, "aud": origin, "exp": expires})
+                self._signatures[key] = (expires, headers)
+            return headers
+
+    def send(self, channel: "Channel", subscription_info: dict[str, Any], data: str, **kwargs: Any) -> "Response":
+        headers = {**(kwargs.pop("headers", None) or {})}
+        headers.update(self.get_vapid_headers(channel.config, subscription_info["endpoint"]))
+        session = self.get_session(get_origin(subscription_info["endpoint"]))
+        response: "Response" = WebPusher(subscription_info, requests_session=session).send(
+            data=data, headers=headers, **kwargs
+        )
+        if response.status_code > 202:
+            raise WebPushException(f"Push failed: {response.status_code} {response.reason}", response=response)
+        return response
+
+
+engine = WebPushEngine()
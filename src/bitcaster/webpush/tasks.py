@@ -0,0 +1,18 @@
+import logging
+
+from bitcaster.config.celery import app
+
+logger = logging.getLogger(__name__)
+
+
+@app.task()
+def prune_subscriptions(pks: list[int]) -> int | Exception:
+    from bitcaster.models import Assignment, RecipientSnapshot
+
+    try:
+        updated = Assignment.objects.filter(pk__in=pks).update(validated=False, data={})
+        RecipientSnapshot.objects.sync(pks)
+        return updated
+    except Exception as e:
+        logger.exception(e)
+        return e
@@ -1,11 +1,15 @@
-import json
 import logging
+import threading
+import weakref
 from typing import TYPE_CHECKING, Any, TypedDict
 
 from django.core.signing import Signer
-from pywebpush import WebPushException, webpush
+from django.db import transaction
+from pywebpush import WebPushException
 
-from bitcaster.exceptions import DispatcherError
+from bitcaster.exceptions import DispatcherError, SubscriptionGoneError
+
+from .engine import engine
 
 if TYPE_CHECKING:
     from bitcaster.models import Assignment
@@ -15,6 +19,8 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+GONE_STATUS_CODES = (404, 410)
+
 
 def sign(assignment: "Assignment") -> str:
     signer = Signer()
@@ -30,21 +36,53 @@ def unsign(secret: str) -> "SignatureT":
 
 def webpush_send_message(assignment: "Assignment", message: str, **kwargs: Any) -> dict[str, Any]:
     subscription: dict[str, str] = assignment.data["webpush"]["subscription"]
-    cfg: "dict[str,str]" = assignment.channel.config
 
     subscription_info = {"endpoint": subscription["endpoint"], "keys": subscription["keys"]}
     results: dict[str, Any] = {"results": []}
     try:
-        webpush(
-            subscription_info=subscription_info,
-            data=message,
-            vapid_private_key=cfg["private_key"],
-            vapid_claims=json.loads(cfg["CLAIMS"]),
-            verbose=True,
-            **kwargs,
-        )
+        engine.send(assignment.channel, subscription_info, message, **kwargs)
         results["success"] = 1
         return results
     except WebPushException as e:
+        if e.response is not None and e.response.status_code in GONE_STATUS_CODES:
+            raise SubscriptionGoneError(e.message)
         logger.exception(e)
         raise DispatcherError(e.message)
+
+
+class GoneSubscriptions:
+    """Subscriptions gone in a transaction, registered with `transaction.on_commit()` once."""
+
+    def __init__(self) -> None:
+        self.pks: list[int] = []
+
+    def __call__(self) -> None:
+        flush_gone_subscriptions(self.pks)
+
+
+# the pending batch of the current thread. Only Django holds the batch, so the reference is
+# dead once the callback has run or has been discarded by a rollback
+_local = threading.local()
+
+
+def prune_subscription(assignment: "Assignment") -> None:
+    """Schedule deactivation of an expired subscription.
+
+    The subscriptions gone in the current transaction are pruned with a single task once it commits.
+    """
+    ref = getattr(_local, "batch", None)
+    batch: "GoneSubscriptions | None" = ref() if ref else None
+    if batch is None:
+        batch = GoneSubscriptions()
+        batch.pks.append(assignment.pk)
+        _local.batch = weakref.ref(batch)
+        transaction.on_commit(batch)  # runs at once outside of a transaction
+    else:
+        batch.pks.append(assignment.pk)
+
+
+def flush_gone_subscriptions(pks: list[int]) -> None:
+    from .tasks import prune_subscriptions
+
+    if pks:
+        prune_subscriptions.delay(sorted(set(pks)))
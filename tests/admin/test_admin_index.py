@@ -43,3 +43,14 @@ def test_admin_index(app: "DjangoTestApp", data: Any, django_assert_num_queries:
     with django_assert_num_queries(14):
         res = app.get(url)
         assert res.status_code == 200
+
+
+def test_admin_dashboard(app: "DjangoTestApp", settings: SettingsWrapper) -> None:
+    from django.utils import timezone
+    from testutils.factories import OccurrenceFactory
+
+    settings.FLAGS = {"OLD_STYLE_UI": [("boolean", False)]}
+    o = OccurrenceFactory(timestamp=timezone.now())
+    res = app.get(reverse("admin:index"))
+    assert res.status_code == 200
+    assert res.context["last_events"][0]["event__name"] == o.event.name
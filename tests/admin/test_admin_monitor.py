@@ -25,7 +25,7 @@ from testutils.factories import (
 )
 
 from bitcaster.agents import AgentFileSystem
-from bitcaster.models import Event, Monitor
+from bitcaster.models import Event, Monitor, MonitorSnapshot
 from bitcaster.state import state
 
 if TYPE_CHECKING:
@@ -139,8 +139,7 @@ def test_monitor_test(app: DjangoTestApp, monitor: "Monitor") -> None:
     assert msg.message == "Success. No changes detected"
 
     monitor.agent.check()
-    monitor.data["entries"] = {}
-    monitor.save()
+    MonitorSnapshot.objects.filter(monitor=monitor).delete()
     res = app.post(url)
     assert res.status_code == 200
     msg = list(res.context["messages"])[0]
@@ -11,7 +11,7 @@ if TYPE_CHECKING:
     from pytest import MonkeyPatch
     from webtest.response import TestResponse
 
-    from bitcaster.models import User
+    from bitcaster.models import Occurrence, User
 
 
 @pytest.fixture()
@@ -56,3 +56,13 @@ def test_purge_occurrence(app_for_admin: DjangoTestApp, monkeypatch: "MonkeyPatc
     assert "Occurrence purge has been successfully triggered" in res.text
 
     assert purge_occurrences_mock.called
+
+
+def test_delivery_trace(app_for_admin: DjangoTestApp, occurrence: "Occurrence") -> None:
+    occurrence.trace = {"elapsed": 10.0, "phases": {"render": [2, 4.0, 3.0], "send:ch": [2, 5.0, 4.0]}}
+    occurrence.save()
+
+    url = reverse("admin:bitcaster_occurrence_delivery_trace", args=[occurrence.pk])
+    res: "TestResponse" = app_for_admin.get(url)
+    assert res.status_code == 200
+    assert "send:ch" in res.text
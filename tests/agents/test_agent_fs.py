@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Any
 from unittest import mock
 from unittest.mock import Mock
 
@@ -6,9 +7,12 @@ import pytest
 from django.core.exceptions import ValidationError
 from pyfakefs.fake_filesystem import FakeFile, FakeFilesystem
 from pytest_django.fixtures import SettingsWrapper
+from strategy_field.utils import fqn
+from testutils.factories import MonitorFactory
 
-from bitcaster.agents.fs import AgentFileSystem, resolve_path, validate_path
-from bitcaster.models import Event, Monitor
+from bitcaster.agents.fs import AgentFileSystem, resolve_path, signature, validate_path
+from bitcaster.agents.scan import TreeScanner
+from bitcaster.models import Event, Monitor, MonitorSnapshot
 
 
 @pytest.fixture()
@@ -18,8 +22,8 @@ def monit_path(event: "Event", fs: FakeFilesystem) -> AgentFileSystem:
     fs.create_file("dir1/file2.txt")
     fs.create_file("dir1/file3.txt")
     return AgentFileSystem(
-        Mock(
-            spec=Monitor,
+        MonitorFactory(
+            agent=fqn(AgentFileSystem),
             event=event,
             config={"recursive": True, "path": fs.root.path, "add": True, "delete": True, "change": True},
             data={},
@@ -32,8 +36,8 @@ def monit_file(event: "Event", fs: FakeFilesystem) -> AgentFileSystem:
     fs.reset()
     ff: FakeFile = fs.create_file("dir1/file1.txt")
     return AgentFileSystem(
-        Mock(
-            spec=Monitor,
+        MonitorFactory(
+            agent=fqn(AgentFileSystem),
             event=event,
             config={"recursive": True, "path": ff.path, "add": True, "delete": True, "change": True},
             data={},
@@ -42,7 +46,7 @@ def monit_file(event: "Event", fs: FakeFilesystem) -> AgentFileSystem:
 
 
 def test_agent_fs_config(monit_path: AgentFileSystem) -> None:
-    assert list(monit_path.config.keys()) == ["path", "recursive", "add", "change", "delete"]
+    assert list(monit_path.config.keys()) == ["path", "recursive", "add", "change", "delete", "incremental"]
 
 
 def test_agent_fs_check_dir(monit_path: AgentFileSystem, fs: FakeFilesystem) -> None:
@@ -115,6 +119,104 @@ def test_agent_fs_no_update(monit_file: AgentFileSystem, fs: FakeFilesystem) ->
         assert not save.called
 
 
+def test_agent_fs_read_is_not_a_change(monit_file: AgentFileSystem, fs: FakeFilesystem) -> None:
+    monit_file.initialize()
+    fs.utime("dir1/file1.txt", ns=(0, fs.stat("dir1/file1.txt").st_mtime_ns))
+    monit_file.check()
+    assert not monit_file.changes_detected()
+
+
+def test_agent_fs_old_snapshot(monit_file: AgentFileSystem, fs: FakeFilesystem) -> None:
+    monit_file.monitor.data = {"entries": {"/dir1/file1.txt": "1.0"}, "diff": {}, "version": 2}
+    with mock.patch("bitcaster.models.event.Event.trigger") as notify:
+        monit_file.check()
+        assert not notify.called
+    assert monit_file.monitor.data["version"] == AgentFileSystem.snapshot_version
+
+
+def test_agent_fs_snapshot(monit_path: AgentFileSystem, fs: FakeFilesystem) -> None:
+    monit_path.initialize()
+    stored = MonitorSnapshot.objects.get(monitor=monit_path.monitor)
+    assert stored.digest == monit_path.monitor.data["snapshot"]["digest"]
+    assert stored.entries == 3
+    # a new agent reads the state back from the database
+    agent = AgentFileSystem(Monitor.objects.get(pk=monit_path.monitor.pk))
+    assert agent.entries() == monit_path.entries()
+
+
+def test_agent_fs_unchanged_no_write(monit_path: AgentFileSystem, fs: FakeFilesystem) -> None:
+    monit_path.initialize()
+    with mock.patch("bitcaster.models.monitor.Monitor.save") as save:
+        with mock.patch.object(MonitorSnapshot.objects, "update_or_create") as write:
+            monit_path.check()
+            assert not save.called
+            assert not write.called
+    fs.create_file("dir1/file4.txt")
+    with mock.patch("bitcaster.models.monitor.Monitor.save") as save:
+        monit_path.check()
+        assert save.called
+    # the diff is cleared by the next check
+    with mock.patch("bitcaster.models.monitor.Monitor.save") as save:
+        monit_path.check()
+        assert save.called
+        assert not monit_path.changes_detected()
+
+
+def test_agent_fs_check_paths(monit_path: AgentFileSystem, fs: FakeFilesystem) -> None:
+    monit_path.initialize()
+    fs.utime("dir1/file1.txt", (0, 0))
+    fs.create_file("aaa/bbb/new_file1.txt")
+    fs.remove_object("dir1/file2.txt")
+    with mock.patch("bitcaster.models.event.Event.trigger") as notify:
+        monit_path.check_paths(["/dir1/file1.txt", "/aaa", "/dir1/file2.txt"])
+        assert notify.called
+    assert monit_path.monitor.data["diff"] == {
+        "added": ["/aaa/bbb/new_file1.txt"],
+        "changed": ["/dir1/file1.txt"],
+        "deleted": ["/dir1/file2.txt"],
+    }
+    # removed directories
+    fs.remove_object("aaa")
+    monit_path.check_paths(["/aaa"])
+    assert monit_path.monitor.data["diff"]["deleted"] == ["/aaa/bbb/new_file1.txt"]
+    assert list(monit_path.entries()) == ["/dir1/file1.txt", "/dir1/file3.txt"]
+    # same result as a full scan
+    monit_path.check()
+    assert not monit_path.changes_detected()
+
+
+def test_agent_fs_parallel_scan(monit_path: AgentFileSystem, fs: FakeFilesystem) -> None:
+    for i in range(20):
+        fs.create_file(f"dir2/sub{i}/file.txt")
+    scanner = TreeScanner(4, signature, on_progress=monit_path.report_progress, progress_interval=0)
+    with mock.patch.object(monit_path, "scanner", return_value=scanner):
+        entries = monit_path.scan()
+    assert entries == TreeScanner(1, signature).scan(fs.root.path)
+    assert sorted(entries)[:3] == ["/dir1/file1.txt", "/dir1/file2.txt", "/dir1/file3.txt"]
+    assert len(entries) == 23
+    monit_path.monitor.refresh_from_db()
+    assert monit_path.monitor.result["progress"]["files"] == 23
+
+
+def test_agent_fs_unreadable_dir(monit_path: AgentFileSystem, fs: FakeFilesystem) -> None:
+    from bitcaster.agents import scan
+
+    monit_path.initialize()
+    scandir = scan.os.scandir
+
+    def unreadable(path: str) -> Any:
+        if path == "/dir1":
+            raise PermissionError(path)
+        return scandir(path)
+
+    with mock.patch.object(scan.os, "scandir", side_effect=unreadable):
+        with mock.patch("bitcaster.models.event.Event.trigger") as notify:
+            monit_path.check()
+            assert not notify.called
+        assert not monit_path.changes_detected()
+        assert list(monit_path.entries()) == ["/dir1/file1.txt", "/dir1/file2.txt", "/dir1/file3.txt"]
+
+
 def test_agent_validate_config(monit_file: AgentFileSystem, fs: FakeFilesystem, settings: "SettingsWrapper") -> None:
     settings.AGENT_FILESYSTEM_VALIDATOR = lambda s: 1 / 0
     agent: AgentFileSystem = AgentFileSystem(
@@ -0,0 +1,85 @@
+from pathlib import Path
+from unittest import mock
+
+import pytest
+from strategy_field.utils import fqn
+from testutils.factories import MonitorFactory
+
+from bitcaster.agents.fs import AgentFileSystem
+from bitcaster.agents.inotify import is_supported
+from bitcaster.agents.watch import FileSystemWatcher
+from bitcaster.models import Event, Monitor
+
+pytestmark = pytest.mark.skipif(not is_supported(), reason="inotify not available")
+
+
+@pytest.fixture()
+def monitor(event: "Event", tmp_path: Path) -> Monitor:
+    (tmp_path / "dir1").mkdir()
+    (tmp_path / "dir1" / "file1.txt").write_text("1")
+    monitor = MonitorFactory(
+        agent=fqn(AgentFileSystem),
+        event=event,
+        config={"recursive": True, "path": str(tmp_path), "add": True, "delete": True, "change": True},
+        data={},
+    )
+    monitor.agent.initialize()
+    return monitor
+
+
+def collect(watcher: FileSystemWatcher) -> None:
+    for __ in range(3):
+        watcher.dispatch(watcher.inotify.read(timeout=0.2))
+
+
+def test_watcher(monitor: Monitor, tmp_path: Path) -> None:
+    watcher = FileSystemWatcher(flush_interval=0)
+    watcher.sync([monitor])
+
+    (tmp_path / "dir1" / "file1.txt").write_text("changed")
+    (tmp_path / "dir2" / "sub").mkdir(parents=True)
+    collect(watcher)
+    # new directories are watched as soon as they are created
+    (tmp_path / "dir2" / "sub" / "new.txt").write_text("new")
+    collect(watcher)
+    with mock.patch("bitcaster.models.event.Event.trigger") as notify:
+        watcher.flush()
+        assert notify.called
+    assert monitor.data["diff"]["changed"] == [str(tmp_path / "dir1" / "file1.txt")]
+    assert monitor.data["diff"]["added"] == [str(tmp_path / "dir2" / "sub" / "new.txt")]
+
+    (tmp_path / "dir1" / "file1.txt").unlink()
+    collect(watcher)
+    watcher.flush()
+    assert monitor.data["diff"]["deleted"] == [str(tmp_path / "dir1" / "file1.txt")]
+
+    watcher.sync([])
+    assert not watcher.watches
+    watcher.inotify.close()
+
+
+def test_watcher_reload_state(monitor: Monitor, tmp_path: Path) -> None:
+    watcher = FileSystemWatcher(flush_interval=0)
+    watcher.sync([monitor])
+    (tmp_path / "new.txt").write_text("new")
+    # the scheduled reconciliation scan stores the change first
+    with mock.patch("bitcaster.models.event.Event.trigger"):
+        Monitor.objects.get(pk=monitor.pk).agent.check()
+        collect(watcher)
+        watcher.flush()
+    assert monitor.data["diff"]["added"] == []
+    assert str(tmp_path / "new.txt") in monitor.agent.entries()
+    watcher.inotify.close()
+
+
+def test_watcher_overflow(monitor: Monitor, tmp_path: Path) -> None:
+    from bitcaster.agents.inotify import IN_Q_OVERFLOW, InotifyEvent
+
+    watcher = FileSystemWatcher(flush_interval=0)
+    watcher.sync([monitor])
+    (tmp_path / "file.txt").write_text("1")
+    watcher.dispatch([InotifyEvent(-1, IN_Q_OVERFLOW, 0, "")])
+    with mock.patch.object(monitor.agent, "check") as check:
+        watcher.flush()
+        assert check.called
+    watcher.inotify.close()
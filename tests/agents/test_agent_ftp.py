@@ -1,20 +1,21 @@
 import time
 from pathlib import Path
 from unittest import mock
-from unittest.mock import Mock
 
 import pytest
 from pytest_localftpserver.servers import PytestLocalFTPServer
+from strategy_field.utils import fqn
+from testutils.factories import MonitorFactory
 
-from bitcaster.agents.ftp import AgentFTP
-from bitcaster.models import Event, Monitor
+from bitcaster.agents.ftp import AgentFTP, SessionPool, sessions
+from bitcaster.models import Event
 
 
 @pytest.fixture()
 def agent(event: "Event", server: PytestLocalFTPServer) -> AgentFTP:
     return AgentFTP(
-        Mock(
-            spec=Monitor,
+        MonitorFactory(
+            agent=fqn(AgentFTP),
             event=event,
             config={
                 "path": "/",
@@ -30,6 +31,11 @@ def agent(event: "Event", server: PytestLocalFTPServer) -> AgentFTP:
     )
 
 
+@pytest.fixture(autouse=True)
+def clear_sessions() -> None:
+    sessions.close_all()
+
+
 @pytest.fixture()
 def server(ftpserver: PytestLocalFTPServer) -> PytestLocalFTPServer:
     ftpserver.reset_tmp_dirs()
@@ -40,7 +46,17 @@ def server(ftpserver: PytestLocalFTPServer) -> PytestLocalFTPServer:
 
 
 def test_agent_ftp_config(agent: AgentFTP) -> None:
-    assert list(agent.config.keys()) == ["server", "path", "username", "password", "add", "change", "delete"]
+    assert list(agent.config.keys()) == [
+        "server",
+        "path",
+        "username",
+        "password",
+        "add",
+        "change",
+        "delete",
+        "recursive",
+        "max_depth",
+    ]
 
 
 def test_agent_ftp_check(agent: AgentFTP, server: PytestLocalFTPServer) -> None:
@@ -69,3 +85,34 @@ def test_agent_ftp_check(agent: AgentFTP, server: PytestLocalFTPServer) -> None:
         agent.check()
         assert notify.called
     assert sorted(agent.monitor.data["diff"]["deleted"]) == ["file1.txt", "file2.txt", "file3.txt", "file4.txt"]
+
+
+def test_agent_ftp_session_reused(agent: AgentFTP, server: PytestLocalFTPServer) -> None:
+    with mock.patch.object(SessionPool, "connect", wraps=sessions.connect) as connect:
+        agent.check()
+        agent.check()
+        assert connect.call_count == 1
+        # dead sessions are replaced
+        sessions.sessions[agent.monitor.pk].ftp.sock.close()
+        agent.check()
+        assert connect.call_count == 2
+    sessions.close_all()
+    assert not sessions.sessions
+
+
+def test_agent_ftp_recursive(agent: AgentFTP, server: PytestLocalFTPServer) -> None:
+    base = Path(server.get_local_base_path())
+    (base / "sub" / "deep").mkdir(parents=True)
+    (base / "sub" / "file5.txt").write_text("5")
+    (base / "sub" / "deep" / "file6.txt").write_text("6")
+    agent.monitor.config.update(recursive=True, max_depth=1)
+    assert sorted(agent.scan()) == ["file1.txt", "file2.txt", "file3.txt", "sub/deep", "sub/file5.txt"]
+    agent.monitor.config.update(max_depth=None)
+    assert sorted(agent.scan())[-2:] == ["sub/deep/file6.txt", "sub/file5.txt"]
+
+
+def test_agent_ftp_compare_facts(agent: AgentFTP, server: PytestLocalFTPServer) -> None:
+    agent.check()
+    (Path(server.get_local_base_path()) / "file1.txt").chmod(0o600)
+    agent.check()
+    assert not agent.changes_detected()
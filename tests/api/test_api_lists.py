@@ -1,4 +1,5 @@
 import json
+import re
 from typing import Any, NamedTuple
 
 import factory
@@ -75,7 +76,7 @@ def data(admin_user: "User", system_objects: Any) -> SampleData:
     # ch = ChannelFactory(project=event.application.project)
     role: "UserRole" = UserRoleFactory(organization__name=org_name)
     address: "Address" = AddressFactory(user=role.user, value=role.user.email)
-    asm: "Assignment" = AssignmentFactory(address=address)
+    asm: "Assignment" = AssignmentFactory(address=address, channel__project=event.application.project)
 
     distribution_list = DistributionListFactory(project=event.application.project, recipients=[asm])
     return SampleData(
@@ -129,3 +130,99 @@ def test_distribution_add_recipient_error(client: APIClient, data: SampleData) -
     with key_grants(data.key, [Grant.DISTRIBUTION_LIST], project=data.prj, organization=data.org):
         res = client.post(url, json.dumps(["not-existent"]), format="json")
     assert res.status_code == 400
+
+
+def bulk_results(res: Any) -> list[dict[str, Any]]:
+    return [json.loads(line) for line in b"".join(res.streaming_content).splitlines()]
+
+
+@pytest.mark.parametrize(
+    "content_type, body",
+    [
+        ("application/x-ndjson", '"{addr}"\n{{"address": "{addr2}"}}\n"missing@example.com"\n[1]\n'),
+        ("text/csv", "address\n{addr}\n{addr2},ignored\nmissing@example.com\n"),
+    ],
+)
+def test_distribution_import(client: APIClient, data: SampleData, content_type: str, body: str) -> None:
+    asm2: "Assignment" = AssignmentFactory(channel__project=data.prj)
+    url = f"/api/o/{data.org.slug}/p/{data.prj.slug}/d/{data.dl.pk}/import/"
+    payload = body.format(addr=data.asm.address.value, addr2=asm2.address.value)
+    with key_grants(data.key, [Grant.DISTRIBUTION_LIST], project=data.prj, organization=data.org):
+        res = client.post(url, payload, content_type=content_type)
+    assert res.status_code == 200
+    assert [r["status"] for r in bulk_results(res)][:3] == ["unchanged", "added", "not_found"]
+    assert set(data.dl.recipients.all()) == {data.asm, asm2}
+
+
+def test_distribution_import_invalid(client: APIClient, data: SampleData) -> None:
+    url = f"/api/o/{data.org.slug}/p/{data.prj.slug}/d/{data.dl.pk}/import/"
+    with key_grants(data.key, [Grant.DISTRIBUTION_LIST], project=data.prj, organization=data.org):
+        res = client.post(url, "not json\n", content_type="application/x-ndjson")
+        assert bulk_results(res) == [{"row": 1, "address": None, "status": "invalid"}]
+        res = client.post(url, "{}", content_type="application/json")
+        assert res.status_code == 415
+
+
+def test_distribution_remove(client: APIClient, data: SampleData) -> None:
+    url = f"/api/o/{data.org.slug}/p/{data.prj.slug}/d/{data.dl.pk}/remove/"
+    with key_grants(data.key, [Grant.DISTRIBUTION_LIST], project=data.prj, organization=data.org):
+        res = client.post(url, f"{data.asm.address.value}\n", content_type="text/csv")
+    assert bulk_results(res) == [{"row": 1, "address": data.asm.address.value, "status": "removed", "assignments": 1}]
+    assert not data.dl.recipients.exists()
+
+
+def test_bulk_members_chunks(data: SampleData) -> None:
+    from bitcaster.api.distribution_list import bulk_members
+
+    asms = [AssignmentFactory(channel__project=data.prj) for __ in range(5)]
+    rows = [(n, a.address.value) for n, a in enumerate(asms, 1)]
+    results = list(bulk_members(data.dl, iter(rows), chunk_size=2))
+    assert [r["status"] for r in results] == ["added"] * 5
+    assert data.dl.recipients.count() == 6
+
+
+def test_bulk_members_scope(data: SampleData) -> None:
+    from bitcaster.api.distribution_list import bulk_members
+
+    other_org = AssignmentFactory()
+    other_prj = AssignmentFactory(channel__project__organization=data.org)
+    rows = [(1, other_org.address.value), (2, other_prj.address.value)]
+    assert [r["status"] for r in bulk_members(data.dl, iter(rows))] == ["not_found", "not_found"]
+    assert list(data.dl.recipients.all()) == [data.asm]
+
+
+def next_link(res: Any) -> str:
+    m = re.search(r'<([^>]+)>; rel="next"', res.headers.get("Link", ""))
+    return m.group(1) if m else ""
+
+
+def test_distribution_members_pagination(
+    client: APIClient, data: SampleData, django_assert_max_num_queries: Any
+) -> None:
+    data.dl.recipients.add(*[AssignmentFactory() for __ in range(4)])
+    url = f"/api/o/{data.org.slug}/p/{data.prj.slug}/d/{data.dl.pk}/m/?page_size=2"
+    seen = []
+    with key_grants(data.key, [Grant.DISTRIBUTION_LIST], project=data.prj, organization=data.org):
+        while url:
+            with django_assert_max_num_queries(8):
+                res = client.get(url)
+            assert res.status_code == 200
+            page = res.json()
+            assert len(page) <= 2
+            seen.extend(m["id"] for m in page)
+            assert page[0]["user"]
+            url = next_link(res)
+    assert seen == sorted(data.dl.recipients.values_list("id", flat=True))
+
+
+def test_distribution_members_not_paginated(client: APIClient, data: SampleData, monkeypatch: Any) -> None:
+    from bitcaster.api.pagination import KeysetPagination
+
+    monkeypatch.setattr(KeysetPagination, "page_size", 2)
+    data.dl.recipients.add(*[AssignmentFactory() for __ in range(4)])
+    url = f"/api/o/{data.org.slug}/p/{data.prj.slug}/d/{data.dl.pk}/m/"
+    with key_grants(data.key, [Grant.DISTRIBUTION_LIST], project=data.prj, organization=data.org):
+        res = client.get(url)
+    assert res.status_code == 200
+    assert len(res.json()) == 5
+    assert "Link" not in res.headers
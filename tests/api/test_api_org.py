@@ -175,3 +175,24 @@ def test_user_addresses_add_invalid(client: APIClient, data: SampleData) -> None
     url = f"/api/o/{data.org.slug}/u/{data.user.username}/address/"
     res = client.post(url, {"value": "", "type": "email", "name": "private email"})
     assert res.status_code == 400
+
+
+def test_user_bulk(client: APIClient, data: SampleData) -> None:
+    url = f"/api/o/{data.org.slug}/u/bulk/"
+    payload = [
+        {"email": data.user.email, "first_name": "updated"},
+        {"email": "new@example.com", "addresses": [{"name": "mobile", "value": "+391234567890"}]},
+        {"email": "not-an-email"},
+    ]
+    with key_grants(client._key, [Grant.USER_READ, Grant.USER_WRITE], organization=data.org):
+        res = client.post(url, payload, format="json")
+    assert res.status_code == 200, res.json()
+    assert res.json() == {
+        "users": 2,
+        "addresses": 2,
+        "assignments": 0,
+        "errors": [{"row": 3, "error": "Invalid or missing email"}],
+    }
+    data.user.refresh_from_db()
+    assert data.user.first_name == "updated"
+    assert data.org.users.filter(username="new@example.com").exists()
@@ -1,5 +1,4 @@
 import uuid
-
 from typing import TYPE_CHECKING, Any, TypedDict
 from unittest.mock import Mock
 
@@ -287,6 +286,22 @@ def test_trigger_limit_to_with_wrong_receiver(
     assert Occurrence.objects.system(event__name=SystemEvent.OCCURRENCE_SILENCE.value).count() == 1
 
 
+def test_trigger_priority(client: APIClient, data: "Context") -> None:
+    from bitcaster.models import Event, Occurrence
+
+    api_key = data["key"]
+    url: str = data["url"]
+    client.credentials(HTTP_AUTHORIZATION=f"Key {api_key.key}")
+    with key_grants(api_key, Grant.EVENT_TRIGGER):
+        res = client.post(url, data={"context": {}, "options": {"priority": 9}}, format="json")
+        assert res.status_code == status.HTTP_201_CREATED, res.json()
+        o: "Occurrence" = Occurrence.objects.get(pk=res.data["occurrence"])
+        assert o.priority == Event.Priority.LOW
+
+        res = client.post(url, data={"context": {}, "options": {"priority": 3}}, format="json")
+        assert res.status_code == status.HTTP_400_BAD_REQUEST, res.json()
+
+
 # Environment
 
 
@@ -0,0 +1,86 @@
+from typing import TYPE_CHECKING, Any, Callable, Generator
+
+import pytest
+from testutils.benchmark import BenchmarkReport, StandInHTTPServer, StandInSMTPServer
+
+if TYPE_CHECKING:
+    from bitcaster.models import Occurrence
+
+
+@pytest.fixture(autouse=True)
+def benchmark_enabled(request: pytest.FixtureRequest) -> None:
+    if not request.config.option.enable_benchmark:
+        pytest.skip("Benchmarks are disabled. Use --with-benchmark to run them")
+
+
+@pytest.fixture(scope="session")
+def benchmark_report(request: pytest.FixtureRequest) -> Generator[BenchmarkReport, None, None]:
+    report = BenchmarkReport("delivery")
+    yield report
+    if report.results:
+        target = report.write()
+        reporter = request.config.pluginmanager.get_plugin("terminalreporter")
+        if reporter:
+            reporter.write_sep("-", "delivery benchmarks")
+            for line in report.summary():
+                reporter.write_line(line)
+            reporter.write_line(f"report saved to {target}")
+
+
+@pytest.fixture(scope="session")
+def smtp_server() -> Generator[StandInSMTPServer, None, None]:
+    server = StandInSMTPServer().start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def slack_server() -> Generator[StandInHTTPServer, None, None]:
+    server = StandInHTTPServer(status=200).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture(scope="session")
+def push_server() -> Generator[StandInHTTPServer, None, None]:
+    server = StandInHTTPServer(status=201).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture()
+def seed_occurrence(system_objects: None) -> Callable[..., "Occurrence"]:
+    """Build an active event with one channel, a notification and a distribution list of `size` recipients."""
+    from testutils.factories import (
+        AddressFactory,
+        AssignmentFactory,
+        ChannelFactory,
+        DistributionListFactory,
+        EventFactory,
+        MessageFactory,
+        NotificationFactory,
+        OccurrenceFactory,
+    )
+
+    def _seed(
+        dispatcher: str, config: dict[str, Any], size: int, address: Callable[[int], str], data: Any = None
+    ) -> "Occurrence":
+        channel = ChannelFactory(dispatcher=dispatcher, config=config)
+        event = EventFactory(application__project=channel.project, channels=[channel], active=True)
+        MessageFactory(
+            channel=channel,
+            event=event,
+            subject="Benchmark {{event.name}}",
+            content="Message for {{address}} on channel {{channel.name}}",
+        )
+        dl = DistributionListFactory(project=channel.project)
+        dl.recipients.add(
+            *[
+                AssignmentFactory(channel=channel, address=AddressFactory(value=address(n)), data=data or {})
+                for n in range(size)
+            ]
+        )
+        NotificationFactory(event=event, distribution=dl)
+        return OccurrenceFactory(event=event)
+
+    return _seed
@@ -0,0 +1,119 @@
+import json
+import os
+from typing import TYPE_CHECKING, Callable
+
+import pytest
+from pytest import MonkeyPatch
+from responses import RequestsMock
+from strategy_field.utils import fqn
+from testutils.benchmark import (
+    BenchmarkReport,
+    StandInHTTPServer,
+    StandInSMTPServer,
+    measure,
+)
+
+from bitcaster.dispatchers import EmailDispatcher, SlackDispatcher, TwilioSMS
+from bitcaster.dispatchers.base import Dispatcher
+from bitcaster.tasks import process_occurrence
+from bitcaster.webpush.dispatcher import WebPushDispatcher
+from bitcaster.webpush.engine import engine
+
+if TYPE_CHECKING:
+    from bitcaster.models import Occurrence
+
+    Seeder = Callable[..., Occurrence]
+
+pytestmark = [pytest.mark.benchmark, pytest.mark.django_db]
+
+SIZES = [int(s) for s in os.environ.get("BENCHMARK_SIZES", "10,100").split(",")]
+# upper bound of SQL queries per recipient; raise it only with a good reason
+MAX_QUERIES_PER_RECIPIENT = float(os.environ.get("BENCHMARK_MAX_QUERIES_PER_RECIPIENT", 6))
+
+VAPID_PRIVATE_KEY = "nFUEzMGtnCgQkAsYJ9iQOjWHquTTfrOwyzvZeUiChgc"
+VAPID_CLAIMS = json.dumps({"sub": "mailto:benchmark@example.com"})
+SUBSCRIPTION_KEYS = {
+    "auth": "mp1NVQZ7lk8l991jv_IaZg",
+    "p256dh": "BF2k3PvW7s7wHlR9jvTD5vOvE4y8xaWHp73lpIE6u9dUXD0Y1J6_fKEMW69rlvmAx--7hNMbWQ149w2g3xP8QCg",
+}
+
+
+def run(
+    name: str, o: "Occurrence", size: int, dispatcher: type[Dispatcher], report: BenchmarkReport, mp: MonkeyPatch
+) -> None:
+    with measure(f"{name}[{size}]", size, dispatcher, mp) as stats:
+        recipients = process_occurrence(o.pk)
+    stats.delivered = recipients
+    report.add(stats)
+    assert recipients == size
+    assert stats.queries_per_recipient <= MAX_QUERIES_PER_RECIPIENT
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_email(
+    seed_occurrence: "Seeder",
+    smtp_server: StandInSMTPServer,
+    benchmark_report: BenchmarkReport,
+    monkeypatch: MonkeyPatch,
+    size: int,
+) -> None:
+    config = {"host": smtp_server.host, "port": smtp_server.port, "username": "user", "password": "pwd"}
+    o = seed_occurrence(fqn(EmailDispatcher), config, size, lambda n: f"bench-{n}@example.com")
+    smtp_server.received.clear()
+    run("email", o, size, EmailDispatcher, benchmark_report, monkeypatch)
+    assert len(smtp_server.received) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_slack(
+    seed_occurrence: "Seeder",
+    slack_server: StandInHTTPServer,
+    benchmark_report: BenchmarkReport,
+    monkeypatch: MonkeyPatch,
+    size: int,
+) -> None:
+    o = seed_occurrence(fqn(SlackDispatcher), {"url": f"{slack_server.url}/hook"}, size, lambda n: f"bench-{n}")
+    slack_server.received.clear()
+    run("slack", o, size, SlackDispatcher, benchmark_report, monkeypatch)
+    assert len(slack_server.received) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_sms(
+    seed_occurrence: "Seeder",
+    mocked_responses: RequestsMock,
+    benchmark_report: BenchmarkReport,
+    monkeypatch: MonkeyPatch,
+    size: int,
+) -> None:
+    # twilio does not allow to change the API host, so the stand-in is served in-process
+    mocked_responses.add(
+        mocked_responses.POST,
+        "https://api.twilio.com/2010-04-01/Accounts/sid/Messages.json",
+        json={"sid": "SM00000000000000000000000000000000", "status": "queued"},
+        status=201,
+    )
+    config = {"sid": "sid", "token": "token", "number": "+15550000000"}
+    o = seed_occurrence(fqn(TwilioSMS), config, size, lambda n: f"+1555{n:07d}")
+    run("sms", o, size, TwilioSMS, benchmark_report, monkeypatch)
+    assert len(mocked_responses.calls) == size
+
+
+@pytest.mark.parametrize("size", SIZES)
+def test_webpush(
+    seed_occurrence: "Seeder",
+    push_server: StandInHTTPServer,
+    benchmark_report: BenchmarkReport,
+    monkeypatch: MonkeyPatch,
+    size: int,
+) -> None:
+    # with claims, each message is sent with VAPID headers
+    config = {"APPLICATION_SERVER_KEY": "aa", "private_key": VAPID_PRIVATE_KEY, "CLAIMS": VAPID_CLAIMS}
+    data = {"webpush": {"subscription": {"endpoint": f"{push_server.url}/push", "keys": SUBSCRIPTION_KEYS}}}
+    o = seed_occurrence(fqn(WebPushDispatcher), config, size, lambda n: f"bench-{n}", data=data)
+    push_server.received.clear()
+    # measure also the key parsing and the first signature
+    monkeypatch.setattr(engine, "_keys", {})
+    monkeypatch.setattr(engine, "_signatures", {})
+    run("webpush", o, size, WebPushDispatcher, benchmark_report, monkeypatch)
+    assert len(push_server.received) == size
@@ -32,6 +32,14 @@ def pytest_addoption(parser) -> None:
         help="enable selenium tests",
     )
 
+    parser.addoption(
+        "--with-benchmark",
+        action="store_true",
+        dest="enable_benchmark",
+        default=False,
+        help="enable delivery benchmarks",
+    )
+
     parser.addoption(
         "--show-browser",
         "-S",
@@ -104,6 +112,9 @@ def pytest_configure(config):
     if not config.option.enable_selenium:
         config.option.enable_selenium = "selenium" in config.option.markexpr
 
+    if not config.option.enable_benchmark:
+        config.option.enable_benchmark = "benchmark" in config.option.markexpr
+
     config.addinivalue_line("markers", "skip_test_if_env(env): this mark skips the tests for the given env")
     from django.conf import settings
 
@@ -144,12 +155,15 @@ def system_objects(admin_user: "User") -> None:
 
 @pytest.fixture(autouse=True)
 def clear_state(db):
+    from bitcaster.cache.config import config_cache
     from bitcaster.state import state
 
     try:
         del state.app
     except AttributeError:
         pass
+    # cached configuration objects do not survive the test transaction rollback
+    config_cache().clear()
 
 
 @pytest.fixture()
@@ -17,3 +17,28 @@ def test_twilio_send(mail_payload: Payload, mocked_responses: RequestsMock, twil
     )
 
     assert SlackDispatcher(ch).send("123456", mail_payload)
+
+
+def test_slack_batch(mail_payload: Payload, mocked_responses: RequestsMock) -> None:
+    from testutils.factories import ChannelFactory
+
+    rsp = mocked_responses.add(mocked_responses.POST, "http://test-slack.com/abdce/", json={"ok": True})
+    ch = ChannelFactory(dispatcher=fqn(SlackDispatcher), config={"url": "http://test-slack.com/abdce/"})
+
+    with SlackDispatcher(ch) as dispatcher:
+        assert dispatcher.send("user1", mail_payload)
+        assert dispatcher.send("user2", mail_payload)
+        assert dispatcher.send("user3", Payload("other", event=mail_payload.event))
+    assert rsp.call_count == 2
+
+    assert SlackDispatcher(ch).send("user1", mail_payload)
+    assert rsp.call_count == 3
+
+
+def test_slack_error(mail_payload: Payload, mocked_responses: RequestsMock) -> None:
+    from bitcaster.exceptions import DispatcherError
+
+    mocked_responses.add(mocked_responses.POST, "http://test-slack.com/abdce/", body=ConnectionError())
+    ch = Channel(dispatcher=fqn(SlackDispatcher), config={"url": "http://test-slack.com/abdce/"})
+    with pytest.raises(DispatcherError):
+        SlackDispatcher(ch).send("123456", mail_payload)
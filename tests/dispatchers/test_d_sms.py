@@ -1,3 +1,4 @@
+from collections import OrderedDict
 from typing import TYPE_CHECKING, Any
 from unittest import mock
 from unittest.mock import Mock
@@ -35,3 +36,59 @@ def test_twilio_send(mail_payload: "Payload", smsoutbox: list[Any], twilio_sid:
     )
 
     assert TwilioSMS(ch).send("123456", mail_payload)
+
+
+def test_twilio_client_reuse(mail_payload: "Payload", smsoutbox: list[Any], twilio_sid: str) -> None:
+    from testutils.factories import ChannelFactory
+
+    ch = ChannelFactory(
+        dispatcher=fqn(TwilioSMS),
+        config={"sid": twilio_sid, "token": "__token__", "number": "123456"},
+    )
+    __, client = TwilioSMS(ch).get_client()
+    assert TwilioSMS(ch).send("123456", mail_payload)
+    assert TwilioSMS(ch).send("654321", mail_payload)
+    assert TwilioSMS(ch).get_client()[1] is client
+    assert [sms["To"] for sms in smsoutbox] == ["123456", "654321"]
+
+    ch.config["number"] = "999999"
+    ch.save()
+    config, new_client = TwilioSMS(ch).get_client()
+    assert new_client is not client
+    assert config["number"] == "999999"
+
+
+def test_twilio_client_lru(monkeypatch: "MonkeyPatch", twilio_sid: str) -> None:
+    from testutils.factories import ChannelFactory
+
+    monkeypatch.setattr("bitcaster.dispatchers.twilio.MAX_CLIENTS", 2)
+    monkeypatch.setattr("bitcaster.dispatchers.twilio._clients", clients := OrderedDict())
+    ch1, ch2, ch3 = [
+        ChannelFactory(dispatcher=fqn(TwilioSMS), config={"sid": twilio_sid, "token": "__token__", "number": "1"})
+        for __ in range(3)
+    ]
+    __, client = TwilioSMS(ch1).get_client()
+    TwilioSMS(ch2).get_client()
+    TwilioSMS(ch1).get_client()
+    TwilioSMS(ch3).get_client()
+
+    assert list(clients) == [ch1.pk, ch3.pk]
+    assert clients[ch1.pk][2] is client
+
+
+def test_twilio_messaging_service(mail_payload: "Payload", smsoutbox: list[Any], twilio_sid: str) -> None:
+    ch = Channel(
+        dispatcher=fqn(TwilioSMS),
+        config={"sid": twilio_sid, "token": "__token__", "messaging_service_sid": "MG123"},
+    )
+
+    assert TwilioSMS(ch).send("123456", mail_payload)
+    assert smsoutbox[0]["MessagingServiceSid"] == "MG123"
+    assert "From" not in smsoutbox[0]
+
+
+def test_twilio_config() -> None:
+    from bitcaster.dispatchers.twilio import TwilioConfig
+
+    assert not TwilioConfig(data={"sid": "sid", "token": "token"}).is_valid()
+    assert TwilioConfig(data={"sid": "sid", "token": "token", "number": "123"}).is_valid()
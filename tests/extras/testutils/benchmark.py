@@ -0,0 +1,197 @@
+"""Stand-in providers and measurement helpers for the delivery benchmarks.
+
+The stand-ins accept deliveries on localhost, so the benchmarks exercise the real dispatchers
+(connection handling, payload encoding, retries) without reaching any external service.
+"""
+
+import json
+import os
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Callable, Generator, Optional
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+if TYPE_CHECKING:
+    from pytest import MonkeyPatch
+
+    from bitcaster.dispatchers.base import Dispatcher
+
+REPORT_DIR = Path(os.environ.get("BENCHMARK_REPORT_DIR", "~build/benchmarks"))
+
+
+class StandInHTTPServer(ThreadingHTTPServer):
+    """Threaded HTTP server that accepts every POST and replies with a fixed status/body."""
+
+    daemon_threads = True
+
+    def __init__(self, status: int = 200, body: str = "ok") -> None:
+        self.status = status
+        self.body = body.encode()
+        self.received: list[tuple[str, bytes]] = []
+        self._lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), _StandInHandler)
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "StandInHTTPServer":
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+    def record(self, path: str, payload: bytes) -> None:
+        with self._lock:
+            self.received.append((path, payload))
+
+
+class _StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInHTTPServer
+
+    def do_POST(self) -> None:  # noqa: N802
+        payload = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.server.record(self.path, payload)
+        self.send_response(self.server.status)
+        self.send_header("Content-Type", "text/plain")
+        self.send_header("Content-Length", str(len(self.server.body)))
+        self.end_headers()
+        self.wfile.write(self.server.body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class StandInSMTPServer:
+    """Local SMTP server (aiosmtpd) that accepts any credential and stores the envelopes."""
+
+    def __init__(self) -> None:
+        from aiosmtpd.controller import Controller
+        from aiosmtpd.smtp import AuthResult
+
+        self.received: list[Any] = []
+        self.controller = Controller(
+            self,
+            hostname="127.0.0.1",
+            port=0,
+            auth_require_tls=False,
+            authenticator=lambda *args: AuthResult(success=True),
+        )
+
+    async def handle_DATA(self, server: Any, session: Any, envelope: Any) -> str:  # noqa: N802
+        self.received.append(envelope)
+        return "250 OK"
+
+    @property
+    def host(self) -> str:
+        return self.controller.hostname
+
+    @property
+    def port(self) -> int:
+        return self.controller.server.sockets[0].getsockname()[1]
+
+    def start(self) -> "StandInSMTPServer":
+        self.controller.start()
+        return self
+
+    def stop(self) -> None:
+        self.controller.stop()
+
+
+def percentile(values: list[float], pct: int) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[pct - 1]
+
+
+@dataclass
+class DeliveryStats:
+    name: str
+    recipients: int
+    delivered: int = 0
+    elapsed: float = 0.0
+    queries: int = 0
+    latencies: list[float] = field(default_factory=list, repr=False)
+
+    @property
+    def msgs_per_sec(self) -> float:
+        return self.delivered / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def queries_per_recipient(self) -> float:
+        return self.queries / self.recipients if self.recipients else 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        ret = asdict(self)
+        ret.pop("latencies")
+        ret.update(
+            msgs_per_sec=round(self.msgs_per_sec, 2),
+            queries_per_recipient=round(self.queries_per_recipient, 3),
+            p50_ms=round(percentile(self.latencies, 50) * 1000, 3),
+            p99_ms=round(percentile(self.latencies, 99) * 1000, 3),
+        )
+        return ret
+
+
+@contextmanager
+def measure(
+    name: str, recipients: int, dispatcher: "type[Dispatcher]", monkeypatch: "MonkeyPatch"
+) -> Generator[DeliveryStats, None, None]:
+    """Measure wall time, SQL queries and per-message send latency of the enclosed block."""
+    stats = DeliveryStats(name=name, recipients=recipients)
+    original: Callable[..., bool] = dispatcher.send
+
+    def timed_send(self: "Dispatcher", *args: Any, **kwargs: Any) -> bool:
+        start = time.perf_counter()
+        try:
+            return original(self, *args, **kwargs)
+        finally:
+            stats.latencies.append(time.perf_counter() - start)
+
+    monkeypatch.setattr(dispatcher, "send", timed_send)
+    with CaptureQueriesContext(connection) as ctx:
+        start = time.perf_counter()
+        yield stats
+        stats.elapsed = time.perf_counter() - start
+    stats.queries = len(ctx.captured_queries)
+    monkeypatch.setattr(dispatcher, "send", original)
+
+
+class BenchmarkReport:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.results: list[DeliveryStats] = []
+
+    def add(self, stats: DeliveryStats) -> None:
+        self.results.append(stats)
+
+    def write(self, target: Optional[Path] = None) -> Path:
+        target = target or REPORT_DIR / f"{self.name}.json"
+        target.parent.mkdir(parents=True, exist_ok=True)
+        target.write_text(json.dumps([r.as_dict() for r in self.results], indent=2, sort_keys=True))
+        return target
+
+    def summary(self) -> list[str]:
+        lines = [
+            f"{'benchmark':<30} {'recipients':>10} {'msgs/sec':>10} {'q/recipient':>12} {'p50 ms':>9} {'p99 ms':>9}"
+        ]
+        for r in self.results:
+            d = r.as_dict()
+            lines.append(
+                f"{r.name:<30} {r.recipients:>10} {d['msgs_per_sec']:>10} {d['queries_per_recipient']:>12} "
+                f"{d['p50_ms']:>9} {d['p99_ms']:>9}"
+            )
+        return lines
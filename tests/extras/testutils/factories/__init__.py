@@ -5,7 +5,7 @@ from .address import AddressFactory  # noqa
 from .assignment import AssignmentFactory  # noqa
 from .browser import BrowserFactory  # noqa
 from .channel import ChannelFactory  # noqa
-from .distribution import DistributionListFactory  # noqa
+from .distribution import DistributionListFactory, RecipientSnapshotFactory  # noqa
 from .django_auth import GroupFactory, PermissionFactory  # noqa
 from .django_celery_beat import PeriodicTaskFactory  # noqa
 from .event import EventFactory  # noqa
@@ -14,9 +14,9 @@ from .key import ApiKeyFactory  # noqa
 from .log import LogEntryFactory  # noqa
 from .media import MediaFileFactory  # noqa
 from .message import MessageFactory  # noqa
-from .monitor import MonitorFactory  # noqa
+from .monitor import MonitorFactory, MonitorSnapshotFactory  # noqa
 from .notification import NotificationFactory  # noqa
-from .occurrence import OccurrenceFactory  # noqa
+from .occurrence import OccurrenceFactory, OccurrenceRollupFactory  # noqa
 from .org import ApplicationFactory, OrganizationFactory, ProjectFactory  # noqa
 from .social import SocialProviderFactory  # noqa
 from .user import SuperUserFactory, UserFactory  # noqa
@@ -37,13 +37,17 @@ __all__ = [
     "LogEntryFactory",
     "MediaFileFactory",
     "MessageFactory",
+    "MonitorFactory",
+    "MonitorSnapshotFactory",
     "NotificationFactory",
     "OccurrenceFactory",
+    "OccurrenceRollupFactory",
     "OrganizationFactory",
     "PeriodicTaskFactory",
     "PermissionFactory",
     "ProjectFactory",
     "ProjectFactory",
+    "RecipientSnapshotFactory",
     "SocialProviderFactory",
     "SuperUserFactory",
     "UserFactory",
@@ -2,9 +2,10 @@ from typing import TYPE_CHECKING, Any
 
 import factory
 
-from bitcaster.models import DistributionList
+from bitcaster.models import DistributionList, RecipientSnapshot
 
 from .base import AutoRegisterModelFactory
+from .channel import ChannelFactory
 from .org import ProjectFactory
 
 if TYPE_CHECKING:
@@ -27,3 +28,12 @@ class DistributionListFactory(AutoRegisterModelFactory[DistributionList]):
         if extracted:
             for va in extracted:
                 dist.recipients.add(va)
+
+
+class RecipientSnapshotFactory(AutoRegisterModelFactory[RecipientSnapshot]):
+    class Meta:
+        model = RecipientSnapshot
+        django_get_or_create = ("distribution", "channel")
+
+    distribution = factory.SubFactory(DistributionListFactory)
+    channel = factory.SubFactory(ChannelFactory, project=factory.SelfAttribute("..distribution.project"))
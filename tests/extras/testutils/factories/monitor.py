@@ -3,13 +3,13 @@ from factory import Sequence
 from strategy_field.utils import fqn
 from testutils.agent import XAgent
 
-from bitcaster.models import Monitor
+from bitcaster.models import Monitor, MonitorSnapshot
 
 from . import PeriodicTaskFactory
 from .base import AutoRegisterModelFactory
 from .event import EventFactory
 
-__all__ = ["MonitorFactory", "PeriodicTaskFactory"]
+__all__ = ["MonitorFactory", "MonitorSnapshotFactory", "PeriodicTaskFactory"]
 
 
 class MonitorFactory(AutoRegisterModelFactory[Monitor]):
@@ -21,3 +21,13 @@ class MonitorFactory(AutoRegisterModelFactory[Monitor]):
 
     class Meta:
         model = Monitor
+
+
+class MonitorSnapshotFactory(AutoRegisterModelFactory[MonitorSnapshot]):
+    monitor = factory.SubFactory(MonitorFactory)
+    digest = ""
+    content = b""
+
+    class Meta:
+        model = MonitorSnapshot
+        django_get_or_create = ("monitor",)
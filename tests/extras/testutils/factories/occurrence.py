@@ -3,7 +3,7 @@ from typing import Any
 import factory
 from django.utils import timezone
 
-from bitcaster.models import Occurrence
+from bitcaster.models import Occurrence, OccurrenceRollup
 
 from .base import AutoRegisterModelFactory
 from .event import EventFactory
@@ -18,3 +18,14 @@ class OccurrenceFactory(AutoRegisterModelFactory[Occurrence]):
     event = factory.SubFactory(EventFactory)
     status = Occurrence.Status.NEW
     context: dict[str, Any] = {}
+
+
+class OccurrenceRollupFactory(AutoRegisterModelFactory[OccurrenceRollup]):
+    minute = factory.LazyFunction(lambda: timezone.now().replace(second=0, microsecond=0))
+    event = factory.SubFactory(EventFactory)
+    status = Occurrence.Status.NEW
+    count = 1
+
+    class Meta:
+        model = OccurrenceRollup
+        django_get_or_create = ("event", "minute", "status")
@@ -0,0 +1,78 @@
+"""Query-count budgets for hot code paths.
+
+A :class:`QueryBudget` records the SQL queries an operation executes at different data sizes and
+checks that the count does not grow with the size (O(1) per batch).
+Each budget is saved as a small JSON file with the query count per size and the normalized
+statements of the largest run, so reports of two releases can be compared with a plain diff.
+"""
+
+import json
+import os
+import re
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Generator
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+REPORT_DIR = Path(os.environ.get("QUERY_BUDGET_REPORT_DIR", "~build/query-budget"))
+
+RE_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+RE_IN_LIST = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+RE_SAVEPOINT = re.compile(r"\"s\d+_x\d+\"")
+
+
+def fingerprint(sql: str) -> str:
+    """Strip literals from `sql` so that statements differing only by values are counted together."""
+    sql = RE_LITERALS.sub("?", sql)
+    sql = RE_IN_LIST.sub("(...)", sql)
+    return RE_SAVEPOINT.sub("<savepoint>", sql)
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+class QueryBudget:
+    def __init__(self, operation: str, tolerance: int = 0) -> None:
+        self.operation = operation
+        self.tolerance = tolerance
+        self.counts: dict[int, int] = {}
+        self.statements: dict[int, Counter[str]] = {}
+
+    @contextmanager
+    def record(self, size: int) -> Generator[CaptureQueriesContext, None, None]:
+        with CaptureQueriesContext(connection) as ctx:
+            yield ctx
+        self.counts[size] = len(ctx.captured_queries)
+        self.statements[size] = Counter(fingerprint(q["sql"]) for q in ctx.captured_queries)
+
+    def as_dict(self) -> dict[str, Any]:
+        largest = max(self.counts) if self.counts else 0
+        return {
+            "operation": self.operation,
+            "queries": {str(size): count for size, count in sorted(self.counts.items())},
+            "statements": dict(sorted(self.statements.get(largest, Counter()).items())),
+        }
+
+    def write(self) -> Path:
+        REPORT_DIR.mkdir(parents=True, exist_ok=True)
+        target = REPORT_DIR / f"{self.operation}.json"
+        target.write_text(json.dumps(self.as_dict(), indent=2, sort_keys=True) + "\n")
+        return target
+
+    def check(self) -> None:
+        """Raise QueryBudgetExceeded if the number of queries depends on the data size."""
+        self.write()
+        if not self.counts:
+            return
+        smallest, largest = min(self.counts), max(self.counts)
+        if self.counts[largest] - self.counts[smallest] > self.tolerance:
+            growing = self.statements[largest] - self.statements[smallest]
+            details = "\n".join(f"  {count:>6} x {sql}" for sql, count in growing.most_common(5))
+            raise QueryBudgetExceeded(
+                f"{self.operation}: {self.counts[smallest]} queries with {smallest} rows, "
+                f"{self.counts[largest]} with {largest} rows\n{details}"
+            )
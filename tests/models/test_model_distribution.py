@@ -0,0 +1,98 @@
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+if TYPE_CHECKING:
+    from bitcaster.models import Assignment, Channel, DistributionList
+
+    Setup = tuple[DistributionList, Channel, list[Assignment]]
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture()
+def setup(db: Any) -> "Setup":
+    from testutils.factories import (
+        AssignmentFactory,
+        ChannelFactory,
+        DistributionListFactory,
+    )
+
+    dl: "DistributionList" = DistributionListFactory()
+    ch: "Channel" = ChannelFactory(project=dl.project)
+    asms = [AssignmentFactory(channel=ch, validated=n % 2 == 0) for n in range(4)]
+    dl.recipients.add(*asms[:3])
+    return dl, ch, asms
+
+
+def snapshot(dl: "DistributionList", ch: "Channel") -> tuple[list[int], list[int], int]:
+    from bitcaster.models import RecipientSnapshot
+
+    s = RecipientSnapshot.objects.get_for(dl, ch)
+    return s.recipients, s.validated, s.revision
+
+
+def test_get_for(setup: "Setup") -> None:
+    from bitcaster.models import RecipientSnapshot
+
+    dl, ch, asms = setup
+    assert snapshot(dl, ch) == ([asms[0].pk, asms[1].pk, asms[2].pk], [asms[0].pk, asms[2].pk], 1)
+    assert RecipientSnapshot.objects.filter(distribution=dl).count() == 1
+
+
+def test_sync_add_remove(setup: "Setup") -> None:
+    dl, ch, asms = setup
+    snapshot(dl, ch)
+    dl.recipients.add(asms[3])
+    assert snapshot(dl, ch)[0] == [a.pk for a in asms]
+    dl.recipients.remove(asms[0], asms[1])
+    assert snapshot(dl, ch) == ([asms[2].pk, asms[3].pk], [asms[2].pk], 3)
+    asms[2].distributionlist_set.remove(dl)
+    assert snapshot(dl, ch)[0] == [asms[3].pk]
+
+
+def test_sync_clear(setup: "Setup") -> None:
+    dl, ch, asms = setup
+    snapshot(dl, ch)
+    dl.recipients.clear()
+    assert snapshot(dl, ch)[:2] == ([], [])
+
+
+def test_sync_flags(setup: "Setup") -> None:
+    dl, ch, asms = setup
+    snapshot(dl, ch)
+    asms[0].active = False
+    asms[0].save()
+    assert snapshot(dl, ch)[:2] == ([asms[1].pk, asms[2].pk], [asms[2].pk])
+    asms[1].validated = True
+    asms[1].save()
+    assert snapshot(dl, ch)[:2] == ([asms[1].pk, asms[2].pk], [asms[1].pk, asms[2].pk])
+    asms[2].delete()
+    assert snapshot(dl, ch)[:2] == ([asms[1].pk], [asms[1].pk])
+
+
+def test_prune_subscriptions(setup: "Setup") -> None:
+    from bitcaster.webpush.tasks import prune_subscriptions
+
+    dl, ch, asms = setup
+    snapshot(dl, ch)
+    assert prune_subscriptions([asms[0].pk]) == 1
+    assert snapshot(dl, ch)[:2] == ([asms[0].pk, asms[1].pk, asms[2].pk], [asms[2].pk])
+
+
+def test_rebuild(setup: "Setup") -> None:
+    from bitcaster.models import DistributionList, RecipientSnapshot
+
+    dl, ch, asms = setup
+    snapshot(dl, ch)
+    DistributionList.recipients.through.objects.filter(assignment=asms[0]).delete()
+    RecipientSnapshot.objects.rebuild(dl)
+    assert snapshot(dl, ch)[0] == [asms[1].pk, asms[2].pk]
+
+
+def test_pending_subscriptions(setup: "Setup") -> None:
+    from testutils.factories import NotificationFactory
+
+    dl, ch, asms = setup
+    notification = NotificationFactory(distribution=dl)
+    assert list(notification.get_pending_subscriptions([asms[1].pk], ch).order_by("pk")) == [asms[0], asms[2]]
@@ -4,6 +4,8 @@ from typing import TYPE_CHECKING
 import pytest
 
 if TYPE_CHECKING:
+    from pytest import MonkeyPatch
+
     from bitcaster.models import Channel, Event, Occurrence
 
 
@@ -39,3 +41,28 @@ def test_event_notifications(event: "Event") -> None:
     )
     n2 = NotificationFactory(distribution__recipients=[AssignmentFactory(channel=ch) for __ in range(2)], event=event)
     assert list(event.notifications.match({})) == [n1, n2]
+
+
+def test_trigger_priority(event: "Event") -> None:
+    from bitcaster.models import Event
+
+    o: "Occurrence" = event.trigger(context={})
+    assert o.priority == event.priority == Event.Priority.NORMAL
+
+    o = event.trigger(context={}, options={"priority": Event.Priority.LOW})
+    assert o.priority == Event.Priority.LOW
+
+
+@pytest.mark.django_db(transaction=True)
+def test_trigger_high_priority(event: "Event", monkeypatch: "MonkeyPatch") -> None:
+    from unittest.mock import Mock
+
+    from bitcaster.models import Event
+
+    monkeypatch.setattr("bitcaster.tasks.process_occurrence.apply_async", mocked := Mock())
+    event.trigger(context={})
+    assert mocked.call_count == 0
+
+    o = event.trigger(context={}, options={"priority": Event.Priority.HIGH})
+    mocked.assert_called_once_with(args=[o.pk], queue=o.queue)
+    assert o.queue == "queue_hcr_high"
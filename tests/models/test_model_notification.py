@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 from unittest.mock import Mock
 
+import pytest
 from pytest_django import DjangoAssertNumQueries
 from testutils.factories import NotificationFactory
 from testutils.factories.channel import ChannelFactory
@@ -9,7 +10,7 @@ from testutils.factories.message import MessageFactory
 if TYPE_CHECKING:
     from pytest import MonkeyPatch
 
-    from bitcaster.models import Event, Message, Notification
+    from bitcaster.models import Assignment, Event, Message, Notification
 
 
 def test_get_message_cache(notification: "Notification", django_assert_num_queries: DjangoAssertNumQueries) -> None:
@@ -41,6 +42,27 @@ def test_get_message_precedence(event: "Event", django_assert_num_queries: Djang
         assert n2.get_message(ch1) == m2
 
 
+def test_get_message_shared_cache(event: "Event", django_assert_num_queries: DjangoAssertNumQueries) -> None:
+    from bitcaster.models import Notification
+
+    ch1 = ChannelFactory()
+    n1: "Notification" = NotificationFactory(event=event)
+    default: "Message" = MessageFactory(name="default", channel=ch1, event=event, notification=None)
+    assert n1.get_message(ch1) == default
+
+    # resolution is shared by all the instances
+    with django_assert_num_queries(0):
+        assert Notification(pk=n1.pk, event_id=event.pk).get_message(ch1) == default
+
+    custom: "Message" = MessageFactory(name="custom", channel=ch1, event=event, notification=n1)
+    assert Notification(pk=n1.pk, event_id=event.pk).get_message(ch1) == custom
+
+    custom.delete()
+    default.content = "updated"
+    default.save()
+    assert Notification(pk=n1.pk, event_id=event.pk).get_message(ch1).content == "updated"
+
+
 def test_missing_message(event: "Event", monkeypatch: "MonkeyPatch") -> None:
     ch1 = ChannelFactory()
     n1: "Notification" = NotificationFactory(event=event)
@@ -49,3 +71,47 @@ def test_missing_message(event: "Event", monkeypatch: "MonkeyPatch") -> None:
     ret = n1.notify_to_channel(ch1, Mock(), {})
     assert ret is None
     assert mocked_notify.call_count == 0
+
+
+def test_notify_not_delivered(event: "Event", assignment: "Assignment", monkeypatch: "MonkeyPatch") -> None:
+    ch1 = ChannelFactory()
+    n1: "Notification" = NotificationFactory(event=event)
+    MessageFactory(channel=ch1, event=event, notification=n1)
+    monkeypatch.setattr(ch1.dispatcher, "send", Mock(return_value=False))
+
+    assert n1.notify_to_channel(ch1, assignment, {}) is False
+
+
+def test_get_pending_subscriptions_need_subscription(db: None) -> None:
+    from strategy_field.utils import fqn
+    from testutils.factories import AssignmentFactory
+
+    from bitcaster.webpush.dispatcher import WebPushDispatcher
+
+    ch = ChannelFactory(dispatcher=fqn(WebPushDispatcher))
+    subscribed = AssignmentFactory(channel=ch)
+    expired = AssignmentFactory(channel=ch, validated=False)
+    n = NotificationFactory(distribution__recipients=[subscribed, expired])
+    assert list(n.get_pending_subscriptions([], ch)) == [subscribed]
+
+
+def test_notify_metrics(event: "Event", assignment: "Assignment", monkeypatch: "MonkeyPatch") -> None:
+    from prometheus_client import REGISTRY
+
+    ch1 = ChannelFactory()
+    n1: "Notification" = NotificationFactory(event=event)
+    MessageFactory(channel=ch1, event=event, notification=n1)
+
+    def sample(name: str, **labels: str) -> float:
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    errors = sample("bitcaster_send_errors_total", dispatcher="XDispatcher")
+    sent = sample("bitcaster_send_seconds_count", dispatcher="XDispatcher", channel=ch1.name)
+
+    n1.notify_to_channel(ch1, assignment, {})
+    assert sample("bitcaster_send_seconds_count", dispatcher="XDispatcher", channel=ch1.name) == sent + 1
+
+    monkeypatch.setattr(ch1.dispatcher, "send", Mock(side_effect=Exception("boom")))
+    with pytest.raises(Exception, match="boom"):
+        n1.notify_to_channel(ch1, assignment, {})
+    assert sample("bitcaster_send_errors_total", dispatcher="XDispatcher") == errors + 1
@@ -52,6 +52,19 @@ def test_model_occurrence_filter(
         }
 
 
+def test_model_occurrence_not_delivered(context: "Context", monkeypatch: "MonkeyPatch") -> None:
+    # ie. WebPush subscription gone
+    monkeypatch.setattr(
+        "bitcaster.models.notification.Notification.notify_to_channel", mock := Mock(return_value=False)
+    )
+
+    occurrence: Occurrence = context["notification"].event.trigger(context={"foo": "bar"})
+    assert occurrence.process() is True
+    assert mock.call_count == 1
+    occurrence.refresh_from_db()
+    assert "delivered" not in occurrence.data
+
+
 def test_model_occurrence_no_notifications(occurrence: "Occurrence", monkeypatch: "MonkeyPatch") -> None:
     monkeypatch.setattr("bitcaster.models.notification.Notification.get_context", mock := Mock())
     assert occurrence.process() is True
@@ -76,3 +89,27 @@ def test_purgeable(purgeable_occurrences: List["Occurrence"], non_purgeable_occu
     purgeable_occurrence_ids = Occurrence.objects.purgeable().order_by("id").values_list("id", flat=True)
 
     assert list(purgeable_occurrence_ids) == sorted([o.id for o in purgeable_occurrences])
+
+
+def test_model_occurrence_trace(messagebox: list) -> None:
+    from testutils.factories import (
+        AssignmentFactory,
+        ChannelFactory,
+        MessageFactory,
+        NotificationFactory,
+        OccurrenceFactory,
+    )
+
+    ch = ChannelFactory()
+    notification: "Notification" = NotificationFactory(event__channels=[ch])
+    MessageFactory(channel=ch, event=notification.event, notification=notification)
+    notification.distribution.recipients.add(AssignmentFactory(channel=ch), AssignmentFactory(channel=ch))
+    occurrence: "Occurrence" = OccurrenceFactory(event=notification.event)
+
+    assert occurrence.process()
+
+    phases = occurrence.trace["phases"]
+    assert list(phases) == ["match", "resolve", "render", f"send:{ch.name}", "persist"]
+    assert phases["render"][0] == phases[f"send:{ch.name}"][0] == 2
+    occurrence.refresh_from_db()
+    assert "persist" not in occurrence.trace["phases"]
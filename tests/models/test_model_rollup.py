@@ -0,0 +1,79 @@
+from datetime import timedelta
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from django.utils import timezone
+
+if TYPE_CHECKING:
+    from bitcaster.models import Event
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def event(db: Any) -> "Event":
+    from testutils.factories import EventFactory
+
+    return EventFactory()
+
+
+def counters(event: "Event") -> dict[str, int]:
+    return {r.status: r.count for r in event.rollups.all()}
+
+
+def test_rollup_on_create_and_status_change(event: "Event") -> None:
+    from testutils.factories import OccurrenceFactory
+
+    from bitcaster.models import Occurrence
+
+    now = timezone.now()
+    o1 = OccurrenceFactory(event=event, timestamp=now)
+    OccurrenceFactory(event=event, timestamp=now + timedelta(seconds=1))
+    assert counters(event) == {"NEW": 2}
+
+    o1.status = Occurrence.Status.PROCESSED
+    o1.save()
+    o1.save()  # no change
+    assert counters(event) == {"NEW": 1, "PROCESSED": 1}
+
+    o1 = Occurrence.objects.get(pk=o1.pk)
+    o1.status = Occurrence.Status.FAILED
+    o1.save()
+    assert counters(event) == {"NEW": 1, "PROCESSED": 0, "FAILED": 1}
+
+
+def test_rollup_add(event: "Event") -> None:
+    from bitcaster.models import OccurrenceRollup
+
+    now = timezone.now()
+    OccurrenceRollup.objects.add(
+        [(event.pk, now, "NEW", 1), (event.pk, now, "NEW", 1), (event.pk, now - timedelta(minutes=2), "NEW", 1)]
+    )
+    OccurrenceRollup.objects.add([(event.pk, now, "NEW", 3)])
+    assert sorted(event.rollups.values_list("count", flat=True)) == [1, 5]
+
+
+def test_rollup_summary(event: "Event") -> None:
+    from bitcaster.models import OccurrenceRollup
+
+    now = timezone.now()
+    OccurrenceRollup.objects.add(
+        [
+            (event.pk, now, "NEW", 2),
+            (event.pk, now - timedelta(minutes=10), "PROCESSED", 3),
+            (event.pk, now - timedelta(hours=30), "FAILED", 1),
+        ]
+    )
+    [row] = OccurrenceRollup.objects.summary(now - timedelta(hours=24))
+    assert row["event__name"] == event.name
+    assert row["application"] == event.application.name
+    assert (row["total"], row["new"], row["processed"], row["failed"]) == (5, 2, 3, 0)
+
+
+def test_rollup_purge(event: "Event") -> None:
+    from bitcaster.models import OccurrenceRollup
+
+    now = timezone.now()
+    OccurrenceRollup.objects.add([(event.pk, now, "NEW", 1), (event.pk, now - timedelta(days=40), "NEW", 1)])
+    assert OccurrenceRollup.objects.purge(30) == 1
+    assert event.rollups.count() == 1
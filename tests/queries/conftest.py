@@ -0,0 +1,56 @@
+import os
+from typing import TYPE_CHECKING, Callable
+
+import pytest
+
+if TYPE_CHECKING:
+    from bitcaster.models import Channel, DistributionList
+
+SIZES = sorted(int(s) for s in os.environ.get("QUERY_BUDGET_SIZES", "10,1000").split(","))
+BATCH_SIZE = 5000
+
+
+@pytest.fixture()
+def sizes() -> list[int]:
+    return SIZES
+
+
+@pytest.fixture()
+def populate() -> Callable[["DistributionList", "Channel", int], None]:
+    """Grow `distribution` up to `size` recipients of `channel`, one user/address/assignment each.
+
+    Rows are bulk inserted, so 100k recipients can be created in a few seconds.
+    """
+    from bitcaster.constants import AddressType
+    from bitcaster.models import (
+        Address,
+        Assignment,
+        DistributionList,
+        RecipientSnapshot,
+        User,
+    )
+
+    def _populate(distribution: "DistributionList", channel: "Channel", size: int) -> None:
+        start = distribution.recipients.count()
+        if size <= start:
+            return
+        prefix = f"qb{channel.pk}"
+        users = User.objects.bulk_create(
+            [User(username=f"{prefix}-{n}@example.com", email=f"{prefix}-{n}@example.com") for n in range(start, size)],
+            batch_size=BATCH_SIZE,
+        )
+        addresses = Address.objects.bulk_create(
+            [Address(user=u, name="email", value=u.email, type=AddressType.EMAIL) for u in users], batch_size=BATCH_SIZE
+        )
+        assignments = Assignment.objects.bulk_create(
+            [Assignment(address=a, channel=channel, validated=True) for a in addresses], batch_size=BATCH_SIZE
+        )
+        Through = DistributionList.recipients.through
+        Through.objects.bulk_create(
+            [Through(distributionlist_id=distribution.pk, assignment_id=a.pk) for a in assignments],
+            batch_size=BATCH_SIZE,
+        )
+        # bulk inserts do not send m2m_changed
+        RecipientSnapshot.objects.rebuild(distribution)
+
+    return _populate
@@ -0,0 +1,123 @@
+from typing import TYPE_CHECKING, Any, Callable
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from django_webtest import DjangoTestApp
+from django_webtest.pytest_plugin import MixinWithInstanceVariables
+from freezegun import freeze_time
+from rest_framework.test import APIClient
+from testutils.queries import QueryBudget
+
+if TYPE_CHECKING:
+    from bitcaster.models import Channel, DistributionList, Event, Notification, User
+
+    Populate = Callable[[DistributionList, Channel, int], None]
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture()
+def setup(db: Any) -> "dict[str, Any]":
+    from testutils.factories import (
+        ChannelFactory,
+        EventFactory,
+        MessageFactory,
+        NotificationFactory,
+    )
+
+    channel: "Channel" = ChannelFactory()
+    event: "Event" = EventFactory(application__project=channel.project, channels=[channel], active=True)
+    MessageFactory(channel=channel, event=event, content="Message for {{address}}")
+    notification: "Notification" = NotificationFactory(event=event, distribution__project=channel.project)
+    return {"channel": channel, "event": event, "notification": notification, "distribution": notification.distribution}
+
+
+@pytest.fixture()
+def app(django_app_factory: MixinWithInstanceVariables, admin_user: "User") -> DjangoTestApp:
+    django_app: DjangoTestApp = django_app_factory(csrf_checks=False)
+    django_app.set_user(admin_user)
+    django_app._user = admin_user
+    return django_app
+
+
+def test_occurrence_process(setup: "dict[str, Any]", populate: "Populate", sizes: list[int], messagebox: list) -> None:
+    from testutils.factories import OccurrenceFactory
+
+    budget = QueryBudget("occurrence_process")
+    for size in sizes:
+        populate(setup["distribution"], setup["channel"], size)
+        o = OccurrenceFactory(event=setup["event"])
+        with budget.record(size):
+            assert o.process()
+        assert len(o.data["delivered"]) == size
+    budget.check()
+
+
+def test_notification_get_message(setup: "dict[str, Any]", sizes: list[int]) -> None:
+    from bitcaster.models import Notification
+
+    budget = QueryBudget("notification_get_message")
+    for size in sizes:
+        notification = Notification.objects.get(pk=setup["notification"].pk)
+        with budget.record(size):
+            for __ in range(size):
+                assert notification.get_message(setup["channel"])
+    budget.check()
+
+
+def test_event_trigger_post(
+    setup: "dict[str, Any]", populate: "Populate", sizes: list[int], admin_user: "User"
+) -> None:
+    from testutils.factories import ApiKeyFactory
+
+    event: "Event" = setup["event"]
+    key = ApiKeyFactory(user=admin_user, application=event.application)
+    client = APIClient()
+    client.credentials(HTTP_AUTHORIZATION=f"Key {key.key}")
+    url = "/api/o/{}/p/{}/a/{}/e/{}/trigger/".format(
+        event.application.project.organization.slug, event.application.project.slug, event.application.slug, event.slug
+    )
+    budget = QueryBudget("event_trigger_post")
+    for size in sizes:
+        populate(setup["distribution"], setup["channel"], size)
+        with budget.record(size):
+            res = client.post(url, {"context": {"size": size}}, format="json")
+        assert res.status_code == 201, res.json()
+    budget.check()
+
+
+def occurrences(setup: "dict[str, Any]", populate: "Populate", size: int) -> None:
+    from bitcaster.models import Occurrence
+
+    current = Occurrence.objects.count()
+    # timestamps must be unique per event
+    with freeze_time(timezone.now(), auto_tick_seconds=1):
+        Occurrence.objects.bulk_create([Occurrence(event=setup["event"]) for __ in range(size - current)])
+
+
+def assignments(setup: "dict[str, Any]", populate: "Populate", size: int) -> None:
+    populate(setup["distribution"], setup["channel"], size)
+
+
+@pytest.mark.admin
+@pytest.mark.parametrize(
+    "model, seed",
+    [("occurrence", occurrences), ("assignment", assignments), ("address", assignments), ("user", assignments)],
+)
+def test_admin_changelist(
+    app: DjangoTestApp,
+    setup: "dict[str, Any]",
+    populate: "Populate",
+    sizes: list[int],
+    model: str,
+    seed: Callable[..., None],
+) -> None:
+    url = reverse(f"admin:bitcaster_{model}_changelist")
+    budget = QueryBudget(f"admin_{model}_changelist")
+    for size in sizes:
+        seed(setup, populate, size)
+        with budget.record(size):
+            res = app.get(url)
+        assert res.status_code == 200
+    budget.check()
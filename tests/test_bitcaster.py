@@ -1,5 +1,7 @@
 from typing import TYPE_CHECKING, Any
 
+from django.db.models import Sum
+
 from bitcaster.constants import Bitcaster, SystemEvent
 
 if TYPE_CHECKING:
@@ -11,6 +13,27 @@ def test_trigger_event(system_objects: Any) -> None:
     assert o.pk
 
 
+def test_trigger_events(system_objects: Any, django_assert_num_queries: Any) -> None:
+    from testutils.factories import OccurrenceFactory
+
+    from bitcaster.models import OccurrenceRollup
+
+    parent = OccurrenceFactory()
+    # system events are resolved by `initialize()`: one INSERT for the occurrences and one for the counters
+    with django_assert_num_queries(2):
+        occurrences = Bitcaster.trigger_events(
+            SystemEvent.OCCURRENCE_ERROR,
+            [{"correlation_id": n, "parent": parent, "options": {"limit_to": ["a@example.com"]}} for n in range(3)],
+        )
+    assert [o.correlation_id for o in occurrences] == ["0", "1", "2"]
+    assert occurrences[0].event.name == SystemEvent.OCCURRENCE_ERROR.value
+    assert occurrences[0].parent == parent
+    total = OccurrenceRollup.objects.filter(event__name=SystemEvent.OCCURRENCE_ERROR.value).aggregate(
+        total=Sum("count")
+    )["total"]
+    assert total == 3
+
+
 def test_app(system_objects: Any, django_assert_num_queries: Any) -> None:
     a: "Application"
     with django_assert_num_queries(1):
@@ -3,6 +3,8 @@ from typing import Any, Optional
 
 import pytest
 from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
 from pytest_django import DjangoAssertNumQueries
 from pytest_django.fixtures import SettingsWrapper
 
@@ -12,7 +14,7 @@ from bitcaster.cache.storage import (
     qs_get_or_store,
     qs_to_cache,
 )
-from bitcaster.models import Occurrence
+from bitcaster.models import Application, Occurrence
 
 
 @pytest.fixture()
@@ -32,11 +34,11 @@ def test_flag_disable(
     settings.FLAGS = {"DISABLE_CACHE": [("boolean", True)]}
     qs = Occurrence.objects.all()
     assert qs_from_cache(qs, key=key) is None
-    with django_assert_num_queries(2):
+    with django_assert_num_queries(0):  # flag state is cached
         assert qs_from_cache(qs, key=key) is None
         assert qs_from_cache(qs, key=key) is None
 
-    with django_assert_num_queries(3):
+    with django_assert_num_queries(1):
         assert qs_get_or_store(qs, key=key)
 
 
@@ -56,7 +58,7 @@ def test_get_from_cache(data: Any, django_assert_num_queries: DjangoAssertNumQue
         key = f"{key}-{os.environ.get('PYTEST_XDIST_WORKER', '')}"
     qs = Occurrence.objects.all()
     qs_to_cache(qs, key=key)
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert qs_from_cache(qs, key=key)
 
 
@@ -65,10 +67,10 @@ def test_qs_get_or_store(data: Any, django_assert_num_queries: DjangoAssertNumQu
     if key:
         key = f"{key}-{os.environ.get('PYTEST_XDIST_WORKER', '')}"
     qs = Occurrence.objects.filter()[:1]
-    with django_assert_num_queries(3):
+    with django_assert_num_queries(2):
         assert qs_get_or_store(qs, key=key)
 
-    with django_assert_num_queries(1):
+    with django_assert_num_queries(0):
         assert qs_get_or_store(qs, key=key)
 
 
@@ -80,3 +82,161 @@ def test_qs_delete(data: Any, django_assert_num_queries: DjangoAssertNumQueries,
     qs_to_cache(qs, key=key)
     with django_assert_num_queries(0):
         assert qs_del_cache(qs, key=key)
+
+
+def test_cache_key_is_stable(data: Any) -> None:
+    from bitcaster.cache.storage import qs_cache_key
+
+    key = qs_cache_key(Occurrence.objects.filter(event__name="abc"))
+    assert key == qs_cache_key(Occurrence.objects.filter(event__name="abc"))
+    assert key != qs_cache_key(Occurrence.objects.filter(event__name="xyz"))
+    assert str(hash(Occurrence.objects.filter(event__name="abc").query)) not in key
+
+
+def test_cache_key_models(data: Any) -> None:
+    from bitcaster.cache.storage import qs_models
+    from bitcaster.models import Application, Event
+
+    assert qs_models(Occurrence.objects.filter(event__application__name="abc")) == [Application, Event, Occurrence]
+
+
+def test_invalidate(data: Any, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+    from bitcaster.cache.storage import invalidate
+    from bitcaster.models import Event
+
+    qs = Occurrence.objects.filter(event__isnull=False)
+    qs_to_cache(qs)
+    assert qs_from_cache(qs)
+    invalidate(Event)
+    assert qs_from_cache(qs) is None
+    qs_to_cache(qs)
+    invalidate(Application)
+    assert qs_from_cache(qs)  # Application is not used by the query
+
+
+def test_qs_get_or_store_wait(data: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    from bitcaster.cache import storage
+
+    qs = Occurrence.objects.all()
+    expected = list(qs.values())
+    # another process holds the lock and stores the value while we are waiting
+    cache.add(f"{storage.qs_cache_key(qs)}:lock", 1)
+    monkeypatch.setattr(storage.time, "sleep", lambda s: cache.set(storage.qs_cache_key(qs), expected))
+    assert storage.qs_get_or_store(qs) == expected
+
+
+def test_qs_get_or_store_lock_timeout(data: Any, monkeypatch: pytest.MonkeyPatch) -> None:
+    from bitcaster.cache import storage
+
+    qs = Occurrence.objects.all()
+    cache.add(f"{storage.qs_cache_key(qs)}:lock", 1)
+    monkeypatch.setattr(storage, "LOCK_TIMEOUT", 0)
+    assert storage.qs_get_or_store(qs) == list(qs.values())
+
+
+def test_invalidate_debounced(data: Any) -> None:
+    from bitcaster.cache.storage import get_versions, invalidate_debounced
+
+    before = get_versions([Occurrence])["bitcaster.occurrence"]
+    invalidate_debounced(Occurrence)
+    invalidate_debounced(Occurrence)
+    assert get_versions([Occurrence])["bitcaster.occurrence"] == before + 1
+
+
+def test_values_queryset(data: Any) -> None:
+    qs = Occurrence.objects.values("event__name").annotate(n=Count("id"))
+    assert qs_get_or_store(qs) == list(qs)
+
+
+def test_dashboard_cache(data: Any, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+    from testutils.factories import EventFactory, OccurrenceFactory
+
+    from bitcaster.admin_site import BitcasterAdminSite
+
+    site = BitcasterAdminSite()
+    event = EventFactory(name="other")
+    cache.clear()
+    OccurrenceFactory(timestamp=timezone.now())
+    assert len(site.get_last_events()) == 1
+    with django_assert_num_queries(0):
+        assert len(site.get_last_events()) == 1
+
+    # new occurrences within the window do not invalidate the entry again
+    OccurrenceFactory(timestamp=timezone.now(), event=event)
+    assert len(site.get_last_events()) == 1
+    # event changes do
+    event.save()
+    assert len(site.get_last_events()) == 2
+
+
+def test_two_tier_cache(data: Any) -> None:
+    from bitcaster.cache.backends import Listener, TwoTierCache
+
+    first = TwoTierCache("default", {"KEY_PREFIX": "test", "OPTIONS": {"LOCAL_TIMEOUT": 10}})
+    other = TwoTierCache("default", {"KEY_PREFIX": "test", "OPTIONS": {"LOCAL_TIMEOUT": 10}})
+    first.set("key", 1)
+    assert other.get("key") == 1
+    # served from the process memory
+    cache.clear()
+    assert other.get("key") == 1
+    assert other.get("missing", "default") == "default"
+    first.set("key", 2)
+    assert other.get("key") == 2
+    first.delete("key")
+    assert other.get("key") is None
+    assert first.get_or_set("key", lambda: False) is False
+    assert other.get("key", "missing") is False
+    # invalidation messages from other processes
+    cache.clear()
+    Listener("test", other.local, None).process("1:key")
+    assert other.get("key", "missing") == "missing"
+
+
+def test_config_cache(data: Any, system_objects: Any, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+    from testutils.factories import ChannelFactory
+
+    from bitcaster.constants import Bitcaster, SystemEvent
+    from bitcaster.models import Event
+
+    event = Event.objects.get(pk=Bitcaster.get_system_events()[SystemEvent.OCCURRENCE_SILENCE.value].id)
+    assert event.get_channels() == []
+    with django_assert_num_queries(0):
+        assert Bitcaster.get_system_events()[SystemEvent.OCCURRENCE_SILENCE.value].id == event.pk
+        assert event.get_channels() == []
+
+    ch = ChannelFactory()
+    event.channels.add(ch)
+    assert event.get_channels() == [ch]
+    ch.event_set.clear()
+    assert event.get_channels() == []
+    ch.event_set.add(event)
+    assert event.get_channels() == [ch]
+    ch.delete()
+    assert event.get_channels() == []
+
+    event.priority = Event.Priority.HIGH
+    event.save()
+    assert Bitcaster.get_system_events()[SystemEvent.OCCURRENCE_SILENCE.value].priority == Event.Priority.HIGH
+
+
+def test_config_cache_forget_on_commit(data: Any, django_capture_on_commit_callbacks: Any) -> None:
+    from bitcaster.cache.config import config_cache, forget, get_or_load
+
+    with django_capture_on_commit_callbacks(execute=True):
+        get_or_load("key", lambda: 1)
+        forget("key")
+        # re-cached by a process that does not see the changes yet
+        assert get_or_load("key", lambda: 2) == 2
+    assert config_cache().get("key") is None
+
+
+def test_config_cache_flags(data: Any, django_assert_num_queries: DjangoAssertNumQueries) -> None:
+    from flags.models import FlagState
+
+    from bitcaster.cache.config import flag_enabled
+
+    assert not flag_enabled("DISABLE_CACHE")
+    with django_assert_num_queries(0):
+        assert not flag_enabled("DISABLE_CACHE")
+    FlagState.objects.create(name="DISABLE_CACHE", condition="boolean", value="True")
+    assert flag_enabled("DISABLE_CACHE")
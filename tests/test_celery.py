@@ -1,4 +1,9 @@
+from pathlib import Path
+from unittest.mock import Mock
+
 import pytest
+from pytest import MonkeyPatch
+from pytest_django.fixtures import SettingsWrapper
 
 
 def test_celery() -> None:
@@ -17,3 +22,28 @@ def test_init_celery() -> None:
         init_sentry()
     except Exception as e:
         pytest.fail(getattr(e, "message", "unknown error"))
+
+
+def test_init_metrics(settings: SettingsWrapper, monkeypatch: MonkeyPatch) -> None:
+    from bitcaster.config.celery import init_metrics
+
+    monkeypatch.setattr("bitcaster.metrics.start_http_server", start := Mock())
+    settings.METRICS_WORKER_PORT = 0
+    init_metrics()
+    assert not start.called
+
+    settings.METRICS_WORKER_PORT = 9100
+    init_metrics()
+    assert start.call_args[0] == (9100,)
+
+
+def test_mark_metrics_process_dead(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
+    from bitcaster.config.celery import mark_metrics_process_dead
+
+    monkeypatch.setattr("prometheus_client.multiprocess.mark_process_dead", mark := Mock())
+    mark_metrics_process_dead(pid=10)
+    assert not mark.called
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    mark_metrics_process_dead(pid=10)
+    mark.assert_called_with(10)
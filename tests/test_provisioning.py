@@ -0,0 +1,157 @@
+from io import StringIO
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
+
+import pytest
+from django.core.management import CommandError, call_command
+
+if TYPE_CHECKING:
+    from bitcaster.models import Channel, Organization
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture()
+def org(system_objects: Any) -> "Organization":
+    from testutils.factories import OrganizationFactory
+
+    return OrganizationFactory()
+
+
+@pytest.fixture()
+def channel(org: "Organization") -> "Channel":
+    from testutils.factories import ChannelFactory
+
+    return ChannelFactory(organization=org, project=None, name="Email")
+
+
+def test_provision(org: "Organization", channel: "Channel") -> None:
+    from bitcaster.models import Assignment, User
+    from bitcaster.provisioning import provision
+
+    records = [{"email": f"User{n}@example.com", "first_name": f"name{n}", "channels": ["email"]} for n in range(5)] + [
+        {"email": "user0@example.com", "addresses": [{"name": "mobile", "value": "+391234567890"}]}
+    ]
+    result = provision(org, records, batch_size=2)
+    assert result.errors == []
+    assert org.users.count() == 5
+    assert Assignment.objects.filter(channel=channel).count() == 5
+
+    user = User.objects.get(username="user0@example.com")
+    assert user.first_name == "name0"  # not in the last record, so it is kept
+    assert user.addresses.get(name="mobile").type == "phone"
+
+    # upsert: update names, keep addresses, reactivate assignments
+    Assignment.objects.update(active=False)
+    result = provision(org, [{"email": "user1@example.com", "channels": ["Email"]}])
+    assert result.as_dict() == {"users": 1, "addresses": 1, "assignments": 1, "errors": []}
+    user = User.objects.get(username="user1@example.com")
+    assert user.first_name == "name1"
+    assert user.addresses.get(name="email").assignments.get().active
+
+
+def test_provision_errors(org: "Organization", channel: "Channel") -> None:
+    from bitcaster.provisioning import provision
+
+    result = provision(org, [{"email": ""}, {"email": "a@example.com", "channels": ["missing"]}, "invalid"])
+    assert result.errors == [
+        {"row": 1, "error": "Invalid or missing email"},
+        {"row": 2, "error": "Unknown channel(s) missing"},
+        {"row": 3, "error": "Invalid or missing email"},
+    ]
+    assert result.users == 1
+
+
+def test_provision_duplicate_address(org: "Organization", channel: "Channel") -> None:
+    from bitcaster.models import User
+    from bitcaster.provisioning import provision
+
+    records = [{"email": "a@example.com", "addresses": [{"name": "work", "value": "a@example.com"}]}]
+    result = provision(org, records)
+    assert result.errors == [{"row": 1, "error": "Duplicate address a@example.com (email, work)"}]
+    assert result.addresses == 1
+    assert list(User.objects.get(username="a@example.com").addresses.values_list("name", flat=True)) == ["email"]
+
+
+def test_provision_conflict(org: "Organization", channel: "Channel", monkeypatch: pytest.MonkeyPatch) -> None:
+    from django.db import IntegrityError
+
+    from bitcaster.provisioning import Provisioner, provision
+
+    monkeypatch.setattr(Provisioner, "upsert_addresses", Mock(side_effect=IntegrityError("conflict")))
+    result = provision(org, [{"email": "a@example.com"}, {"email": "b@example.com"}])
+    assert result.as_dict() == {
+        "users": 0,
+        "addresses": 0,
+        "assignments": 0,
+        "errors": [{"row": 1, "error": "Conflicting data"}, {"row": 2, "error": "Conflicting data"}],
+    }
+    assert not org.users.exists()
+
+
+def test_provision_existing_email(org: "Organization") -> None:
+    from testutils.factories import UserFactory, UserRoleFactory
+
+    from bitcaster.provisioning import provision
+
+    user = UserFactory(username="user", email="User@example.com")
+    UserRoleFactory(user=user, organization=org)
+    result = provision(org, [{"email": "user@example.com", "last_name": "Doe"}])
+    assert result.users == 1
+    user.refresh_from_db()
+    assert user.last_name == "Doe"
+    assert list(org.users.all()) == [user]
+
+
+def test_provision_other_organization(org: "Organization", channel: "Channel") -> None:
+    from testutils.factories import AddressFactory, UserFactory, UserRoleFactory
+
+    from bitcaster.provisioning import provision
+
+    user = UserFactory(username="user@example.com", email="user@example.com", first_name="John")
+    UserRoleFactory(user=user)  # member of another organization
+    AddressFactory(user=user, name="mobile", value="+391111111111")
+    records = [
+        {
+            "email": "user@example.com",
+            "first_name": "Mallory",
+            "channels": ["Email"],
+            "addresses": [{"name": "mobile", "value": "+392222222222"}, {"name": "work", "value": "w@example.com"}],
+        }
+    ]
+    result = provision(org, records)
+    assert result.errors == [{"row": 1, "error": "Address mobile already exists"}]
+    user.refresh_from_db()
+    assert user.first_name == "John"
+    assert user.addresses.get(name="mobile").value == "+391111111111"
+    assert user.addresses.get(name="work").value == "w@example.com"
+    assert user.addresses.get(name="email").assignments.get().channel == channel
+    assert user.roles.count() == 2
+    assert org.users.filter(pk=user.pk).exists()
+
+
+@pytest.mark.parametrize(
+    "fmt, content",
+    [
+        ("csv", "email,first_name,last_name,channels\nuser@example.com,John,Doe,Email\n"),
+        ("ndjson", '{"email": "user@example.com", "channels": ["Email"]}\n'),
+        ("json", '[{"email": "user@example.com", "channels": ["Email"]}]'),
+    ],
+)
+def test_command(tmp_path: Path, org: "Organization", channel: "Channel", fmt: str, content: str) -> None:
+    from bitcaster.models import Assignment
+
+    source = tmp_path / f"users.{fmt}"
+    source.write_text(content)
+    out = StringIO()
+    call_command("provision", org.slug, str(source), stdout=out)
+    assert "1 users, 1 addresses, 1 assignments" in out.getvalue()
+    assert Assignment.objects.filter(channel=channel, address__user__username="user@example.com").exists()
+
+
+def test_command_errors(tmp_path: Path, org: "Organization") -> None:
+    with pytest.raises(CommandError):
+        call_command("provision", "missing", "users.csv")
+    with pytest.raises(CommandError, match="Unable to detect the format"):
+        call_command("provision", org.slug, str(tmp_path / "users.txt"))
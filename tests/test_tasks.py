@@ -1,5 +1,6 @@
 import uuid
 from typing import TYPE_CHECKING, Any, Tuple, TypedDict
+from unittest import mock
 from unittest.mock import Mock
 
 import pytest
@@ -11,12 +12,16 @@ from testutils.dispatcher import XDispatcher
 from bitcaster.constants import Bitcaster, SystemEvent
 from bitcaster.tasks import (
     monitor_run,
+    monitor_run_batch,
+    monitor_schedule,
     process_occurrence,
     purge_occurrences,
     schedule_occurrences,
 )
 
 if TYPE_CHECKING:
+    from pytest_django.fixtures import SettingsWrapper
+
     from bitcaster.models import (
         Address,
         Assignment,
@@ -302,3 +307,63 @@ def test_monitor_run(system_user: "User") -> None:
     monitor.active = False
     monitor.save()
     assert monitor_run(monitor.pk) == "inactive"
+
+
+def test_monitor_shared_schedule(db: Any) -> None:
+    from testutils.factories.monitor import MonitorFactory
+
+    from bitcaster.models.monitor import MONITOR_SCHEDULE_TASK
+
+    m1, m2 = MonitorFactory(schedule=None), MonitorFactory(schedule=None)
+    assert m1.schedule == m2.schedule
+    assert m1.schedule.task == MONITOR_SCHEDULE_TASK
+
+
+def test_monitor_schedule(db: Any, settings: "SettingsWrapper", monkeypatch: MonkeyPatch) -> None:
+    from testutils.factories.monitor import MonitorFactory
+
+    settings.MONITOR_BATCH_SIZE = 2
+    monkeypatch.setattr("bitcaster.tasks.monitor_run_batch.delay", mocked := Mock())
+    monitors = [MonitorFactory(schedule=None) for __ in range(3)]
+    MonitorFactory(schedule=None, active=False)
+
+    assert monitor_schedule(monitors[0].schedule.name) == 3
+    assert [c.args[0] for c in mocked.call_args_list] == [[monitors[0].pk, monitors[1].pk], [monitors[2].pk]]
+
+
+@pytest.mark.parametrize("concurrency", [1, 4])
+def test_monitor_run_batch(system_user: "User", settings: "SettingsWrapper", concurrency: int) -> None:
+    from testutils.agent import XAgent
+    from testutils.factories.monitor import MonitorFactory
+
+    from bitcaster.models import LogEntry, Monitor
+
+    settings.MONITOR_CONCURRENCY = concurrency
+    monitors = [MonitorFactory() for __ in range(3)]
+    inactive = MonitorFactory(active=False)
+    pks = [m.pk for m in [*monitors, inactive]]
+
+    assert monitor_run_batch(pks) == {"done": 3, "errors": 0, "inactive": 1}
+    assert LogEntry.objects.filter(object_id__in=pks, user=system_user).count() == 3
+    assert Monitor.objects.get(pk=monitors[0].pk).result["message"] == "Success"
+
+    with mock.patch.object(XAgent, "check", side_effect=Exception("error")):
+        assert monitor_run_batch(pks) == {"done": 0, "errors": 3, "inactive": 1}
+    assert not Monitor.objects.filter(pk__in=pks, active=True).exists()
+    assert Monitor.objects.get(pk=monitors[0].pk).result == {"error": "error"}
+
+
+def test_schedule_occurrences_priority(setup: "Context", monkeypatch: MonkeyPatch) -> None:
+    from testutils.factories import OccurrenceFactory
+
+    from bitcaster.models import Event
+
+    monkeypatch.setattr("bitcaster.tasks.process_occurrence.apply_async", mocked := Mock())
+    low = OccurrenceFactory(priority=Event.Priority.LOW)
+    high = OccurrenceFactory(priority=Event.Priority.HIGH)
+
+    schedule_occurrences()
+
+    calls = [c.kwargs for c in mocked.call_args_list]
+    assert calls[0] == {"args": [high.pk], "queue": "queue_hcr_high"}
+    assert calls[-1] == {"args": [low.pk], "queue": "queue_hcr_low"}
@@ -0,0 +1,68 @@
+from unittest.mock import Mock
+
+import pytest
+from opentelemetry import trace
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pytest import MonkeyPatch
+from pytest_django.fixtures import SettingsWrapper
+
+from bitcaster import telemetry
+
+
+def test_setup_disabled(settings: SettingsWrapper, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("opentelemetry.trace.set_tracer_provider", set_provider := Mock())
+    settings.OTEL_ENABLED = False
+    assert not telemetry.setup()
+    assert not set_provider.called
+
+
+def test_setup(settings: SettingsWrapper, monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr("opentelemetry.trace.set_tracer_provider", set_provider := Mock())
+    monkeypatch.setattr("opentelemetry.instrumentation.django.DjangoInstrumentor.instrument", django := Mock())
+    monkeypatch.setattr("opentelemetry.instrumentation.celery.CeleryInstrumentor.instrument", celery := Mock())
+    settings.OTEL_ENABLED = True
+    settings.OTEL_SERVICE_NAME = "bitcaster"
+
+    assert telemetry.setup("bitcaster-worker")
+    provider: TracerProvider = set_provider.call_args[0][0]
+    assert provider.resource.attributes["service.name"] == "bitcaster-worker"
+    assert django.called
+    assert celery.called
+
+
+def test_set_attributes() -> None:
+    span = TracerProvider().get_tracer("test").start_span("test")
+    with trace.use_span(span, end_on_exit=True):
+        telemetry.set_attributes({telemetry.ATTR_OCCURRENCE: 1, telemetry.ATTR_CORRELATION_ID: None})
+    assert dict(span.attributes) == {telemetry.ATTR_OCCURRENCE: 1}
+
+    # no-op without a recording span
+    telemetry.set_attributes({telemetry.ATTR_OCCURRENCE: 1})
+
+
+@pytest.mark.django_db
+def test_process_linked_to_trigger(monkeypatch: MonkeyPatch) -> None:
+    from testutils.factories import EventFactory
+
+    from bitcaster.models import Event
+
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter := InMemorySpanExporter()))
+    tracer = provider.get_tracer("test")
+    monkeypatch.setattr("bitcaster.models.occurrence.tracer", tracer)
+
+    event = EventFactory(priority=Event.Priority.NORMAL)
+    with tracer.start_as_current_span("trigger") as trigger:
+        occurrence = event.trigger(context={})
+    assert occurrence.options["traceparent"]
+
+    # processed later by the scheduler, in a different trace
+    occurrence.refresh_from_db()
+    with tracer.start_as_current_span("schedule_occurrences"):
+        occurrence.process()
+
+    span = next(s for s in exporter.get_finished_spans() if s.name == "Occurrence.process")
+    assert span.context.trace_id != trigger.get_span_context().trace_id
+    assert [link.context.span_id for link in span.links] == [trigger.get_span_context().span_id]
@@ -0,0 +1,18 @@
+from freezegun import freeze_time
+
+from bitcaster.utils.trace import DeliveryTrace
+
+
+def test_trace() -> None:
+    with freeze_time("2024-01-01 00:00:00", auto_tick_seconds=1):
+        trace = DeliveryTrace()
+        with trace.phase("render"):
+            pass
+        with trace.phase("render"):
+            pass
+        trace.add("send", 0.5)
+
+        data = trace.as_dict()
+
+    assert data["phases"] == {"render": [2, 2000.0, 1000.0], "send": [1, 500.0, 500.0]}
+    assert data["elapsed"] > 0
@@ -2,15 +2,19 @@ from typing import TYPE_CHECKING, Any
 from unittest import mock
 
 import pytest
+from django.core.cache import cache
 from django.urls import reverse
 from django_webtest import DjangoTestApp
 from pytest_django.fixtures import SettingsWrapper
 
-from bitcaster.models import User
+from bitcaster.constants import CacheKey
+from bitcaster.models import Event, User
 
 if TYPE_CHECKING:
     from django.test import Client
 
+    from bitcaster.models import Occurrence
+
 pytestmark = pytest.mark.django_db
 
 
@@ -59,3 +63,19 @@ def test_media(
     assert res.status_code == expected
     with mock.patch("bitcaster.web.views.was_modified_since", lambda *a: False):
         django_app.get(f"{settings.MEDIA_URL}/{resource}", expect_errors=True)
+
+
+def test_metrics(django_app: DjangoTestApp, settings: SettingsWrapper, occurrence: "Occurrence") -> None:
+    settings.METRICS_ENABLED = False
+    assert django_app.get("/metrics/", expect_errors=True).status_code == 404
+
+    settings.METRICS_ENABLED = True
+    cache.delete(CacheKey.METRICS_PENDING)
+    metric = f'bitcaster_occurrences_pending{{priority="{Event.Priority(occurrence.priority).name}"}} 1.0'
+    res = django_app.get("/metrics/")
+    assert res.status_code == 200
+    assert metric in res.text
+
+    # cached until the next scrape
+    occurrence.delete()
+    assert metric in django_app.get("/metrics/").text
@@ -0,0 +1,80 @@
+import json
+from typing import TYPE_CHECKING
+from unittest.mock import Mock
+
+import pytest
+from freezegun import freeze_time
+from pytest import MonkeyPatch
+from pywebpush import WebPushException
+from responses import RequestsMock
+
+from bitcaster.webpush.engine import WebPushEngine, get_origin, group_by_origin
+
+if TYPE_CHECKING:
+    from bitcaster.models import Assignment
+
+pytestmark = [pytest.mark.dispatcher, pytest.mark.django_db]
+
+PRIVATE_KEY = "nFUEzMGtnCgQkAsYJ9iQOjWHquTTfrOwyzvZeUiChgc"
+
+
+@pytest.fixture()
+def config() -> dict[str, str]:
+    return {"private_key": PRIVATE_KEY, "CLAIMS": json.dumps({"sub": "mailto: test@example.com"})}
+
+
+def test_get_origin(fcm_url: str) -> None:
+    assert get_origin(fcm_url) == "https://fcm.googleapis.com"
+
+
+def test_group_by_origin() -> None:
+    endpoints = ["https://a.example.com/1", "https://b.example.com/1", "https://a.example.com/2"]
+    assert group_by_origin(endpoints, lambda e: e) == [
+        "https://a.example.com/1",
+        "https://a.example.com/2",
+        "https://b.example.com/1",
+    ]
+
+
+def test_session_per_origin() -> None:
+    e = WebPushEngine()
+    session = e.get_session("https://a.example.com")
+    assert e.get_session("https://a.example.com") is session
+    assert e.get_session("https://b.example.com") is not session
+
+
+def test_no_claims() -> None:
+    e = WebPushEngine()
+    assert e.get_vapid_headers({"private_key": "", "CLAIMS": "{}"}, "https://push.example.com/1") == {}
+
+
+def test_signature_cache(config: dict[str, str], monkeypatch: MonkeyPatch) -> None:
+    e = WebPushEngine()
+    vapid, claims = e.get_key(config)
+    assert e.get_key(config)[0] is vapid
+    monkeypatch.setattr(vapid, "sign", sign := Mock(side_effect=lambda c: {"Authorization": c["aud"]}))
+
+    with freeze_time("2024-01-01 00:00:00"):
+        assert e.get_vapid_headers(config, "https://push.example.com/1") == {
+            "Authorization": "https://push.example.com"
+        }
+        e.get_vapid_headers(config, "https://push.example.com/2")
+        assert sign.call_count == 1
+
+        e.get_vapid_headers(config, "https://fcm.googleapis.com/1")
+        assert sign.call_count == 2
+
+    with freeze_time("2024-01-01 11:55:00"):
+        e.get_vapid_headers(config, "https://push.example.com/3")
+        assert sign.call_count == 3
+
+
+def test_send(mocked_responses: RequestsMock, push_assignment: "Assignment", fcm_url: str) -> None:
+    e = WebPushEngine()
+    subscription_info = push_assignment.data["webpush"]["subscription"]
+    mocked_responses.add(mocked_responses.POST, fcm_url, status=201)
+    assert e.send(push_assignment.channel, subscription_info, "===").status_code == 201
+
+    mocked_responses.add(mocked_responses.POST, fcm_url, "Error", status=400)
+    with pytest.raises(WebPushException):
+        e.send(push_assignment.channel, subscription_info, "===")
@@ -1,4 +1,5 @@
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
+from unittest.mock import Mock
 
 import pytest
 from responses import RequestsMock
@@ -21,3 +22,44 @@ def test_webpush_send_message(mocked_responses: RequestsMock, push_assignment: "
 
 def test_sign(push_assignment: "Assignment") -> None:
     assert unsign(sign(push_assignment))
+
+
+def test_webpush_send_message_gone(mocked_responses: RequestsMock, push_assignment: "Assignment", fcm_url: str) -> None:
+    from bitcaster.exceptions import SubscriptionGoneError
+
+    mocked_responses.add(mocked_responses.POST, fcm_url, "Gone", status=410)
+    with pytest.raises(SubscriptionGoneError):
+        webpush_send_message(push_assignment, "===")
+
+
+def test_prune_subscription(
+    push_assignment: "Assignment", django_capture_on_commit_callbacks: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from bitcaster.webpush.utils import prune_subscription
+
+    monkeypatch.setattr("bitcaster.webpush.tasks.prune_subscriptions.delay", delay := Mock())
+    other = Mock(pk=push_assignment.pk + 1)
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        prune_subscription(other)
+        prune_subscription(push_assignment)
+        prune_subscription(push_assignment)
+    assert len(callbacks) == 1
+    delay.assert_called_once_with([push_assignment.pk, other.pk])
+
+
+def test_prune_subscription_rollback(
+    push_assignment: "Assignment", django_capture_on_commit_callbacks: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from django.db import DatabaseError, transaction
+
+    from bitcaster.webpush.utils import prune_subscription
+
+    monkeypatch.setattr("bitcaster.webpush.tasks.prune_subscriptions.delay", delay := Mock())
+    with pytest.raises(DatabaseError):
+        with transaction.atomic():
+            prune_subscription(Mock(pk=push_assignment.pk + 1))
+            raise DatabaseError()
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        prune_subscription(push_assignment)
+    assert len(callbacks) == 1
+    delay.assert_called_once_with([push_assignment.pk])
@@ -1,3 +1,4 @@
+from typing import Any
 from unittest.mock import Mock
 
 import pytest
@@ -94,3 +95,41 @@ def test_form2() -> None:
             }
         )
         assert frm.is_valid(), frm.errors
+
+
+@pytest.mark.parametrize("status", [404, 410])
+def test_webpush_gone(
+    payload: Payload,
+    mocked_responses: RequestsMock,
+    push_assignment: "Assignment",
+    fcm_url: str,
+    status: int,
+    django_capture_on_commit_callbacks: Any,
+) -> None:
+    mocked_responses.add(mocked_responses.POST, fcm_url, status=status)
+    with django_capture_on_commit_callbacks(execute=True):
+        assert not WebPushDispatcher(push_assignment.channel).send(
+            push_assignment.address.value, payload, push_assignment
+        )
+
+    push_assignment.refresh_from_db()
+    assert not push_assignment.validated
+    assert push_assignment.data == {}
+
+
+def test_webpush_group(push_assignment: "Assignment") -> None:
+    from testutils.factories import AssignmentFactory
+
+    other = AssignmentFactory(
+        channel=push_assignment.channel,
+        data={"webpush": {"subscription": {"endpoint": "https://push.example.com/1", "keys": {}}}},
+    )
+    unsubscribed = AssignmentFactory(channel=push_assignment.channel, data={})
+    same = AssignmentFactory(channel=push_assignment.channel, data=push_assignment.data)
+    dispatcher = WebPushDispatcher(push_assignment.channel)
+    assert dispatcher.group([push_assignment, other, unsubscribed, same]) == [
+        push_assignment,
+        same,
+        other,
+        unsubscribed,
+    ]